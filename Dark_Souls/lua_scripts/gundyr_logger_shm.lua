@@ -0,0 +1,98 @@
+[ENABLE]
+{$lua}
+-- Shared-memory version of gundyr_logger.lua + lock_on.lua.
+-- Publishes boss info and lock-on status into one 64-byte seqlock record that
+-- scripts/shm_channel.py reads (see its docstring for the layout).
+if shmTimer then
+    shmTimer.destroy()
+end
+
+local CHANNEL_NAME = "DS3GundyrChannel"
+local MAGIC = 0x47335344 -- "DS3G"
+local VERSION = 1
+
+local shm = allocateSharedMemoryLocal(CHANNEL_NAME, 64)
+local seq = readQwordLocal(shm + 0x08) or 0
+if seq % 2 == 1 then seq = seq + 1 end
+
+writeIntegerLocal(shm + 0x00, MAGIC)
+writeIntegerLocal(shm + 0x04, VERSION)
+writeQwordLocal(shm + 0x08, seq)
+
+local lockTgtManBase = getAddressSafe("LockTgtMan")
+
+local function readGundyr()
+    local target_ptr = getAddressSafe("target_ptr")
+    if not target_ptr then return nil end
+    local target = readPointer(target_ptr)
+    if not target or target == 0 then return nil end
+    local base = readPointer(target + 0x1F90)
+    if not base then return nil end
+
+    local temp = readPointer(base + 0x18)
+    if not temp then return nil end
+    local hp = readInteger(temp + 0xD8) or 0
+
+    local posBase = readPointer(base + 0x68)
+    if not posBase then return nil end
+    posBase = readPointer(posBase + 0xA8)
+    if not posBase then return nil end
+    posBase = readPointer(posBase + 0x40)
+    if not posBase then return nil end
+
+    local x = readFloat(posBase + 0x70) or -999.0
+    local y = readFloat(posBase + 0x78) or -999.0
+    local z = readFloat(posBase + 0x74) or -999.0
+    local angle = readFloat(posBase + 0x7C) or -999.0
+
+    local anim = ""
+    local animBase = readPointer(base + 0x28)
+    if animBase then
+        anim = readString(animBase + 0x898, 11) or ""
+    end
+    return hp, x, y, z, angle, anim
+end
+
+local function readLock()
+    if not lockTgtManBase then return 0 end
+    local mgr = readPointer(lockTgtManBase)
+    if not mgr then return 0 end
+    local value = readBytes(mgr + 0x2821, 1)
+    if value == 1 then return 1 end
+    return 0
+end
+
+function publishGundyr()
+    local hp, x, y, z, angle, anim = readGundyr()
+    if not hp then return end
+    local locked = readLock()
+
+    seq = seq + 1
+    writeQwordLocal(shm + 0x08, seq)          -- odd: write in progress
+    writeDoubleLocal(shm + 0x10, os.time())
+    writeIntegerLocal(shm + 0x18, hp)
+    writeFloatLocal(shm + 0x1C, x)
+    writeFloatLocal(shm + 0x20, y)
+    writeFloatLocal(shm + 0x24, z)
+    writeFloatLocal(shm + 0x28, angle)
+    writeBytesLocal(shm + 0x2C, locked)
+    local bytes = { string.byte(anim, 1, 11) }
+    for i = #bytes + 1, 11 do bytes[i] = 0 end
+    writeBytesLocal(shm + 0x2D, bytes)
+    seq = seq + 1
+    writeQwordLocal(shm + 0x08, seq)          -- even: record consistent
+end
+
+shmTimer = createTimer(nil, false)
+shmTimer.Interval = 20
+shmTimer.OnTimer = publishGundyr
+shmTimer.setEnabled(true)
+{$asm}
+
+[DISABLE]
+{$lua}
+if shmTimer then
+    shmTimer.destroy()
+    shmTimer = nil
+end
+{$asm}
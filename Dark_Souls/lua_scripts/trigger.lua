@@ -32,9 +32,9 @@ local function checkForResetTrigger()
   end
 end
 
--- Create a timer that checks every 1000ms (1 second)
+-- Create a timer that checks every 100ms (the Python reset waits for the file to be removed)
 resetTriggerTimer = createTimer(nil, false)
-resetTriggerTimer.Interval = 1000
+resetTriggerTimer.Interval = 100
 resetTriggerTimer.OnTimer = checkForResetTrigger
 resetTriggerTimer.setEnabled(true)
 print("Reset trigger timer enabled. Waiting for trigger file: " .. trigger_file)
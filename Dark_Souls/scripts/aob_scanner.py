@@ -0,0 +1,289 @@
+# aob_scanner.py
+"""
+Array-of-bytes (AOB) signature scanning for the game's static globals.
+
+Game patches move globals such as WorldChrMan or LockTgtMan, but the code that loads
+them (e.g. `mov rbx, [rip+disp32]`) keeps the same shape. A Signature is that code as a
+byte pattern with `??` wildcards, plus where its rip-relative displacement sits; the
+global's address is `match + instr_len + disp32`.
+
+resolve_signatures() reads the module image once, searches every pattern (each anchored
+on its longest literal run with bytes.find, then verified against the mask), and caches
+the results per module hash in data/aob_cache.json. A cache hit only re-checks each
+pattern at its cached offset, so attaching to a known build costs a few small reads.
+
+Usage:
+    python aob_scanner.py scan                 # resolve SIGNATURES in the running game
+    python aob_scanner.py refs 0x7FF785A0DBE0  # code that loads a known global -> new signature
+"""
+import hashlib
+import json
+import os
+import struct
+import time
+from collections import namedtuple
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(os.path.dirname(script_dir), "data")
+AOB_CACHE_PATH = os.path.join(data_dir, "aob_cache.json")
+
+# `required` globals must resolve at attach: resolve_signatures() raises SignatureNotFound
+# instead of leaving the chains rooted on them to read a stale absolute address.
+Signature = namedtuple("Signature", ["name", "pattern", "disp_offset", "instr_len", "required"],
+                       defaults=(True,))
+
+
+class SignatureNotFound(LookupError):
+    """
+    Raised when a required signature has no unique match in the module image.
+    """
+
+########################################
+# Signatures
+########################################
+# GameDataMan/WorldChrMan are the community DS3 Cheat Engine tables' BaseA/BaseB patterns.
+# LockTgtMan is loaded by a `mov rcx, [rip+disp32]` followed by a null check; if a patch
+# breaks a pattern, `python aob_scanner.py refs <old address>` prints candidates for a new one.
+# A pattern that matches more than once is treated as not found (see resolve_signatures).
+# Only the optional lock_on chain is rooted on a signature (LockTgtMan), so none is required
+# yet; make one required once the chains rooted on it are verified against a live build.
+SIGNATURES = (
+    Signature("GameDataMan", "48 8B 05 ?? ?? ?? ?? 48 85 C0 ?? ?? 48 8B 40 ?? C3", 3, 7, False),
+    Signature("WorldChrMan", "48 8B 1D ?? ?? ?? 04 48 8B F9 48 85 DB ?? ?? 8B 11 85 D2 ?? ?? 8D", 3, 7,
+              False),
+    Signature("LockTgtMan", "48 8B 0D ?? ?? ?? ?? 48 85 C9 74 ?? 48 8B 49 ?? E8 ?? ?? ?? ?? 84 C0", 3, 7,
+              False),
+)
+
+########################################
+# Patterns
+########################################
+
+
+def parse_pattern(pattern):
+    """
+    Parses "48 8B ?? 05" into (bytes with wildcards zeroed, mask bytes: 0xFF literal / 0x00 wildcard).
+    """
+    values, mask = bytearray(), bytearray()
+    for token in pattern.split():
+        if token.strip("?") == "":
+            values.append(0)
+            mask.append(0)
+        else:
+            values.append(int(token, 16))
+            mask.append(0xFF)
+    if not any(mask):
+        raise ValueError(f"Pattern '{pattern}' has no literal bytes.")
+    return bytes(values), bytes(mask)
+
+
+def _anchor(values, mask):
+    """
+    Returns (offset, bytes) of the longest literal run, the part searched with bytes.find.
+    """
+    best, start = (0, 0), None
+    for i, m in enumerate(mask + b"\x00"):
+        if m and start is None:
+            start = i
+        elif not m and start is not None:
+            if i - start > best[1] - best[0]:
+                best = (start, i)
+            start = None
+    return best[0], values[best[0]:best[1]]
+
+
+def _matches_at(image, offset, values, mask):
+    if offset < 0 or offset + len(values) > len(image):
+        return False
+    window = image[offset:offset + len(values)]
+    return all(b & m == v for b, m, v in zip(window, mask, values))
+
+
+def find_pattern(image, pattern, first_only=True):
+    """
+    Returns the offsets in `image` where `pattern` matches (only the first if first_only).
+    """
+    values, mask = parse_pattern(pattern)
+    anchor_offset, anchor = _anchor(values, mask)
+    found = []
+    pos = image.find(anchor, anchor_offset)
+    while pos != -1:
+        start = pos - anchor_offset
+        if _matches_at(image, start, values, mask):
+            found.append(start)
+            if first_only:
+                break
+        pos = image.find(anchor, pos + 1)
+    return found
+
+
+def _target(image, match, signature):
+    disp = struct.unpack_from("<i", image, match + signature.disp_offset)[0]
+    return match + signature.instr_len + disp
+
+########################################
+# Module Image
+########################################
+
+
+def read_module_image(backend):
+    """
+    Returns the module image as a bytearray (module_size long). Unreadable pages are zeros.
+    """
+    lo, hi = backend.module_base, backend.module_base + backend.module_size
+    image = bytearray(backend.module_size)
+    spans = [(max(start, lo), min(start + size, hi)) for start, size in backend.regions()
+             if start < hi and start + size > lo]
+    if not spans:
+        spans = [(lo, hi)]
+    for start, end in spans:
+        try:
+            image[start - lo:end - lo] = backend.read_bytes(start, end - start)
+        except Exception:
+            pass
+    return image
+
+
+def module_hash(backend):
+    """
+    Identifies a build by its PE headers (timestamp, checksum, section table) and size.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(backend.module_size.to_bytes(8, "little"))
+    try:
+        digest.update(backend.read_bytes(backend.module_base, 0x1000))
+    except Exception:
+        pass
+    return digest.hexdigest()
+
+########################################
+# Resolution
+########################################
+
+
+def _load_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"👉❌ Could not save AOB cache: {e}")
+
+
+def resolve_signatures(backend, signatures=SIGNATURES, cache_path=AOB_CACHE_PATH, log=True):
+    """
+    Returns {signature name: absolute address of the global} for every signature found
+    exactly once (an ambiguous pattern counts as not found). Results are cached per module hash; cached entries are re-verified before use.
+    Raises SignatureNotFound if a required signature has no match.
+    """
+    start_time = time.perf_counter()
+    base = backend.module_base
+    key = module_hash(backend)
+    cache = _load_cache(cache_path) if cache_path else {}
+    cached = cache.get(key, {})
+
+    resolved, missing = {}, []
+    for sig in signatures:
+        entry = cached.get(sig.name)
+        if entry and entry.get("pattern") == sig.pattern:
+            values, mask = parse_pattern(sig.pattern)
+            try:
+                code = backend.read_bytes(base + entry["match"], len(values))
+            except Exception:
+                code = b""
+            if _matches_at(code, 0, values, mask):
+                resolved[sig.name] = base + entry["target"]
+                continue
+        missing.append(sig)
+
+    if missing:
+        image = read_module_image(backend)
+        for sig in missing:
+            found = find_pattern(image, sig.pattern, first_only=False)
+            if len(found) != 1:
+                # Several matches: the pattern also fits unrelated code, so any pick could be
+                # the wrong global.
+                if log:
+                    print(f"👉❌ Signature '{sig.name}' " + (
+                        "not found." if not found else f"is ambiguous ({len(found)} matches)."))
+                continue
+            target = _target(image, found[0], sig)
+            resolved[sig.name] = base + target
+            cached[sig.name] = {"pattern": sig.pattern, "match": found[0], "target": target}
+        if cache_path:
+            cache[key] = cached
+            _save_cache(cache_path, cache)
+
+    if log:
+        elapsed = (time.perf_counter() - start_time) * 1000
+        source = "scanned" if missing else "cached"
+        print(f"🔎 Resolved {len(resolved)}/{len(signatures)} signatures in {elapsed:.0f} ms ({source}).")
+    unresolved = [sig.name for sig in signatures if sig.required and sig.name not in resolved]
+    if unresolved:
+        raise SignatureNotFound(f"Required signature(s) not found: {', '.join(unresolved)}. "
+                                f"The game build probably changed; update aob_scanner.SIGNATURES.")
+    return resolved
+
+########################################
+# Signature Discovery / Simulation Helpers
+########################################
+
+
+def find_references(image, image_base, target, chunk_bytes=16 << 20):
+    """
+    Returns image offsets whose int32 is a rip-relative displacement to `target`, assuming
+    the displacement ends its instruction (true for mov/lea reg, [rip+disp32]).
+    """
+    found = []
+    for offset in range(0, max(0, len(image) - 3), chunk_bytes):
+        end = min(len(image), offset + chunk_bytes + 3)
+        view = memoryview(image)[offset:end]
+        count = len(view) - 3
+        disps = np.ndarray((count,), dtype="<i4", buffer=view, strides=(1,)).astype(np.int64)
+        # disp32 at offset i resolves to image_base + i + 4 + disp
+        positions = np.arange(offset, offset + count, dtype=np.int64)
+        hits = np.flatnonzero((positions + 4 + disps == target - image_base) & (disps != 0))
+        found.extend(int(offset + h) for h in hits)
+    return found
+
+
+def plant_signature(backend, signature, code_address, global_address):
+    """
+    Writes `signature`'s bytes at code_address (wildcards zeroed) with its displacement
+    pointing at global_address. For the simulated target and tests.
+    """
+    values, _ = parse_pattern(signature.pattern)
+    code = bytearray(values)
+    disp = global_address - (code_address + signature.instr_len)
+    struct.pack_into("<i", code, signature.disp_offset, disp)
+    backend.write_bytes(code_address, bytes(code), len(code))
+
+
+if __name__ == "__main__":
+    import argparse
+    from memory_backend import PymemBackend
+    parser = argparse.ArgumentParser(description="DS3 AOB signature tools")
+    parser.add_argument("command", choices=["scan", "refs"])
+    parser.add_argument("address", nargs="?", help="Absolute address of a known global (refs)")
+    parser.add_argument("--process", default="DarkSoulsIII.exe")
+    args = parser.parse_args()
+
+    backend = PymemBackend(args.process)
+    if args.command == "scan":
+        for name, address in resolve_signatures(backend, cache_path=None).items():
+            print(f"{name}: {hex(address)} (module + {hex(address - backend.module_base)})")
+    else:
+        image = read_module_image(backend)
+        for ref in find_references(image, backend.module_base, int(args.address, 16))[:20]:
+            code = image[max(0, ref - 3):ref + 16]
+            print(f"+{hex(ref - 3)}: {' '.join(f'{b:02X}' for b in code[:3])} ?? ?? ?? ?? "
+                  f"{' '.join(f'{b:02X}' for b in code[7:])}")
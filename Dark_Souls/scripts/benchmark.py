@@ -0,0 +1,319 @@
+# benchmark.py
+"""
+Latency benchmarks for the memory-reading stack, runnable on Linux against the
+simulated target in memory_backend.py (no game or Windows required).
+
+Usage:
+    python benchmark.py reads --iterations 200000
+    python benchmark.py reads --max-us getter=5 snapshot=20   # fail if slower
+    python benchmark.py reads --snapshot fight.ds3snap        # replay a memory snapshot
+    python benchmark.py scan                                  # value scanner first/next scan
+    python benchmark.py obs --max-bytes builder=128           # per-step observation allocations
+    python benchmark.py loop --rate 60 --period-frames 6      # control-loop jitter / overruns
+    python benchmark.py inputs                                # input dispatch latency
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import pointer_scanner as ps
+from memory_backend import make_simulated_game
+from control_loop import ControlLoop
+from input_backend import InputDispatcher, RecordingBackend
+from memory_layout import STATE_LAYOUT, SnapshotEngine
+from observation import FEATURES, FeaturePipeline, ObservationBuilder
+from pointer_trie import PointerTrie
+from value_scanner import ValueScanner
+
+
+def make_reader(snapshot=None):
+    """
+    Returns a PointerReader attached to a fresh simulated game built from pointer_scanner.CHAINS,
+    or to a saved memory snapshot file if `snapshot` is given.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        if snapshot:
+            return ps.PointerReader.from_snapshot(snapshot)
+        reader = ps.PointerReader("simulated", backend=make_simulated_game(ps.CHAINS))
+    # The simulated game has no code to scan; its globals sit at the default build's offsets.
+    reader.chains = ps.CHAINS
+    return reader
+
+
+def time_call(fn, iterations):
+    """
+    Calls fn() `iterations` times and returns the mean latency in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_reads(iterations, snapshot=None):
+    """
+    Measures raw backend reads, chain resolution, getters, writes and batched snapshots.
+    Writes are skipped when replaying a (read-only) snapshot.
+    Returns {case name: mean microseconds per call}.
+    """
+    reader = make_reader(snapshot)
+    sim = reader.pm
+    hp_chain = ps.CHAINS["player_hp"]
+    hp_addr = reader.resolve_address(hp_chain, name="player HP")
+    engine = SnapshotEngine(reader, STATE_LAYOUT, ps.CHAINS)
+    trie = PointerTrie(reader, ps.CHAINS)
+
+    results = {
+        "raw_read": time_call(lambda: sim.read_ulonglong(hp_addr), iterations),
+        "resolve": time_call(lambda: reader.resolve(hp_chain, data_type="int"), iterations),
+        "getter": time_call(lambda: ps.get_player_HP(reader), iterations),
+        "trie_walk": time_call(trie.resolve_all, iterations),
+        "snapshot": time_call(engine.snapshot, iterations),
+    }
+    if snapshot:
+        return results
+    with contextlib.redirect_stdout(io.StringIO()):
+        results["write_value"] = time_call(
+            lambda: ps.write_value(reader, hp_chain, 454, data_type="int", name="playerHP"),
+            max(1, iterations // 10))
+    return results
+
+
+def bench_scan(repeats=5):
+    """
+    Measures value-scanner passes over the simulated game's regions.
+    Returns {case name: mean microseconds per scan}.
+    """
+    reader = make_reader()
+    sim = reader.pm
+    pos_addr = reader.resolve_address(ps.CHAINS["player_pos"], name="player position")
+    scanner = ValueScanner(sim, "float")
+
+    def unknown_then_increased():
+        scanner.first_scan("unknown")
+        sim.write_float(pos_addr, sim.read_float(pos_addr) + 1.0)
+        scanner.next_scan("increased")
+
+    results = {
+        "first_exact": time_call(lambda: scanner.first_scan("exact", 129.51), repeats),
+        "next_exact": time_call(lambda: scanner.next_scan("exact", 129.51), repeats),
+        "unknown_next": time_call(unknown_then_increased, repeats),
+    }
+    print(f"{len(sim.regions())} regions, {sum(size for _, size in sim.regions()) / (1 << 20):.1f} MiB scanned")
+    return results
+
+
+def measure_allocations(fn, iterations, warmup=100):
+    """
+    Runs fn() under tracemalloc after `warmup` calls.
+    Returns (peak bytes allocated during one call, bytes retained per call).
+    """
+    for _ in range(warmup):
+        fn()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        peak = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - before)
+        retained = (tracemalloc.get_traced_memory()[0] - base) / iterations
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+
+def bench_obs(iterations):
+    """
+    Compares building the observation with ObservationBuilder against the previous
+    list + np.array construction, both from one SnapshotEngine row per step, and times
+    the feature pipeline with every feature enabled and 4 stacked frames.
+    Returns {case name: (us per step, peak bytes per step, retained bytes per step)}.
+    """
+    reader = make_reader()
+    engine = SnapshotEngine(reader, STATE_LAYOUT, ps.CHAINS)
+    values = engine.snapshot()
+    builder = ObservationBuilder({int(values[11]): "A"}, n_buffers=4)
+    tags = {int(values[11]): "A"}
+
+    def build():
+        return builder.build(values)
+
+    def legacy():
+        player, boss = values[:6].tolist(), values[6:11].tolist()
+        if boss[0] < 0 or boss[0] > 1037:
+            boss[0] = -1.0
+        anim = [0, 0, 0, 0]
+        tag = tags.get(int(values[11]))
+        if tag in ("W", "E", "A", "T"):
+            anim[("W", "E", "A", "T").index(tag)] = 1
+        return np.array(player + boss + anim, dtype=np.float32)
+
+    pipeline = FeaturePipeline(tuple(FEATURES), stack=4)
+    pipeline.reset(build())
+
+    assert np.array_equal(build(), legacy())
+    results = {}
+    for name, fn in (("builder", build), ("legacy", legacy),
+                     ("snapshot+builder", lambda: builder.build(engine.snapshot())),
+                     ("features(all,x4)", lambda: pipeline.push(build(), 3.0, True))):
+        us = time_call(fn, iterations)
+        peak, retained = measure_allocations(fn, min(iterations, 10_000))
+        results[name] = (us, peak, retained)
+    return results
+
+
+def report_obs(results, limits):
+    """
+    Prints bench_obs results; returns False if a case allocates more bytes per step than its limit.
+    """
+    ok = True
+    for name, (us, peak, retained) in results.items():
+        line = f"{name:>16}: {us:7.3f} us/step, {peak:5d} B peak/step, {retained:7.2f} B retained/step"
+        limit = limits.get(name)
+        if limit is not None and peak > limit:
+            line += f"  ❌ over limit {limit:.0f} B"
+            ok = False
+        print(line)
+    return ok
+
+
+def bench_loop(rate_hz, period_frames, steps, work_ms=0.0):
+    """
+    Runs `steps` decisions of a ControlLoop, each doing one snapshot plus `work_ms` of
+    busy work (standing in for inputs and the policy). Returns ControlLoop.stats().
+    """
+    reader = make_reader()
+    engine = SnapshotEngine(reader, STATE_LAYOUT, ps.CHAINS)
+    loop = ControlLoop(rate_hz, period_frames)
+    loop.reset()
+    for _ in range(steps):
+        end = time.perf_counter() + work_ms / 1000
+        while time.perf_counter() < end:
+            pass
+        loop.wait()
+        engine.snapshot()
+    return loop.stats()
+
+
+def bench_inputs(steps=200):
+    """
+    Drives an InputDispatcher over a RecordingBackend with the step loop's pattern
+    (one tap plus a redundant hold of 'w' per step). Returns {case name: microseconds}:
+    the env-thread cost of queueing a step's inputs, and the mean/max delay between a
+    transition's due time and when it was sent.
+    """
+    backend = RecordingBackend()
+    inputs = InputDispatcher(backend, press_duration=0.002)
+    due = []
+    queued = 0.0
+    for i in range(steps):
+        now = time.monotonic()
+        start = time.perf_counter()
+        inputs.press("u" if i % 2 else "space")
+        inputs.key_down("w")
+        queued += time.perf_counter() - start
+        due += [(now, "down"), (now + inputs.press_duration, "up")]
+        time.sleep(0.004)
+    inputs.flush()
+    inputs.stop()
+    taps = [(t, kind) for t, kind, key in backend.events if key != "w"]
+    delays = [(sent - wanted) * 1e6 for (sent, _), (wanted, _) in zip(taps, due)]
+    print(f"{len(backend.events)} transitions sent, {inputs.dropped} redundant dropped, "
+          f"'w' held: {inputs.is_held('w')}")
+    return {
+        "queue_step": queued / steps * 1e6,
+        "dispatch_mean": sum(delays) / len(delays),
+        "dispatch_max": max(delays),
+    }
+
+
+def parse_limits(pairs):
+    limits = {}
+    for pair in pairs or ():
+        name, _, value = pair.partition("=")
+        limits[name] = float(value)
+    return limits
+
+
+def report(results, limits):
+    """
+    Prints results and returns False if any case exceeds its limit.
+    """
+    ok = True
+    for name, us in results.items():
+        line = f"{name:>12}: {us:9.3f} us/call  ({1e6 / us:,.0f} calls/s)"
+        limit = limits.get(name)
+        if limit is not None and us > limit:
+            line += f"  ❌ over limit {limit} us"
+            ok = False
+        print(line)
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory stack latency benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    reads = sub.add_parser("reads", help="Pointer resolution / getter / snapshot latency")
+    reads.add_argument("--iterations", type=int, default=100_000)
+    reads.add_argument("--max-us", nargs="*", metavar="CASE=US",
+                       help="Fail (exit 1) if a case is slower than the given microseconds")
+    reads.add_argument("--snapshot", default=None,
+                       help="Replay a saved memory snapshot (.ds3snap) instead of the simulated game")
+
+    scan = sub.add_parser("scan", help="Value scanner first/next scan latency")
+    scan.add_argument("--repeats", type=int, default=5)
+    scan.add_argument("--max-us", nargs="*", metavar="CASE=US",
+                      help="Fail (exit 1) if a case is slower than the given microseconds")
+
+    obs = sub.add_parser("obs", help="Observation construction latency and per-step allocations")
+    obs.add_argument("--iterations", type=int, default=100_000)
+    obs.add_argument("--max-bytes", nargs="*", metavar="CASE=BYTES",
+                     help="Fail (exit 1) if a case allocates more peak bytes per step")
+
+    loop = sub.add_parser("loop", help="Control-loop pacing: achieved rate, jitter and overruns")
+    loop.add_argument("--rate", type=float, default=60.0, help="Control frames per second")
+    loop.add_argument("--period-frames", type=int, default=6)
+    loop.add_argument("--steps", type=int, default=100)
+    loop.add_argument("--work-ms", type=float, default=5.0, help="Busy work per decision")
+    loop.add_argument("--max-jitter-ms", type=float, default=None,
+                      help="Fail (exit 1) if the worst on-time jitter exceeds this")
+
+    keys = sub.add_parser("inputs", help="Input dispatcher queueing cost and send delay")
+    keys.add_argument("--steps", type=int, default=200)
+    keys.add_argument("--max-us", nargs="*", metavar="CASE=US",
+                      help="Fail (exit 1) if a case is slower than the given microseconds")
+
+    args = parser.parse_args(argv)
+    if args.command == "reads":
+        ok = report(bench_reads(args.iterations, args.snapshot), parse_limits(args.max_us))
+        return 0 if ok else 1
+    if args.command == "scan":
+        ok = report(bench_scan(args.repeats), parse_limits(args.max_us))
+        return 0 if ok else 1
+    if args.command == "loop":
+        stats = bench_loop(args.rate, args.period_frames, args.steps, args.work_ms)
+        for name, value in stats.items():
+            print(f"{name:>16}: {value:.3f}" if isinstance(value, float) else f"{name:>16}: {value}")
+        limit = args.max_jitter_ms
+        return 1 if limit is not None and stats["max_jitter_ms"] > limit else 0
+    if args.command == "inputs":
+        ok = report(bench_inputs(args.steps), parse_limits(args.max_us))
+        return 0 if ok else 1
+    if args.command == "obs":
+        ok = report_obs(bench_obs(args.iterations), parse_limits(args.max_bytes))
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
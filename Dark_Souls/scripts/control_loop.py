@@ -0,0 +1,114 @@
+# control_loop.py
+import time
+
+########################################
+# Fixed-Rate Control Loop
+########################################
+
+
+class ControlLoop:
+    """
+    Paces decisions on monotonic deadlines instead of a fixed sleep per step.
+
+    The loop runs on frames of 1 / rate_hz seconds; one decision spans `period_frames`
+    frames. This only sets the pacing: the action is sent once per decision (it is not
+    repeated every frame) and the reward is computed once, from the observation taken
+    after wait(), not summed over the frames in between. wait() blocks until the decision's deadline, so the
+    observation that follows is always taken on the same cadence, however long the
+    action, read and policy work took. Deadlines advance by whole decision periods from
+    the previous deadline, not from when wait() was called, so latency does not
+    accumulate into drift.
+
+    A decision that reaches wait() after its deadline is an overrun: it returns at once
+    and the schedule skips the missed periods instead of bursting to catch up.
+    Sleeps stop `spin` seconds early and busy-wait the rest, since OS sleep granularity
+    (up to ~15 ms on Windows) would otherwise dominate the jitter.
+    """
+
+    def __init__(self, rate_hz=60.0, period_frames=6, spin=0.001):
+        if rate_hz <= 0 or period_frames < 1:
+            raise ValueError("rate_hz must be > 0 and period_frames >= 1.")
+        self.rate_hz = rate_hz
+        self.period_frames = period_frames
+        self.period = period_frames / rate_hz
+        self.spin = spin
+        self._deadline = None
+        self.reset_stats()
+
+    def reset(self):
+        """
+        Restarts the schedule: the next decision's deadline is one period from now.
+        Call after anything that stalls the loop on purpose (episode resets, menus).
+        """
+        self._deadline = time.monotonic() + self.period
+
+    def reset_stats(self):
+        self.steps = 0
+        self.overruns = 0        # decisions that reached wait() after their deadline
+        self.missed = 0          # whole periods skipped because of overruns
+        self.jitter_sum = 0.0    # |wake time - deadline| summed over on-time steps (s)
+        self.max_jitter = 0.0
+        self.max_overrun = 0.0   # worst lateness at wait() (s)
+        self.last_jitter = 0.0
+        self.last_overrun = 0.0
+        self._first_wake = None
+        self._last_wake = None
+
+    def wait(self):
+        """
+        Blocks until the current decision's deadline and schedules the next one.
+        Returns the lateness in seconds (0.0 if the deadline was met).
+        """
+        if self._deadline is None:
+            self.reset()
+        deadline = self._deadline
+        now = time.monotonic()
+        self.steps += 1
+        if now >= deadline:
+            self._woke(now)
+            late = now - deadline
+            skipped = int(late // self.period)
+            self.overruns += 1
+            self.missed += skipped
+            self.max_overrun = max(self.max_overrun, late)
+            self.last_overrun, self.last_jitter = late, 0.0
+            self._deadline = deadline + (skipped + 1) * self.period
+            return late
+
+        remaining = deadline - now - self.spin
+        if remaining > 0:
+            time.sleep(remaining)
+        while time.monotonic() < deadline:
+            pass
+        wake = time.monotonic()
+        self._woke(wake)
+        jitter = wake - deadline
+        self.jitter_sum += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.last_jitter, self.last_overrun = jitter, 0.0
+        self._deadline = deadline + self.period
+        return 0.0
+
+    def _woke(self, now):
+        if self._first_wake is None:
+            self._first_wake = now
+        self._last_wake = now
+
+    def stats(self):
+        """
+        Returns rates, jitter and overrun statistics since the last reset_stats().
+        actual_hz is measured between the first and last wait() wake-ups.
+        """
+        span = (self._last_wake - self._first_wake) if self._first_wake is not None else 0.0
+        on_time = self.steps - self.overruns
+        return {
+            "target_hz": self.rate_hz / self.period_frames,
+            "actual_hz": (self.steps - 1) / span if span > 0 else 0.0,
+            "steps": self.steps,
+            "overruns": self.overruns,
+            "overrun_rate": self.overruns / self.steps if self.steps else 0.0,
+            "missed_periods": self.missed,
+            "mean_jitter_ms": self.jitter_sum / on_time * 1000 if on_time else 0.0,
+            "max_jitter_ms": self.max_jitter * 1000,
+            "max_overrun_ms": self.max_overrun * 1000,
+        }
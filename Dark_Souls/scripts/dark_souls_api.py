@@ -1,13 +1,22 @@
 # dark_souls_api.py
 import psutil
+import json
 import math
 import os
 import time
 import numpy as np
-import pydirectinput
-from colorama import Fore, Style
+from colorama import Fore
 import gym_wrapper
 import pointer_scanner as ps
+from control_loop import ControlLoop
+from input_backend import InputDispatcher, make_backend
+from lock_on import LockOnManager
+from memory_layout import STATE_LAYOUT, SnapshotEngine
+from reset_machine import Phase, ResetMachine
+from reward import RewardEngine
+from observation import ObservationBuilder, boss_distance
+from state_sampler import AGE_COL, FIRST_FIELD_COL, FRESH_COL, TIME_COL, StateSampler
+from shm_channel import ChannelReader
 
 """
 INFO
@@ -36,15 +45,36 @@ data_dir = os.path.join(os.path.dirname(script_dir), "data")
 GUNDYR_INFO_PATH = os.path.join(data_dir, "gundyr_info.txt")
 TRIGGER_PATH = os.path.join(data_dir, "reset_trigger.txt")
 LOCK_FILE_PATH = os.path.join(data_dir, "lock_on.txt")
+BOSS_ANIM_TAGS_PATH = os.path.join(data_dir, "boss_anim_tags.json")
 
 current_movement = 0.0  # to track current movement state (0, 1)
 attack_threshold = 5  # Only attack if within 4 units of boss
 dodge_threshold = 4  # Only dodge if within 3 units of boss
-counter = 0  # to track how many times the player has been waiting to enter the arena
 current_step_global = 0  # to track the current step in the environment
 reader = None  # Global reference
-whiffed_attack = False  # Flag to track if the attack was a whiff
-useless_dodge = False  # Flag to track if the dodge was useless
+snapshot_engine = None  # Batched reader for STATE_LAYOUT, bound to `reader`
+state_age = 0.0  # Age (s) of the stalest memory field in the last get_state()
+state_sampler = None  # Background poller feeding get_state(); None = read synchronously
+sample_row = None  # Preallocated row state_sampler.latest() copies into
+sample_values = None  # Field columns of sample_row (view made once)
+boss_pose_mask = 0  # snapshot_engine fresh_mask bits of the boss pose fields
+boss_anim_mask = 0  # ... and of bossAnimId
+SAMPLER_RATE_HZ = 120  # Set to 0 to disable the background sampler
+LIVENESS_INTERVAL = 0.5  # Seconds between background checks that the game is still running
+gundyr_channel = None  # Shared-memory record from the CE logger (see shm_channel.py)
+CHANNEL_MAX_AGE = 0.5  # Seconds without a new record before falling back to the text files
+CONTROL_RATE_HZ = 60  # Control frames per second (the game's frame rate)
+PERIOD_FRAMES = 6  # Frames per decision (pacing only, no action repeat): 10 decisions per second
+control_loop = ControlLoop(CONTROL_RATE_HZ, PERIOD_FRAMES)  # Paces step_environment()
+inputs = InputDispatcher(make_backend())  # Keys are sent from its own thread; see input_backend.py
+lock_manager = LockOnManager(inputs, lambda: read_lock_on(),
+                             lambda angle: change_player_angle(angle, quiet=True))  # Background re-lock
+reward_engine = RewardEngine(record=bool(os.environ.get("DS3_RECORD_REWARDS")))  # See reward.py
+STALE_STEPS = 30  # Kill the player after this many steps with an unchanged reward
+PLAYER_MAX_HP = 454  # HP written by heal_player()
+RESET_POLL = 0.01  # Seconds between condition checks in the reset phases
+RESPAWN_TIMEOUT = 20.0  # Seconds to wait for the player to respawn before killing them again
+TELEPORT_TOLERANCE = 1.0  # Max distance (units) from ps.BOSS_TELEPORT for the teleport to count
 
 action_dict = {
     0: "light attack",
@@ -55,53 +85,61 @@ action_dict = {
 
 def reset_environment():
     """
-    Reset the game environment by triggering your Lua reset script.
-    This should teleport the player to the proper position.
+    Resets the episode through reset_machine's phases (see RESET_PHASES): clear the boss
+    flag, wait for the respawn, run the CE prep trigger, teleport to the fog wall, walk
+    into the arena, heal and lock on. Each phase ends as soon as its condition is read
+    from memory. Returns the first state, or None if a required phase failed.
     """
     start = time.time()
+    inputs.release_all()  # don't carry a held 'w' into the reset sequence
     initialize_pointers()
-    global reader, counter
-    ready_for_training()
-    while True:
-        if get_player_in_boss_fight():
-            heal_player()
-            break
-        wait_until_in_arena()
-    print(Fore.WHITE + "🕹️   Getting ready for training...")
+    # Respawns and teleports can move the player/boss objects; re-walk every chain.
+    reader.invalidate_cache()
+    reset_machine.instrumentation = reader.instrumentation
+    ok = reset_machine.run()
+    print(Fore.WHITE + f"🕒 Reset phases: {reset_machine.summary()}")
+    if not ok:
+        print(Fore.RED + f"❌ Reset failed in phase '{reset_machine.failed_phase}'.")
+        return None
     print(Fore.WHITE + "🔁 Gym requested environment reset.")
+    save_boss_anim_tags()
+    reward_engine.reset()
+    lock_manager.reset()
+    if reward_engine.history:
+        reward_engine.save_history()
+    if reader.instrumentation is not None:
+        reader.instrumentation.dump()
     print(Fore.WHITE + f"🕒 Reset took: {time.time() - start:.2f} seconds")
+    print(Fore.WHITE + f"🕒 Pointer retries blocked: {reader.policy.blocked_time:.2f} seconds so far")
+    if control_loop.steps:
+        loop = control_loop.stats()
+        print(Fore.WHITE + f"🕒 Control loop: {loop['actual_hz']:.1f}/{loop['target_hz']:.1f} Hz, "
+              f"{loop['overruns']} overruns ({loop['overrun_rate']:.0%}, worst {loop['max_overrun_ms']:.1f} ms), "
+              f"jitter {loop['mean_jitter_ms']:.2f} ms mean / {loop['max_jitter_ms']:.2f} ms max")
+        control_loop.reset_stats()
+    control_loop.reset()
     return get_state()
 
 
 def send_in_game_actions(action):
     """
     Send in-game actions to DS3.
+    Returns (whiffed_attack, useless_dodge) for the reward.
     """
-    global current_movement, attack_threshold, dodge_threshold, reader, whiffed_attack, useless_dodge
-
-    if get_player_in_boss_fight():
-        if not ensure_lock_on_bruteforce():
-            print("🛑 Could not lock on after multiple attempts.")
-            return
+    global current_movement, attack_threshold, dodge_threshold, reader
+    whiffed_attack = useless_dodge = False
     command = int(action['command'])
     movement = float(action['movement'])
 
     # Get current state once to decide on actions.
     state = get_state()
     playerHP = state[0]
-    playerStamina = state[1]
-    playerX = state[2]
-    playerY = state[3]
-    playerZ = state[4]
-    playerAngle = state[5]
-    bossHP = state[6]
-    bossX = state[7]
-    bossY = state[8]
-    bossZ = state[9]
-    bossAngle = state[10]
-
-    # Extract player and boss positions for proximity checks.
-    dist = abs(playerX - bossX)
+    # Lock-on comes from the same snapshot; losing it starts a background re-lock.
+    locked = lock_on_state()
+    lock_manager.update(locked, get_player_in_boss_fight())
+
+    # Same 3D distance as the "distance" observation feature.
+    dist = boss_distance(state)
 
     # ----- Command: Attack, Dodge, or Heal -----
     # if command == 0:
@@ -113,14 +151,14 @@ def send_in_game_actions(action):
     #     # if dist < dodge_threshold and is_boss_anim(state, "A"):
     #     pydirectinput.press('space')
     if command == 0:  # Attack
-        pydirectinput.press('u')
+        inputs.press('u')
         # If far away, this is likely a whiff
         # let's define dist>6 as truly pointless, or you can keep your threshold
         if dist > attack_threshold:
             whiffed_attack = True
 
     elif command == 1:  # Dodge
-        pydirectinput.press('space')
+        inputs.press('space')
         # If you're not in danger, or boss isn't attacking, it's useless
         # We'll approximate "boss is not attacking" by bossHP>0 and dist>some_value,
         # or if you track boss animation
@@ -129,37 +167,33 @@ def send_in_game_actions(action):
     elif command == 2:
         # Heal if player's HP is under ~250 and we have an Estus
         initial_health = playerHP
-        estus_flasks = get_player_estus()
+        estus_flasks = observation_builder.estus  # read with the state snapshot
         if estus_flasks > 1 and initial_health <= 250:
-            pydirectinput.press('r')
+            inputs.press('r')
 
     # Process movement continuously:
     if abs(movement - current_movement) > 0.05:
-        # Release any previously held movement keys.
-        pydirectinput.keyUp('w')
-        # Update movement based on new value.
+        # Update movement based on new value. The dispatcher tracks key state, so 'w' is
+        # only released/pressed when that changes what is held.
         if movement > 0.1:
-            try:
-                with open(LOCK_FILE_PATH, 'r') as file:
-                    status = file.read().strip()
-                    if status == "locked":
-                        print(
-                            Fore.BLUE + "🚶‍♂️   Started holding 'w' for forward movement.")
-                        pydirectinput.keyDown('w')
-                    else:
-                        print(
-                            Fore.BLUE + "🫷   Stopped holding 'w' because not locked on to anything.")
-                        pydirectinput.keyUp('w')
-            except:
-                pass
+            if locked:
+                print(
+                    Fore.BLUE + "🚶‍♂️   Started holding 'w' for forward movement.")
+                inputs.key_down('w')
+            else:
+                print(
+                    Fore.BLUE + "🫷   Stopped holding 'w' because not locked on to anything.")
+                inputs.key_up('w')
 
         else:
             # movement near 0: no key held.
+            inputs.key_up('w')
             print(Fore.BLUE + "⏭️   No movement key held (movement ~0).")
         current_movement = movement
     else:
         # Movement value unchanged; keep holding the key.
         pass
+    return whiffed_attack, useless_dodge
 
 
 def step_environment(action):
@@ -186,161 +220,172 @@ def step_environment(action):
         print(Fore.YELLOW + f"⚠️  Action conversion error: {e}, using default action 0")
         command = 0
     
+    # Non-blocking: the liveness monitor polls the attached process in the background.
     if not is_ds3_running():
         print(Fore.RED + "❌ DS3 process not found. Exiting training...")
         raise RuntimeError("DS3 process not running.")
+    # Pointer retries inside this step share one time budget instead of sleeping per getter.
+    reader.policy.begin_step()
     # movement is binary: 1 means forward movement, 0 means no movement.
     movement = 1.0
 
     act = {"command": command, "movement": movement}
-    send_in_game_actions(act)
-    # Allow a brief delay for input effects
-    time.sleep(0.02)
+    t = time.perf_counter_ns()
+    whiff, useless_dodge = send_in_game_actions(act)
+    t = record_phase("step:actions", t)
+    # Wait for this decision's deadline, so states are read at a fixed rate.
+    control_loop.wait()
+    t = record_phase("step:wait", t)
     state = get_state()
-    reward = compute_reward(state, act)
+    t = record_phase("step:get_state", t)
+    reward = compute_reward(state, whiff, useless_dodge)
+    t = record_phase("step:reward", t)
     done = check_done(state)
-    info = {}
+    record_phase("step:check_done", t)
+    reader.policy.end_step()
+    info = {
+        "state_age": state_age,
+        "pointer_blocked_s": reader.policy.blocked_time,
+        "loop_jitter_s": control_loop.last_jitter,
+        "loop_overrun_s": control_loop.last_overrun,
+    }
     return state, reward, done, info
 
 
-def one_hot_anim(anim_str):
+def record_phase(name, start):
     """
-    Converts an animation string to a one-hot encoded vector.
+    Records the time since `start` (perf_counter_ns) under `name` when instrumentation
+    is enabled on the reader. Returns the current perf_counter_ns for the next phase.
     """
-    anims = ["W", "E", "A", "T"]  # Define possible animations
-    one_hot = [0, 0, 0, 0]  # Initialize one-hot vector with zeros
-    if anim_str in anims:
-        idx = anims.index(anim_str)  # Find the index of the animation
-        one_hot[idx] = 1  # Set the corresponding index to 1
-    return one_hot  # Return the numeric one-hot vector
+    now = time.perf_counter_ns()
+    if reader is not None and reader.instrumentation is not None:
+        reader.instrumentation.record(name, now - start)
+    return now
 
 
-def get_state():
+def feature_inputs(features):
     """
-    Reads game state from your log files.
+    Returns (estus, lock_on) for observation.FeaturePipeline.push(), both from the last
+    get_state() snapshot (lock-on only if `features` uses it).
     """
-    # FIXME: consider using estus as a state
-    global reader
-    player_state = [454.0, 95, 0.0, 0.0, 0.0, -2.78]
-    boss_state = [1037.0, 150.0, 0.0, 0.0, 0.0]
-    boss_anim_str = "idle"
+    lock_on = lock_on_state() if "lock_on" in features else False
+    return observation_builder.estus, lock_on
 
-    player_state[0] = float(get_playerHP() or 0.0)
-    player_state[1] = float(get_player_stamina() or 0.0)
-    player_state[2] = float(get_playerX() or 0.0)
-    player_state[3] = float(get_playerY() or 0.0)
-    player_state[4] = float(get_playerZ() or 0.0)
-    player_state[5] = float(get_playerAngle() or 0.0)
-    boss_state[0] = float(get_bossHP() or 0.0)
 
-    gundyr_info = read_gundyr_info()
+def load_boss_anim_tags():
+    """
+    Loads the boss animation ID -> tag ("W", "E", "A", "T") table learned so far.
+    """
+    try:
+        with open(BOSS_ANIM_TAGS_PATH, "r") as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
 
-    if gundyr_info is not None:
-        (
-            boss_state[1],
-            boss_state[2],
-            boss_state[3],
-            boss_state[4],
-            boss_anim_str
-        ) = gundyr_info
 
-    else:
-        print(Fore.YELLOW + "⚠ gundyr_info.txt not found or invalid. Using default boss state values.")
-        boss_state[1], boss_state[2], boss_state[3], boss_state[4], boss_anim_str = 0.0, 0.0, 0.0, 0.0, "idle"
+def save_boss_anim_tags():
+    """
+    Persists the learned animation table if it changed since the last save.
+    """
+    global boss_anim_tags_dirty
+    if not boss_anim_tags_dirty:
+        return
+    try:
+        with open(BOSS_ANIM_TAGS_PATH, "w") as f:
+            json.dump({str(k): v for k, v in sorted(boss_anim_tags.items())}, f, indent=2)
+        boss_anim_tags_dirty = False
+    except OSError as e:
+        print(Fore.RED + f"❌ Could not save boss animation tags: {e}")
 
-    anim_vector = one_hot_anim(boss_anim_str)
-    state = np.array(player_state + boss_state + anim_vector, dtype=np.float32)
-    return state
+
+# Memory gives the boss animation as a numeric ID, while the agent observes the logger's
+# W/E/A/T tag. The mapping is learned whenever both are available, after which the
+# logger is no longer needed for animations.
+boss_anim_tags = load_boss_anim_tags()
+boss_anim_tags_dirty = False
+OBS_BUFFERS = 4  # get_state() runs twice per step; keeps the previous step's observation intact
+observation_builder = ObservationBuilder(boss_anim_tags, n_buffers=OBS_BUFFERS)
 
 
-stale_counter = 0
-
-
-def compute_reward(state, action):
-    """
-    Compute reward based on state and action.
-    """
-    global current_step_global, whiffed_attack, useless_dodge
-    # Keep track of previous damage/reward values in a static dictionary
-    # Initialize static storage on first call
-    if not hasattr(compute_reward, "prev_values"):
-        compute_reward.prev_values = {
-            "player_damage": state[0],   # set to current player health
-            "boss_damage": state[6],     # set to current boss health
-            "reward": 0
-        }
-
-    # Extract previous values
-    prev_player_health = compute_reward.prev_values["player_damage"]
-    prev_boss_health = compute_reward.prev_values["boss_damage"]
-
-    # Calculate damage
-    # higher damage dealt = positive reward
-    boss_damage = max(0, prev_boss_health - state[6])
-    # damage taken = negative reward
-    player_damage = max(0, prev_player_health - state[0])
-
-    # positive reward for attacking - penalty for getting hit
-    reward = (boss_damage*1) - (player_damage * 0.1)
-
-    if whiffed_attack:
-        reward -= 0.05  # small penalty for whiffing at long range
-        whiffed_attack = False  # reset the flag
-    if useless_dodge:
-        reward -= 0.05
-        whiffed_attack = False  # reset the flag
-    # Detect changes (use a small tolerance to avoid floating-point noise)
-    changed = (prev_player_health != state[0]) or (
-        prev_boss_health != state[6])
-    global stale_counter
-    if compute_reward.prev_values["reward"] == reward:
-        stale_counter += 1
-        if stale_counter == 30:
-            kill_player()
-            print(Fore.RED + f"⚠️⚠️⚠️ Termined Episode due to staleness")
+def get_state(copy=False):
+    """
+    Reads game state from one batched memory snapshot (player and boss).
+    Boss position/animation fall back to the CE logger when their chains fail
+    or the animation ID has no known tag yet.
+
+    The observation is built in place in one of observation_builder's preallocated
+    buffers and stays valid for OBS_BUFFERS more get_state() calls (two per step), so the
+    wrapper can hand it to SB3, whose VecEnv copies it into its own batch buffer. Pass
+    copy=True for an array you own.
+    """
+    global reader, snapshot_engine, state_age, boss_anim_tags_dirty
+
+    # One batched snapshot replaces the per-field getters and the logger file. With the
+    # sampler running we take its newest sample instead of reading memory on this thread.
+    row = state_sampler.latest(out=sample_row) if state_sampler is not None else None
+    if row is not None:
+        values = sample_values
+        fresh = int(row.item(FRESH_COL))
+        state_age = (time.monotonic() - row.item(TIME_COL)) + row.item(AGE_COL)
     else:
-        stale_counter = 0
-
-    compute_reward.prev_values["player_damage"] = state[0]
-    compute_reward.prev_values["boss_damage"] = state[6]
-    compute_reward.prev_values["reward"] = reward
-
-    # Final reward calculations if boss or player is dead
-    boss_dead = get_boss_flag()
-    # boss_dead = (state[6] == 0)
-    player_dead = (state[0] == 0)
-
-    if boss_dead:
-        # Bonus for defeating the boss
-        reward += 500
-
-    if player_dead:
-        # Penalty for dying
-        reward -= 75
-
-    # Only print if damage/reward changed, OR the boss/player died
-    if changed or boss_dead or player_dead:
-        print(
-            Fore.WHITE + f"\n 📍   Step: {time.strftime('%H:%M:%S')} {current_step_global}")
-        print(
-            Fore.WHITE + f"📊   Player damage: {player_damage:.2f}, Boss damage: {boss_damage:.2f}")
-        print(Fore.WHITE + f"📊   Reward: {reward:.2f}")
-
-        if boss_dead:
-            print(
-                Fore.WHITE + f"\n 📍   Step: {current_step_global}")
-            print(Fore.WHITE +
-                  f"📊   Final Reward (boss dead): {reward:.2f}")
-        if player_dead:
-            print(
-                Fore.WHITE + f"\n 📍   Step: {current_step_global}")
-            print(Fore.WHITE +
-                  f"📊   Final Reward (player dead): {reward:.2f}")
-
-    # Store new values for next comparison
-    compute_reward.prev_values["player_damage"] = state[0]
-    compute_reward.prev_values["boss_damage"] = state[6]
-    compute_reward.prev_values["reward"] = reward
+        values = snapshot_engine.snapshot()
+        fresh = snapshot_engine.fresh_mask
+        state_age = snapshot_engine.max_age()
+
+    builder = observation_builder
+    state = builder.build(values, (fresh & boss_pose_mask) == boss_pose_mask,
+                          (fresh & boss_anim_mask) == boss_anim_mask, copy=copy)
+
+    if builder.missing_pose or builder.missing_anim:
+        t = time.perf_counter_ns()
+        gundyr_info = read_gundyr_info()
+        if reader.instrumentation is not None:
+            reader.instrumentation.record("state:gundyr_fallback", time.perf_counter_ns() - t,
+                                          gundyr_info is not None)
+        if gundyr_info is not None:
+            if builder.missing_pose:
+                builder.set_boss_pose(state, *gundyr_info[:4])
+            if builder.missing_anim:
+                boss_anim_str = gundyr_info[4]
+                builder.set_anim_tag(state, boss_anim_str)
+                anim_id = builder.anim_id
+                if anim_id != -1 and boss_anim_tags.get(anim_id) != boss_anim_str:
+                    boss_anim_tags[anim_id] = boss_anim_str
+                    builder.learn(anim_id, boss_anim_str)
+                    boss_anim_tags_dirty = True
+        elif builder.missing_pose:
+            # Animation stays all-zero ("idle") when it is unknown too.
+            print(Fore.YELLOW + "⚠ Boss pose unreadable and gundyr_info.txt not found or invalid. Using default boss state values.")
+            builder.set_boss_pose(state, 0.0, 0.0, 0.0, 0.0)
+    return state
+
+
+def boss_defeated():
+    """
+    True if the boss flag byte from the last get_state() snapshot has bit 7 set
+    (False if it could not be read).
+    """
+    flag = observation_builder.boss_flag
+    return flag >= 0 and bool(flag & 0x80)
+
+
+def compute_reward(state, whiff=False, useless_dodge=False):
+    """
+    Scores one step with reward_engine (terms in reward.py) from the state vector and
+    the boss flag of the same snapshot; no extra memory reads. Kills the player when
+    the reward has not changed for STALE_STEPS steps.
+    """
+    boss_dead = boss_defeated()
+    player_dead = state[0] == 0
+    reward = reward_engine.step(state[0], state[6], boss_dead, player_dead, whiff, useless_dodge)
+
+    if reward_engine.stale_steps == STALE_STEPS:
+        kill_player()
+        print(Fore.RED + f"⚠️⚠️⚠️ Termined Episode due to staleness")
+    if boss_dead or player_dead:
+        terms = ", ".join(f"{name} {value:.2f}" for name, value in reward_engine.last_terms.items() if value)
+        print(Fore.WHITE + f"\n 📍   Step: {time.strftime('%H:%M:%S')} {current_step_global}")
+        print(Fore.WHITE + f"📊   Final Reward ({'boss' if boss_dead else 'player'} dead): {reward:.2f} ({terms})")
     return reward
 
 
@@ -351,12 +396,12 @@ def check_done(state):
     global current_movement
 
     if state[0] == 0:
-        pydirectinput.keyUp('w')
+        inputs.key_up('w')
         current_movement = 0.0
         print(Fore.GREEN + "✅   Episode done:  player health <= 0.")
         return True
-    elif get_boss_flag():
-        pydirectinput.keyUp('w')
+    elif boss_defeated():
+        inputs.key_up('w')
         perform_gesture()
         current_movement = 0.0
         print(Fore.GREEN + "✅   Episode done:  boss health <= 0.")
@@ -371,32 +416,51 @@ def check_done(state):
 # ------------------ #
 def perform_gesture():
     print(Fore.GREEN + "😊   Performing Gesture.")
-    pydirectinput.press('g')
-    time.sleep(0.1)
-    pydirectinput.press('r')
-    time.sleep(0.1)
-    pydirectinput.press('g')
+    # Queued with explicit spacing; does not block the caller.
+    inputs.press('g')
+    inputs.press('r', delay=0.15)
+    inputs.press('g', delay=0.3)
 
 
-def kill_player(delay=7):
-    ps.write_value(reader, [0x04543F60, 0x28, 0x3A0,
-                   0x70, 0x90], 0, data_type="int", name="playerHP")
+def kill_player(delay=0):
+    """
+    Sets player HP to 0. The respawn is awaited by reset_environment()'s "respawn" phase,
+    so there is no need to sleep here (`delay` is kept for manual use).
+    """
+    ps.write_value(reader, reader.chains["player_hp"], 0, data_type="int", name="playerHP")
     print(Fore.WHITE + "🩸   Player killed manually.")
-    time.sleep(delay)  # Wait for 7 seconds before checking the state again
+    if delay:
+        time.sleep(delay)
 
 
 def heal_player():
-    ps.write_value(reader, [0x04543F60, 0x28, 0x3A0,
-                            0x70, 0x90], 454, data_type="int", name="playerHP")
+    ps.write_value(reader, reader.chains["player_hp"], PLAYER_MAX_HP, data_type="int", name="playerHP")
     print(Fore.WHITE + "❤️   Player healed manually.")
 
 
-def change_player_angle(angle):
-    PlayerX_PTR = [0x04543F60, 0x28, 0x80]
-    x_address = reader.update_address(PlayerX_PTR, name="PlayerX")
-    ps.write_float_using_address(
-        reader, x_address - 0xC, angle, name="Player Angle Boss fight")  # Angle
+def change_player_angle(angle, quiet=False):
+    """
+    Writes the player's facing angle (player_pos - 0xC). Returns True if it was written.
+    quiet=True (LockOnManager's re-lock thread) resolves without retries and logs nothing.
+    """
+    chain = reader.chains["player_pos"]
+    x_address = reader.cached_address(chain, name="PlayerX", quiet=quiet)
+    if x_address == -1:
+        if not quiet:
+            print(Fore.RED + "❌   Could not resolve the player position; angle not changed.")
+        return False
+    if quiet:
+        try:
+            reader.pm.write_float(x_address - 0xC, angle)
+        except Exception:
+            reader.invalidate_cache(chain)
+            return False
+        return True
+    if not ps.write_float_using_address(
+            reader, x_address - 0xC, angle, name="Player Angle Boss fight"):  # Angle
+        return False
     print(Fore.WHITE + f"🔄   Player angle changed to {angle}.")
+    return True
 
 
 def reset_boss_flag():
@@ -461,11 +525,45 @@ def get_bossHP():
     return bosshp
 
 
+def read_channel_record():
+    """
+    Returns the latest shared-memory record from the CE logger, or None if the channel
+    is missing or has not changed for CHANNEL_MAX_AGE seconds.
+    """
+    if gundyr_channel is None:
+        return None
+    record = gundyr_channel.read()
+    if record is None or gundyr_channel.age() > CHANNEL_MAX_AGE:
+        return None
+    return record
+
+
+def is_locked_on():
+    """
+    Returns True if the player is locked on according to the CE logger: shared-memory
+    channel first, lock_on.txt as fallback. Used when the lock_on chain is unavailable.
+    """
+    record = read_channel_record()
+    if record is not None:
+        return record[6]
+    try:
+        with open(LOCK_FILE_PATH, 'r') as file:
+            return file.read().strip() == "locked"
+    except:
+        return False
+
+
 def read_gundyr_info():
     """
-    Reads the lines from gundyr_info.txt safely,
+    Fallback for boss info when its memory chains fail: reads the shared-memory channel,
+    then gundyr_info.txt,
     returning (bossX, bossY, bossZ, bossAgle, bossAnim) or None if invalid.
     """
+    record = read_channel_record()
+    if record is not None:
+        _, _, gundyrX, gundyrY, gundyrZ, gundyrAgle, _, gundyrAnim = record
+        return (gundyrX, gundyrY, gundyrZ, gundyrAgle, gundyrAnim)
+
     filename = GUNDYR_INFO_PATH
     if not os.path.exists(filename):
         print(Fore.YELLOW + "⚠ gundyr_info.txt not found. Returning None.")
@@ -501,118 +599,138 @@ def env_trigger():
     print(Fore.GREEN + "✅   Reset trigger file written.")
 
 
-def ensure_lock_on_bruteforce():
-    angles_to_try = [-2.5, 0.0, 2.5]
+def lock_on_state():
+    """
+    Lock-on flag from the last get_state() snapshot ([LockTgtMan] + 0x2821). Only without
+    the lock_on chain (LockTgtMan not resolved) is the CE logger's is_locked_on() used.
+    """
+    if "lock_on" not in reader.chains:
+        return bool(is_locked_on())
+    return observation_builder.lock_on == 1
 
-    for angle in angles_to_try:
-        # Step 1: Check if already locked
-        try:
-            with open(LOCK_FILE_PATH, 'r') as file:
-                status = file.read().strip()
-                if status == "locked":
-                    # print(Fore.GREEN + "🔒 Already locked on.")
-                    return True
-        except:
-            pass
-
-        # Step 2: Change angle and press Q
-        change_player_angle(angle)
-        time.sleep(0.05)
-        pydirectinput.press('q')
-        # print(Fore.WHITE + f"🎯 Trying to lock on at angle: {angle}")
-        time.sleep(0.1)  # Give Lua time to detect
-
-        # Step 3: Check again
-        try:
-            with open(LOCK_FILE_PATH, 'r') as file:
-                status = file.read().strip()
-                if status == "locked":
-                    # print(Fore.GREEN +
-                    #       f"✅ Lock-on successful at angle {angle}")
-                    return True
-        except:
-            pass
-
-    # print(Fore.RED + "❌ Failed to lock on after all angle attempts.")
-    return False
+
+def read_lock_on():
+    """
+    Reads the lock-on byte straight from memory for the pollers (LockOnManager's re-lock
+    thread, the reset's lock_on phase): one quiet walk, no retries or logging, and a
+    failed read counts as unlocked. Without the lock_on chain it reads is_locked_on().
+    """
+    chain = reader.chains.get("lock_on")
+    if chain is None:
+        return bool(is_locked_on())
+    return reader.resolve(chain, data_type="byte") == 1
 
 
 # ------------------ #
 #  Fight Setup        #
 # ------------------ #
 
-def wait_until_in_arena():
+def reset_value(name, since=0.0):
     """
-    Waits until the player enters the boss arena. If the player is dead, triggers a reset instead of waiting.
+    Returns a STATE_LAYOUT field from a snapshot taken at or after `since` (monotonic s),
+    or None if there is no such snapshot yet or the field was not read fresh in it.
+    Used by the reset phases, which must not act on values held from before a write,
+    a death or a load screen.
     """
-    global counter
-    counter = 0  # reset each time
-    while True:
-        if get_player_in_boss_fight():
-            heal_player()
-            break
-        time.sleep(2)
-        start_fight()
-        env_trigger()
-        if counter == 1:
-            print(Fore.RED + "🔃   Timeout: Trying again.")
-        if counter >= 3:
-            print(
-                Fore.RED + "⏰   Timeout: Player did not enter boss arena." + Style.RESET_ALL)
-            teleport_to_boss()
-            print(Fore.WHITE + "🔁   Teleporting player to boss arena.")
-            break
-        counter += 1
+    index = snapshot_engine.index[name]
+    if state_sampler is not None:
+        row = state_sampler.latest(out=sample_row)
+        if row is None or row.item(TIME_COL) < since:
+            return None
+        fresh = int(row.item(FRESH_COL))
+        value = sample_values.item(index)
+    else:
+        value = snapshot_engine.snapshot().item(index)
+        fresh = snapshot_engine.fresh_mask
+    return value if fresh >> index & 1 else None
 
 
-def ready_for_training():
+def clear_boss_flag():
     """
-    Prepare the environment for training.
-    This function should be called once before starting the training loop.
+    A defeated boss stays dead until its flag is cleared and the player respawns.
     """
-    if get_boss_flag():
+    if get_boss_flag() is True:
         print(Fore.RED + "❌   Boss flag not reset. Resetting.")
         reset_boss_flag()
-        time.sleep(0.5)
-        kill_player(10)
-    print("calling env_trigger()")
-    env_trigger()
-    print("calling teleport_to_boss()")
+        kill_player()
+
+
+def boss_flag_clear(since):
+    flag = reset_value("bossFlag", since)
+    return flag is not None and not int(flag) & 0x80
+
+
+def player_alive(since):
+    hp = reset_value("playerHP", since)
+    return hp is not None and hp > 0
+
+
+def trigger_consumed(since):
+    # trigger.lua deletes the file once it has run the prep record.
+    return not os.path.exists(TRIGGER_PATH)
+
+
+def enter_teleport():
+    reader.invalidate_cache()  # the respawned player is a new object; re-walk every chain
     teleport_to_boss()
-    print("calling start_fight()")
-    start_fight()
-    print(Fore.GREEN + "🚀 Training can begin!")
 
 
-def start_fight():
-    time.sleep(0.5)  # Give some time for the game to load
-    try:
-        player_current_pos = get_state()[2]
-    except Exception as e:
-        print(Fore.RED + f"❌   Error getting player position: {e}")
-        return
+def at_fog_wall(since):
+    x, y, z = (reset_value(name, since) for name in ("playerX", "playerY", "playerZ"))
+    if x is None or y is None or z is None:
+        return False
+    tx, ty, tz = ps.BOSS_TELEPORT[:3]
+    return math.dist((x, y, z), (tx, ty, tz)) <= TELEPORT_TOLERANCE
 
-    if player_current_pos < 127 and player_current_pos > 122:
-        print(Fore.WHITE + "⚔️   Starting fight...")
-        pydirectinput.keyDown('w')  # Press and hold the 'w' key
-        time.sleep(0.9)               # Hold it for 2 seconds
-        pydirectinput.keyUp('w')    # Release the 'w' key
-        print(Fore.WHITE + "🕹️   Holding 'w' for 2s for moving forward.")
-        pydirectinput.press('e')
-        print(Fore.WHITE + "🕹️   Executed 'e' press for interacting with fogwall.")
-        time.sleep(1)
-        pydirectinput.press('q')
-        print(Fore.WHITE + "🕹️   Executed 'q' press for locking on to boss.")
-        time.sleep(1)
-    else:
-        print(Fore.WHITE +
-              f"Can't start fight, player_current_pos: {player_current_pos}")
-        return
+
+def in_arena(since):
+    # The fight byte can still be set from the previous episode, so the queued walk
+    # through the fog wall has to have been sent too.
+    return reset_value("inBossFight", since) == 1 and not inputs.pending() and not inputs.is_held('w')
+
+
+def retry_arena_entry():
+    print(Fore.RED + "🔃   Player did not enter the boss arena. Teleporting and trying again.")
+    inputs.release_all()
+    teleport_to_boss()
+    walk_into_arena(delay=0.2)
+
+
+def player_healed(since):
+    hp = reset_value("playerHP", since)
+    return hp is not None and hp >= PLAYER_MAX_HP
 
 
-def is_boss_anim(state, tag):
-    anims = {"W": 11, "E": 12, "A": 13, "T": 14}
-    return state[anims[tag]] == 1
+def press_lock_on():
+    inputs.press('q')
+
+
+RESET_PHASES = (
+    Phase("boss_flag", boss_flag_clear, enter=clear_boss_flag, timeout=1.0, retries=1,
+          required=False),
+    # After a death the player respawns at the bonfire; prep.lua only runs with HP > 0.
+    Phase("respawn", player_alive, fallback=lambda: kill_player(), timeout=RESPAWN_TIMEOUT,
+          retries=1, settle=0.25),
+    Phase("trigger", trigger_consumed, enter=env_trigger, timeout=1.5, required=False),
+    Phase("teleport", at_fog_wall, enter=enter_teleport, timeout=1.0, retries=2, settle=0.1),
+    Phase("enter_arena", in_arena, enter=lambda: walk_into_arena(), fallback=retry_arena_entry,
+          timeout=4.0, retries=2),
+    Phase("heal", player_healed, enter=lambda: heal_player(), timeout=0.5, retries=1,
+          required=False),
+    # LockOnManager keeps retrying during the episode if this one times out.
+    Phase("lock_on", lambda since: read_lock_on(), enter=press_lock_on, timeout=0.75,
+          retries=2, required=False),
+)
+reset_machine = ResetMachine(RESET_PHASES, poll=RESET_POLL)
+
+
+def walk_into_arena(delay=0.0):
+    """
+    Walks from the teleport spot through the fog wall: hold 'w', then interact with 'e'.
+    """
+    print(Fore.WHITE + "⚔️   Starting fight...")
+    inputs.hold('w', 0.9, delay=delay)  # Walk forward for 0.9 seconds
+    inputs.press('e', delay=delay + 0.9)  # Interact with the fog wall
 
 
 # ------------------ #
@@ -621,17 +739,52 @@ def is_boss_anim(state, tag):
 
 def initialize_pointers():
     """ Create a new PointerReader or re-attach to DS3. """
-    global reader
+    global reader, snapshot_engine, state_sampler, gundyr_channel
+    global sample_row, sample_values, boss_pose_mask, boss_anim_mask
 
+    if gundyr_channel is None:
+        gundyr_channel = ChannelReader.open()
     if reader is None:
         reader = ps.PointerReader("DarkSoulsIII.exe")
+        if reader.region_map is not None:
+            reader.region_map.start()  # VirtualQueryEx walks stay off the step loop
+        if reader.liveness is not None:
+            reader.liveness.interval = LIVENESS_INTERVAL
+            reader.liveness.add_callback(on_game_exit)
+            reader.liveness.start()
+        if reader.instrumentation is not None:
+            reader.instrumentation.install_signal_handler()
         print(Fore.WHITE + "✅ Reader attached once.")
     else:
         print(Fore.WHITE + "✅ Reusing existing reader.")
+    if snapshot_engine is None or snapshot_engine.reader is not reader:
+        if state_sampler is not None:
+            state_sampler.stop()
+            state_sampler = None
+        snapshot_engine = SnapshotEngine(reader, STATE_LAYOUT, reader.chains)
+        boss_pose_mask = snapshot_engine.mask_of("bossX", "bossY", "bossZ", "bossAngle")
+        boss_anim_mask = snapshot_engine.mask_of("bossAnimId")
+    if state_sampler is None and SAMPLER_RATE_HZ > 0:
+        state_sampler = StateSampler(snapshot_engine, rate_hz=SAMPLER_RATE_HZ)
+        state_sampler.start()
+        sample_row = np.empty(state_sampler.buffer.shape[1], dtype=state_sampler.buffer.dtype)
+        sample_values = sample_row[FIRST_FIELD_COL:]
+
+
+def on_game_exit(monitor):
+    """
+    Runs on the liveness monitor's thread when the attached game process exits.
+    """
+    print(Fore.RED + f"❌ DS3 (pid {monitor.pid}) exited; the next step will stop training.")
 
 
 def is_ds3_running():
-    """Returns True if DarkSoulsIII.exe is running."""
+    """
+    Returns True if DarkSoulsIII.exe is running. Once attached this reads the liveness
+    monitor's flag (the PID pinned at attach); before that it falls back to a process scan.
+    """
+    if reader is not None and reader.liveness is not None:
+        return reader.liveness.alive
     for proc in psutil.process_iter(['name']):
         if proc.info['name'] == "DarkSoulsIII.exe":
             return True
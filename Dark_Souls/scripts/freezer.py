@@ -0,0 +1,221 @@
+# freezer.py
+import heapq
+import itertools
+import struct
+import threading
+import time
+
+from memory_layout import STRUCT_CODES
+
+########################################
+# Freezer Service
+########################################
+
+
+class FreezeEntry:
+    """
+    One frozen value: where it lives, what to write, and how often.
+    """
+    __slots__ = ("key", "chain", "delta", "data_type", "value", "payload", "interval",
+                 "name", "version", "writes", "failures", "missed", "max_late")
+
+    def __init__(self, key, chain, delta, data_type, value, interval, name):
+        self.key = key
+        self.chain = tuple(chain)
+        self.delta = delta
+        self.data_type = data_type
+        self.name = name
+        self.version = 0
+        self.writes = 0
+        self.failures = 0
+        self.missed = 0       # deadlines skipped because the scheduler ran late
+        self.max_late = 0.0   # worst lateness of a write (s)
+        self.set(value, interval)
+
+    def set(self, value, interval):
+        self.value = value
+        self.payload = struct.pack("<" + STRUCT_CODES[self.data_type], value)
+        self.interval = max(interval, 0.001)
+
+
+class FreezeHandle:
+    """
+    Handle returned by Freezer.freeze(). Setting `running = False` unfreezes the value,
+    like the per-value threads freeze_value() used to return.
+    """
+
+    def __init__(self, freezer, key):
+        self.freezer = freezer
+        self.key = key
+
+    @property
+    def running(self):
+        return self.key in self.freezer.entries
+
+    @running.setter
+    def running(self, value):
+        if not value:
+            self.freezer.unfreeze(self.key)
+
+    def is_alive(self):
+        return self.running
+
+    def update(self, value=None, interval_ms=None):
+        self.freezer.update(self.key, value=value, interval_ms=interval_ms)
+
+
+class Freezer:
+    """
+    Keeps any number of values frozen (like CE's freeze) from one scheduler thread.
+    Entries sit in a heap ordered by their next deadline; each write reuses the reader's
+    cached chain address (root-pointer revalidation) and is a single write_bytes call.
+    A chain that fails is invalidated and retried on its next deadline without blocking
+    the other entries.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.entries = {}
+        self._heap = []           # (deadline, key, version)
+        self._keys = itertools.count(1)
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+    ########################################
+    # Thread Control
+    ########################################
+    def start(self):
+        if self.running:
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="Freezer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    ########################################
+    # Entries
+    ########################################
+    def freeze(self, chain, value, data_type="int", interval_ms=100, delta=0, name=None):
+        """
+        Starts writing `value` to (chain address + delta) every interval_ms.
+        Returns a FreezeHandle. Starts the scheduler thread if needed.
+        """
+        if data_type not in STRUCT_CODES:
+            raise ValueError(f"Unsupported freeze type '{data_type}'.")
+        key = next(self._keys)
+        entry = FreezeEntry(key, chain, delta, data_type, value, interval_ms / 1000.0,
+                            name or f"freeze {key}")
+        with self._cond:
+            self.entries[key] = entry
+            heapq.heappush(self._heap, (time.monotonic(), key, entry.version))
+            self._cond.notify()
+        self.start()
+        print(f"🧊 Freezing {entry.name} {list(map(hex, entry.chain))} to {value} every {interval_ms}ms...")
+        return FreezeHandle(self, key)
+
+    def update(self, key, value=None, interval_ms=None):
+        """
+        Changes a frozen value and/or its interval; the new value is written right away.
+        """
+        with self._cond:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            entry.set(entry.value if value is None else value,
+                      entry.interval if interval_ms is None else interval_ms / 1000.0)
+            entry.version += 1
+            heapq.heappush(self._heap, (time.monotonic(), key, entry.version))
+            self._cond.notify()
+        return True
+
+    def unfreeze(self, key):
+        with self._cond:
+            return self.entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._cond:
+            self.entries.clear()
+            self._heap.clear()
+
+    def stats(self):
+        """
+        Returns {name: {writes, failures, missed, max_late_ms}} plus totals under "total".
+        """
+        with self._cond:
+            entries = list(self.entries.values())
+        out = {e.name: {"writes": e.writes, "failures": e.failures, "missed": e.missed,
+                        "max_late_ms": e.max_late * 1000} for e in entries}
+        out["total"] = {
+            "writes": sum(e.writes for e in entries),
+            "failures": sum(e.failures for e in entries),
+            "missed": sum(e.missed for e in entries),
+            "max_late_ms": max((e.max_late for e in entries), default=0.0) * 1000,
+        }
+        return out
+
+    ########################################
+    # Scheduler
+    ########################################
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    if self._heap:
+                        delay = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+                deadline, key, version = heapq.heappop(self._heap)
+                entry = self.entries.get(key)
+                if entry is None or entry.version != version:
+                    continue  # unfrozen or rescheduled by update()
+
+            now = time.monotonic()
+            self._write(entry)
+            late = now - deadline
+            if late > entry.max_late:
+                entry.max_late = late
+            next_deadline = deadline + entry.interval
+            if next_deadline <= now:
+                # Ran late by whole intervals: skip them instead of writing in a burst.
+                skipped = int((now - deadline) // entry.interval)
+                entry.missed += skipped
+                next_deadline = deadline + (skipped + 1) * entry.interval
+            with self._cond:
+                if key in self.entries and entry.version == version:
+                    heapq.heappush(self._heap, (next_deadline, key, version))
+
+    def _write(self, entry):
+        reader = self.reader
+        if reader is None or not reader._is_process_valid():
+            entry.failures += 1
+            return
+        # Quiet: a chain that stays unresolvable must neither flood stdout at freeze rates
+        # nor spend the main loop's retry budget.
+        addr = reader.cached_address(entry.chain, name=entry.name, quiet=True)
+        if addr == -1:
+            entry.failures += 1
+            return
+        try:
+            with reader.write_lock:
+                reader.pm.write_bytes(addr + entry.delta, entry.payload, len(entry.payload))
+            entry.writes += 1
+        except Exception:
+            reader.invalidate_cache(entry.chain)
+            entry.failures += 1
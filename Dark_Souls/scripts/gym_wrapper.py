@@ -6,21 +6,26 @@ import numpy as np
 import time
 from colorama import Fore
 import dark_souls_api
-import pointer_scanner as ps
+from observation import DEFAULT_FEATURES, FeaturePipeline
 
-reader = ps.PointerReader("DarkSoulsIII.exe")
 episode = 0
+# Observation config: features from observation.FEATURES, stacked over the last `stack` steps.
+# The default reproduces the original 15-element state, e.g.
+# {"features": ("state", "anim", "distance", "bearing", "estus", "lock_on", "hp_delta"), "stack": 4}
+OBS_CONFIG = {"features": DEFAULT_FEATURES, "stack": 1}
 
 
 class DarkSoulsGundyrEnv(gym.Env):
     metadata = {"render.modes": ["human"]}
 
-    def __init__(self, render_mode="human"):
+    def __init__(self, render_mode="human", obs_config=None):
         super(DarkSoulsGundyrEnv, self).__init__()
         self.render_mode = render_mode
-        # Our state vector has 15 elements.
+        # The observation layout (and its size) comes from the feature config.
+        self.features = FeaturePipeline(**(obs_config or OBS_CONFIG))
+        low, high = self.features.bounds()
         self.observation_space = spaces.Box(
-            low=-np.inf, high=np.inf, shape=(15,), dtype=np.float32)
+            low=low, high=high, shape=(self.features.size,), dtype=np.float32)
         self.action_space = spaces.Discrete(3)
         self.current_state = None
         self.steps = 0
@@ -36,50 +41,43 @@ class DarkSoulsGundyrEnv(gym.Env):
 
     def reset(self, **kwargs):
         print(Fore.WHITE + "🔄   gym_wrapper.py: Resetting environment...")
-        print(Fore.WHITE + "--------------------------------")
-        print(Fore.WHITE + f"📘   Sleeping 8 seconds")
-        print(Fore.WHITE + "--------------------------------")
-        time.sleep(8)
-
-        max_retries = 10
+        # reset_environment() waits on memory conditions (respawn, teleport, arena entry)
+        # instead of fixed sleeps and returns None if a required phase failed.
+        max_retries = 3
         for attempt in range(max_retries):
             self.current_state = dark_souls_api.reset_environment()
-
-            # Check for valid state
-            if self.current_state is None or np.any(np.isnan(self.current_state)):
-                print(
-                    Fore.YELLOW + f"⏳   Attempt {attempt+1}/{max_retries}: Invalid state, retrying...")
-                time.sleep(1)
-                continue
-
-            # Try reading player HP
-            try:
-                hp = reader.resolve(
-                    [0x04543F60, 0x28, 0x3A0, 0x70, 0x90], data_type="4byte")
-                if hp and hp > 0:
-                    print(Fore.GREEN +
-                          f"✅   Reset successful. Player HP: {hp}")
-                    break
-                else:
-                    print(
-                        Fore.YELLOW + f"⏳   Attempt {attempt+1}/{max_retries}: HP = 0, retrying...")
-            except:
-                print(
-                    Fore.RED + f"❌   Attempt {attempt+1}/{max_retries}: Error reading HP, retrying...")
-
-            time.sleep(1)
+            if self.current_state is not None and not np.any(np.isnan(self.current_state)):
+                print(Fore.GREEN +
+                      f"✅   Reset successful. Player HP: {self.current_state[0]:.0f}")
+                break
+            print(
+                Fore.YELLOW + f"⏳   Attempt {attempt+1}/{max_retries}: Invalid state, retrying...")
+        else:
+            raise RuntimeError(
+                f"Environment reset failed {max_retries} times "
+                f"(last failed phase: {dark_souls_api.reset_machine.failed_phase}).")
 
         self.steps = 0
         self.last_player_position = None
         self.last_position_time = None
-        return self.current_state, {}
+        # A copy: the first push() of the episode overwrites the pipeline's stacked frames.
+        obs = self.features.reset(
+            self.current_state, *dark_souls_api.feature_inputs(self.features.features)).copy()
+        machine = dark_souls_api.reset_machine
+        return obs, {"reset_s": machine.last_total, "reset_phases": dict(machine.last)}
 
     def step(self, action):
         self.steps += 1
         dark_souls_api.current_step_global = self.steps
         next_state, reward, done, info = dark_souls_api.step_environment(
             action)
+        # next_state and obs are reused buffers (see dark_souls_api.get_state and
+        # FeaturePipeline). SB3's VecEnv copies a mid-episode obs into its own batch right
+        # away, but keeps the last obs of an episode as info["terminal_observation"] and
+        # then calls reset(), which rewrites the pipeline; that one is returned as a copy.
         self.current_state = next_state
+        obs = self.features.push(
+            next_state, *dark_souls_api.feature_inputs(self.features.features))
 
         terminated = False
         truncated = False
@@ -110,7 +108,9 @@ class DarkSoulsGundyrEnv(gym.Env):
         else:
             info["death_reason"] = "alive"
 
-        return self.current_state, reward, terminated, truncated, info
+        if terminated or truncated:
+            obs = obs.copy()
+        return obs, reward, terminated, truncated, info
 
     def render(self):
         if self.render_mode == "human":
@@ -0,0 +1,226 @@
+# input_backend.py
+import heapq
+import itertools
+import os
+import threading
+import time
+
+try:
+    import pydirectinput
+except ImportError:  # pydirectinput is Windows-only; the recording backend still works
+    pydirectinput = None
+
+########################################
+# Key Backends
+########################################
+
+
+class DirectInputBackend:
+    """
+    Sends key transitions through pydirectinput with its built-in pause disabled
+    (pydirectinput.PAUSE defaults to 0.1 s after every call; a press() cost 0.2 s).
+    Timing is explicit in InputDispatcher instead.
+    """
+    name = "pydirectinput"
+
+    def __init__(self):
+        if pydirectinput is None:
+            raise RuntimeError("pydirectinput is not installed (it requires Windows).")
+        pydirectinput.PAUSE = 0
+
+    def key_down(self, key):
+        pydirectinput.keyDown(key, _pause=False)
+
+    def key_up(self, key):
+        pydirectinput.keyUp(key, _pause=False)
+
+
+class RecordingBackend:
+    """
+    Records key transitions as (monotonic time, "down"/"up", key) instead of sending them,
+    for tests and benchmarks on any OS.
+    """
+    name = "recording"
+
+    def __init__(self):
+        self.events = []
+
+    def key_down(self, key):
+        self.events.append((time.monotonic(), "down", key))
+
+    def key_up(self, key):
+        self.events.append((time.monotonic(), "up", key))
+
+
+def make_backend():
+    """
+    pydirectinput when available, else (or with DS3_INPUT_BACKEND=recording) a RecordingBackend.
+    """
+    if os.environ.get("DS3_INPUT_BACKEND") != "recording" and pydirectinput is not None:
+        return DirectInputBackend()
+    print("🎮 Using the recording input backend (no keys are sent).")
+    return RecordingBackend()
+
+########################################
+# Dispatcher
+########################################
+
+
+class InputDispatcher:
+    """
+    Sends key transitions from one dispatch thread, off the env thread.
+
+    Commands sit in a heap ordered by due time (monotonic), so press(key, delay=...) and
+    hold() queue timed sequences without sleeping the caller. The dispatcher tracks
+    which keys are held and drops transitions that would not change anything (a
+    keyUp for a released key, a keyDown for a held one), counting them in `dropped`.
+
+        inputs = InputDispatcher(make_backend())
+        inputs.press("u")                   # down now, up press_duration later
+        inputs.key_down("w")                # no-op if w is already held
+        inputs.press("q", delay=0.05)
+        inputs.flush()                      # wait until everything queued was sent
+    """
+
+    def __init__(self, backend, press_duration=0.05):
+        self.backend = backend
+        self.press_duration = press_duration  # key held per press (3 frames at 60 fps)
+        self.held = set()
+        self.sent = 0
+        self.dropped = 0
+        self.max_late = 0.0      # worst delay between a command's due time and its send (s)
+        self._heap = []          # (due, seq, "down"/"up", key)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stop = False
+        self._thread = None
+
+    ########################################
+    # Commands
+    ########################################
+    def key_down(self, key, delay=0.0):
+        self._schedule(delay, "down", key)
+
+    def key_up(self, key, delay=0.0):
+        self._schedule(delay, "up", key)
+
+    def press(self, key, delay=0.0, duration=None):
+        """
+        Queues a tap: key down after `delay`, up `duration` (press_duration) later.
+        """
+        duration = self.press_duration if duration is None else duration
+        now = time.monotonic()
+        with self._cond:
+            self._push(now + delay, "down", key)
+            self._push(now + delay + duration, "up", key)
+            self._cond.notify()
+        self.start()
+
+    def hold(self, key, duration, delay=0.0):
+        self.press(key, delay=delay, duration=duration)
+
+    def release_all(self, timeout=1.0):
+        """
+        Drops queued commands and releases every held key now. The keyUps are sent from
+        the calling thread under the dispatcher's lock, once any in-flight command has
+        been sent, so the dispatch thread cannot press a key in between.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._heap.clear()
+            while self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            for key in list(self.held):
+                try:
+                    self.backend.key_up(key)
+                    self.held.discard(key)
+                    self.sent += 1
+                except Exception as e:
+                    print(f"🎮❌ InputDispatcher: up '{key}' failed: {e}")
+            self._cond.notify_all()
+
+    def is_held(self, key):
+        return key in self.held
+
+    def pending(self):
+        return len(self._heap)
+
+    def flush(self, timeout=5.0):
+        """
+        Blocks until every queued command has been sent. Returns False on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._heap or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _schedule(self, delay, kind, key):
+        with self._cond:
+            self._push(time.monotonic() + delay, kind, key)
+            self._cond.notify()
+        self.start()
+
+    def _push(self, due, kind, key):
+        heapq.heappush(self._heap, (due, next(self._seq), kind, key))
+
+    ########################################
+    # Thread Control
+    ########################################
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="InputDispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    if self._heap:
+                        delay = self._heap[0][0] - time.monotonic()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                if self._stop:
+                    return
+                due, _, kind, key = heapq.heappop(self._heap)
+                if (kind == "down") == (key in self.held):
+                    self.dropped += 1
+                    self._cond.notify_all()
+                    continue
+                self._busy = True
+            try:
+                if kind == "down":
+                    self.backend.key_down(key)
+                    self.held.add(key)
+                else:
+                    self.backend.key_up(key)
+                    self.held.discard(key)
+                self.sent += 1
+            except Exception as e:
+                print(f"🎮❌ InputDispatcher: {kind} '{key}' failed: {e}")
+            late = time.monotonic() - due
+            if late > self.max_late:
+                self.max_late = late
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
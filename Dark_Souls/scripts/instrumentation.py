@@ -0,0 +1,174 @@
+# instrumentation.py
+"""
+Opt-in, low-overhead counters for the memory-reading stack.
+
+Per field (getter/chain name or step phase) it keeps read, failure, retry, cache hit and
+cache miss counts plus a latency histogram with power-of-two nanosecond buckets
+(bucket b holds latencies in [2^(b-1), 2^b) ns). Counters are preallocated Python lists
+indexed by a per-name slot, so recording one sample is a dict lookup, a bit_length()
+and a few list increments.
+
+Enable with the DS3_INSTRUMENT environment variable (any non-empty value) or
+PointerReader.enable_instrumentation(). Dump with Instrumentation.dump(path), or send
+the process SIGUSR1 (SIGBREAK / Ctrl+Break on Windows) after install_signal_handler().
+"""
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(os.path.dirname(script_dir), "data")
+INSTRUMENTATION_PATH = os.path.join(data_dir, "instrumentation.json")
+N_BUCKETS = 40  # up to 2^39 ns (~9 min); slower samples land in the last bucket
+
+########################################
+# Counters
+########################################
+
+
+class Instrumentation:
+    def __init__(self, capacity=128):
+        self.capacity = capacity
+        self.slots = {}
+        self.names = []
+        self.reads = [0] * capacity
+        self.failures = [0] * capacity
+        self.retries = [0] * capacity
+        self.cache_hits = [0] * capacity
+        self.cache_misses = [0] * capacity
+        self.total_ns = [0] * capacity
+        self.max_ns = [0] * capacity
+        self.histograms = [[0] * N_BUCKETS for _ in range(capacity)]
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def slot(self, name):
+        """
+        Returns the counter index for `name`, allocating one on first use.
+        """
+        index = self.slots.get(name)
+        if index is None:
+            with self._lock:
+                index = self.slots.get(name)
+                if index is None:
+                    index = len(self.names)
+                    if index >= self.capacity:
+                        self._grow()
+                    self.names.append(name)
+                    self.slots[name] = index
+        return index
+
+    def _grow(self):
+        extra = self.capacity
+        for counters in (self.reads, self.failures, self.retries, self.cache_hits,
+                         self.cache_misses, self.total_ns, self.max_ns):
+            counters.extend([0] * extra)
+        self.histograms.extend([0] * N_BUCKETS for _ in range(extra))
+        self.capacity += extra
+
+    ########################################
+    # Recording
+    ########################################
+    def record(self, name, elapsed_ns, ok=True):
+        """
+        Records one read (or phase) of `name` that took elapsed_ns.
+        """
+        i = self.slots.get(name)
+        if i is None:
+            i = self.slot(name)
+        self.reads[i] += 1
+        if not ok:
+            self.failures[i] += 1
+        self.total_ns[i] += elapsed_ns
+        if elapsed_ns > self.max_ns[i]:
+            self.max_ns[i] = elapsed_ns
+        bucket = elapsed_ns.bit_length()
+        self.histograms[i][bucket if bucket < N_BUCKETS else N_BUCKETS - 1] += 1
+
+    def retry(self, name):
+        i = self.slots.get(name)
+        self.retries[self.slot(name) if i is None else i] += 1
+
+    def cache(self, name, hit):
+        i = self.slots.get(name)
+        if i is None:
+            i = self.slot(name)
+        if hit:
+            self.cache_hits[i] += 1
+        else:
+            self.cache_misses[i] += 1
+
+    def reset(self):
+        """
+        Zeroes every counter (slots are kept).
+        """
+        with self._lock:
+            for counters in (self.reads, self.failures, self.retries, self.cache_hits,
+                             self.cache_misses, self.total_ns, self.max_ns):
+                counters[:] = [0] * len(counters)
+            for histogram in self.histograms:
+                histogram[:] = [0] * N_BUCKETS
+            self.started = time.time()
+
+    ########################################
+    # Reporting
+    ########################################
+    def summary(self):
+        """
+        Returns {name: counters, mean/max latency (us), cache hit rate, histogram}.
+        Histograms are {bucket upper bound in ns: count}, empty buckets omitted.
+        """
+        out = {}
+        for name, i in list(self.slots.items()):
+            reads = self.reads[i]
+            lookups = self.cache_hits[i] + self.cache_misses[i]
+            out[name] = {
+                "reads": reads,
+                "failures": self.failures[i],
+                "retries": self.retries[i],
+                "cache_hits": self.cache_hits[i],
+                "cache_misses": self.cache_misses[i],
+                "cache_hit_rate": self.cache_hits[i] / lookups if lookups else None,
+                "mean_us": self.total_ns[i] / reads / 1000 if reads else None,
+                "max_us": self.max_ns[i] / 1000,
+                "total_ms": self.total_ns[i] / 1e6,
+                "histogram_ns": {str(1 << b): n for b, n in enumerate(self.histograms[i]) if n},
+            }
+        return out
+
+    def dump(self, path=INSTRUMENTATION_PATH):
+        report = {"started": self.started, "dumped": time.time(), "fields": self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Instrumentation dumped to {path}")
+        return path
+
+    def print_top(self, n=10):
+        """
+        Prints the fields that account for the most total time.
+        """
+        fields = sorted(self.summary().items(), key=lambda item: -item[1]["total_ms"])
+        for name, s in fields[:n]:
+            mean = f"{s['mean_us']:.1f}" if s["mean_us"] is not None else "-"
+            print(f"📊 {name:>24}: {s['total_ms']:9.1f} ms total, {mean} us mean, "
+                  f"{s['reads']} reads, {s['failures']} failed, {s['retries']} retries")
+
+    def install_signal_handler(self, path=INSTRUMENTATION_PATH):
+        """
+        Dumps to `path` on SIGUSR1 (SIGBREAK on Windows). Main thread only.
+        """
+        signum = getattr(signal, "SIGBREAK" if sys.platform == "win32" else "SIGUSR1", None)
+        if signum is None:
+            return False
+        signal.signal(signum, lambda *_: self.dump(path))
+        return True
+
+
+def from_environment():
+    """
+    Returns an Instrumentation if DS3_INSTRUMENT is set, else None.
+    """
+    return Instrumentation() if os.environ.get("DS3_INSTRUMENT") else None
@@ -0,0 +1,84 @@
+# liveness.py
+import threading
+
+########################################
+# Process Liveness Monitor
+########################################
+
+
+class LivenessMonitor:
+    """
+    Watches the process pinned by a memory backend at attach time.
+
+    A background thread calls backend.is_alive() (a zero-timeout wait on the process
+    handle for the live game, no process enumeration) every `interval` seconds and
+    keeps the result in `alive`, so the step loop only reads a bool. When the process
+    goes away `exited` is set and every `on_exit` callback runs once on the monitor
+    thread; check() does the same synchronously.
+    """
+
+    def __init__(self, backend, interval=1.0, on_exit=None):
+        self.backend = backend
+        self.pid = getattr(backend, "pid", None)
+        self.interval = interval
+        self.alive = True
+        self.exited = threading.Event()
+        self._callbacks = [on_exit] if on_exit is not None else []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_callback(self, callback):
+        """
+        Registers callback(monitor) to run once when the process exits.
+        """
+        self._callbacks.append(callback)
+        if self.exited.is_set():
+            callback(self)
+
+    def check(self):
+        """
+        Queries the backend now and returns the result (fires the exit event on a change).
+        """
+        if not self.alive:
+            return False
+        try:
+            alive = self.backend.is_alive()
+        except Exception as e:
+            print(f"👉❌ LivenessMonitor: liveness check failed: {e}")
+            alive = False
+        if not alive:
+            self._mark_exited()
+        return alive
+
+    def _mark_exited(self):
+        self.alive = False
+        if self.exited.is_set():
+            return
+        self.exited.set()
+        print(f"👉❌ Target process {self.pid or self.backend.name} exited.")
+        for callback in self._callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"👉❌ LivenessMonitor: exit callback failed: {e}")
+
+    ########################################
+    # Background Checks
+    ########################################
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="LivenessMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.check():
+                return
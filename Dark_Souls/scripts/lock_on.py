@@ -0,0 +1,94 @@
+# lock_on.py
+import threading
+import time
+
+########################################
+# Lock-On Manager
+########################################
+
+
+class LockOnManager:
+    """
+    Keeps the player locked on to the boss without blocking the step loop.
+
+    update() is fed the lock flag of every state snapshot. Only a locked -> unlocked
+    transition during the fight (or an unlocked first step after reset(), since the
+    fight starts with a lock-on press) starts a re-lock attempt, which runs on its own
+    thread: for each angle it turns the player, taps the lock-on key and polls
+    read_locked() for up to `settle` seconds, stopping at the first success.
+    At most one attempt runs at a time, and a failed attempt is not retried for
+    `cooldown` seconds.
+    """
+
+    def __init__(self, inputs, read_locked, set_angle, angles=(-2.5, 0.0, 2.5), key="q",
+                 settle=0.15, poll=0.01, cooldown=1.0):
+        self.inputs = inputs
+        self.read_locked = read_locked   # () -> bool, safe to call off the env thread
+        self.set_angle = set_angle       # (radians) -> None
+        self.angles = tuple(angles)
+        self.key = key
+        self.settle = settle
+        self.poll = poll
+        self.cooldown = cooldown
+        self.attempts = 0
+        self.successes = 0
+        self.failures = 0
+        self.last_duration = 0.0
+        self._was_locked = True
+        self._retry_after = 0.0
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def reset(self):
+        """
+        Starts an episode: the player is expected to be locked on.
+        """
+        self._was_locked = True
+        self._retry_after = 0.0
+
+    def update(self, locked, in_fight=True):
+        """
+        Called once per step with the snapshot's lock flag. Never blocks.
+        Returns True if a re-lock attempt was started.
+        """
+        lost = self._was_locked and not locked
+        self._was_locked = locked
+        if locked or not in_fight or self.busy:
+            return False
+        # Still unlocked: only retry once a failed attempt's cooldown has passed.
+        if not lost and (self._retry_after == 0.0 or time.monotonic() < self._retry_after):
+            return False
+        self._thread = threading.Thread(target=self._relock, name="LockOn", daemon=True)
+        self._thread.start()
+        return True
+
+    def _relock(self):
+        start = time.monotonic()
+        self.attempts += 1
+        ok = False
+        for angle in self.angles:
+            if self.read_locked():
+                ok = True
+                break
+            self.set_angle(angle)
+            self.inputs.press(self.key)
+            deadline = time.monotonic() + self.inputs.press_duration + self.settle
+            while time.monotonic() < deadline:
+                time.sleep(self.poll)
+                if self.read_locked():
+                    ok = True
+                    break
+            if ok:
+                break
+        self.last_duration = time.monotonic() - start
+        if ok:
+            self.successes += 1
+            self._retry_after = 0.0
+            self._was_locked = True
+        else:
+            self.failures += 1
+            self._retry_after = time.monotonic() + self.cooldown
+            print(f"🛑 Could not lock on after {len(self.angles)} angles; retrying in {self.cooldown:.1f}s.")
@@ -0,0 +1,445 @@
+# memory_backend.py
+import bisect
+import ctypes
+import struct
+
+try:
+    import pymem.memory
+    from pymem import Pymem
+    from pymem.process import module_from_name
+except ImportError:  # pymem is Windows-only; the simulated backend still works
+    Pymem = None
+    module_from_name = None
+
+# VirtualQueryEx constants used by PymemBackend.regions()
+MEM_COMMIT = 0x1000
+PAGE_READABLE = 0x02 | 0x04 | 0x08 | 0x20 | 0x40 | 0x80  # R, RW, WC, XR, XRW, XWC
+PAGE_WRITABLE = 0x04 | 0x08 | 0x40 | 0x80                # RW, WC, XRW, XWC
+PAGE_GUARD = 0x100
+USER_SPACE_END = 0x7FFFFFFFFFFF
+# WaitForSingleObject result for a process handle that has not exited yet
+WAIT_TIMEOUT = 0x102
+
+########################################
+# Backend Interface
+########################################
+
+
+class MemoryAccessError(Exception):
+    """
+    Raised by backends when an address cannot be read or written.
+    """
+
+
+_U8 = struct.Struct("<B")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_U64 = struct.Struct("<Q")
+_F32 = struct.Struct("<f")
+_F64 = struct.Struct("<d")
+
+
+class MemoryBackend:
+    """
+    Minimal memory interface used by PointerReader.
+    Method names mirror pymem's so existing `reader.pm.read_*` / `write_*` calls keep working.
+    Subclasses must implement read_bytes() and write_bytes(); the typed helpers are built on them.
+    """
+    name = "backend"
+    module_base = 0
+    module_size = 0
+    pid = None
+
+    def read_bytes(self, address, length):
+        raise NotImplementedError
+
+    def write_bytes(self, address, value, length):
+        raise NotImplementedError
+
+    def regions(self, writable_only=False):
+        """
+        Returns a list of (start, size) tuples for readable (or writable) memory.
+        Empty if unsupported.
+        """
+        return []
+
+    def is_alive(self):
+        """
+        Cheap check that the target still exists (no process enumeration).
+        """
+        return True
+
+    def close(self):
+        pass
+
+    # Typed reads
+    def read_uchar(self, address):
+        return _U8.unpack(self.read_bytes(address, 1))[0]
+
+    def read_uint(self, address):
+        return _U32.unpack(self.read_bytes(address, 4))[0]
+
+    def read_int(self, address):
+        return _I32.unpack(self.read_bytes(address, 4))[0]
+
+    def read_ulonglong(self, address):
+        return _U64.unpack(self.read_bytes(address, 8))[0]
+
+    def read_float(self, address):
+        return _F32.unpack(self.read_bytes(address, 4))[0]
+
+    def read_double(self, address):
+        return _F64.unpack(self.read_bytes(address, 8))[0]
+
+    def read_string(self, address, byte=50):
+        data = self.read_bytes(address, byte)
+        return data.split(b"\x00", 1)[0].decode("utf-8", errors="replace")
+
+    # Typed writes
+    def write_uchar(self, address, value):
+        self.write_bytes(address, _U8.pack(value), 1)
+
+    def write_uint(self, address, value):
+        self.write_bytes(address, _U32.pack(value), 4)
+
+    def write_int(self, address, value):
+        self.write_bytes(address, _I32.pack(value), 4)
+
+    def write_ulonglong(self, address, value):
+        self.write_bytes(address, _U64.pack(value), 8)
+
+    def write_float(self, address, value):
+        self.write_bytes(address, _F32.pack(value), 4)
+
+    def write_double(self, address, value):
+        self.write_bytes(address, _F64.pack(value), 8)
+
+########################################
+# Pymem Backend (live game)
+########################################
+
+
+class PymemBackend(MemoryBackend):
+    """
+    Live-process backend. Typed calls go straight to pymem to avoid an extra struct round-trip.
+    """
+
+    def __init__(self, process_name: str):
+        if Pymem is None:
+            raise RuntimeError("pymem is not installed (it requires Windows).")
+        self.name = process_name
+        self.pm = Pymem(process_name)
+        self.process_handle = self.pm.process_handle
+        self.pid = self.pm.process_id
+        module = module_from_name(self.pm.process_handle, process_name)
+        self.module_base = module.lpBaseOfDll
+        self.module_size = module.SizeOfImage
+
+    def regions(self, writable_only=False):
+        """
+        Walks the address space with VirtualQueryEx and returns committed, readable regions
+        (only writable ones if writable_only: heaps and module .data, where pointers live).
+        """
+        out = []
+        address = 0
+        while address < USER_SPACE_END:
+            try:
+                mbi = pymem.memory.virtual_query(self.process_handle, address)
+            except Exception:
+                break
+            base = mbi.BaseAddress or 0
+            size = mbi.RegionSize
+            if size == 0:
+                break
+            wanted = PAGE_WRITABLE if writable_only else PAGE_READABLE
+            if mbi.State == MEM_COMMIT and mbi.Protect & wanted \
+                    and not mbi.Protect & PAGE_GUARD:
+                out.append((base, size))
+            address = base + size
+        return out
+
+    def read_bytes(self, address, length):
+        return self.pm.read_bytes(address, length)
+
+    def write_bytes(self, address, value, length):
+        self.pm.write_bytes(address, value, length)
+
+    def is_alive(self):
+        """
+        Polls the process handle pinned at attach: a zero-timeout wait on it times out
+        while the process runs and succeeds once it has exited.
+        """
+        handle = self.process_handle
+        return bool(handle) and \
+            ctypes.windll.kernel32.WaitForSingleObject(handle, 0) == WAIT_TIMEOUT
+
+    def close(self):
+        self.pm.close_process()
+
+    def read_uchar(self, address):
+        return self.pm.read_uchar(address)
+
+    def read_uint(self, address):
+        return self.pm.read_uint(address)
+
+    def read_int(self, address):
+        return self.pm.read_int(address)
+
+    def read_ulonglong(self, address):
+        return self.pm.read_ulonglong(address)
+
+    def read_float(self, address):
+        return self.pm.read_float(address)
+
+    def read_double(self, address):
+        return self.pm.read_double(address)
+
+    def read_string(self, address, byte=50):
+        return self.pm.read_string(address, byte)
+
+    def write_uchar(self, address, value):
+        self.pm.write_uchar(address, value)
+
+    def write_uint(self, address, value):
+        self.pm.write_uint(address, value)
+
+    def write_int(self, address, value):
+        self.pm.write_int(address, value)
+
+    def write_ulonglong(self, address, value):
+        self.pm.write_ulonglong(address, value)
+
+    def write_float(self, address, value):
+        self.pm.write_float(address, value)
+
+    def write_double(self, address, value):
+        self.pm.write_double(address, value)
+
+########################################
+# Simulated Backend (in-process target)
+########################################
+PAGE_SHIFT = 12
+PAGE_SIZE = 1 << PAGE_SHIFT
+PAGE_MASK = PAGE_SIZE - 1
+
+
+class SimulatedBackend(MemoryBackend):
+    """
+    In-process stand-in for the game: a sparse, page-backed bytearray address space.
+    Mapped ranges read as zeros until written; unmapped addresses raise MemoryAccessError
+    just like a failed ReadProcessMemory. Objects for pointer chains are bump-allocated
+    from a fake heap, so any chain can be made resolvable with install_chain().
+    """
+    name = "simulated"
+
+    def __init__(self, module_base=0x140000000, module_size=0x5000000,
+                 heap_base=0x7FF000000000, object_size=0x3000):
+        self.module_base = module_base
+        self.module_size = module_size
+        self.object_size = object_size
+        self._pages = {}        # page number -> bytearray(PAGE_SIZE), materialized on write
+        self._mapped = []       # sorted, non-overlapping [start, end) ranges
+        self._mapped_starts = []
+        self._heap_cursor = heap_base
+        self._alloc_sizes = {}  # heap block address -> size, used by relocate()
+        self.alive = True       # set False to simulate the game exiting
+        self.map_region(module_base, module_size)
+
+    ########################################
+    # Address Space
+    ########################################
+    def map_region(self, address, size):
+        """
+        Marks [address, address + size) as readable/writable memory.
+        """
+        i = bisect.bisect_left(self._mapped_starts, address)
+        self._mapped.insert(i, (address, address + size))
+        self._mapped_starts.insert(i, address)
+
+    def unmap_region(self, address):
+        """
+        Unmaps the region starting at address and drops its pages.
+        """
+        i = bisect.bisect_left(self._mapped_starts, address)
+        if i == len(self._mapped_starts) or self._mapped_starts[i] != address:
+            raise MemoryAccessError(f"No region starts at {hex(address)}")
+        start, end = self._mapped.pop(i)
+        self._mapped_starts.pop(i)
+        for page in range(start >> PAGE_SHIFT, ((end - 1) >> PAGE_SHIFT) + 1):
+            self._pages.pop(page, None)
+
+    def is_mapped(self, address, size=1):
+        i = bisect.bisect_right(self._mapped_starts, address) - 1
+        if i < 0:
+            return False
+        start, end = self._mapped[i]
+        return address + size <= end
+
+    def regions(self, writable_only=False):
+        return [(start, end - start) for start, end in self._mapped]
+
+    def is_alive(self):
+        return self.alive
+
+    def alloc(self, size, align=PAGE_SIZE):
+        """
+        Bump-allocates and maps a zeroed block on the fake heap. Returns its address.
+        """
+        addr = (self._heap_cursor + align - 1) & ~(align - 1)
+        self._heap_cursor = addr + size
+        self._alloc_sizes[addr] = size
+        self.map_region(addr, size)
+        return addr
+
+    ########################################
+    # Raw Access
+    ########################################
+    def read_bytes(self, address, length):
+        page = self._pages.get(address >> PAGE_SHIFT)
+        offset = address & PAGE_MASK
+        if page is not None and offset + length <= PAGE_SIZE:
+            return bytes(page[offset:offset + length])
+        if not self.is_mapped(address, length):
+            raise MemoryAccessError(f"Could not read memory at: {address}, length: {length}")
+        out = bytearray(length)
+        pos = 0
+        while pos < length:
+            addr = address + pos
+            offset = addr & PAGE_MASK
+            chunk = min(length - pos, PAGE_SIZE - offset)
+            page = self._pages.get(addr >> PAGE_SHIFT)
+            if page is not None:
+                out[pos:pos + chunk] = page[offset:offset + chunk]
+            pos += chunk
+        return bytes(out)
+
+    def write_bytes(self, address, value, length):
+        if not self.is_mapped(address, length):
+            raise MemoryAccessError(f"Could not write memory at: {address}, length: {length}")
+        pos = 0
+        while pos < length:
+            addr = address + pos
+            offset = addr & PAGE_MASK
+            chunk = min(length - pos, PAGE_SIZE - offset)
+            page = self._pages.get(addr >> PAGE_SHIFT)
+            if page is None:
+                page = self._pages[addr >> PAGE_SHIFT] = bytearray(PAGE_SIZE)
+            page[offset:offset + chunk] = value[pos:pos + chunk]
+            pos += chunk
+
+    # Fast paths for the hot typed reads (single page, already materialized).
+    def _read_struct(self, fmt, address):
+        page = self._pages.get(address >> PAGE_SHIFT)
+        offset = address & PAGE_MASK
+        if page is not None and offset + fmt.size <= PAGE_SIZE:
+            return fmt.unpack_from(page, offset)[0]
+        return fmt.unpack(self.read_bytes(address, fmt.size))[0]
+
+    def read_uchar(self, address):
+        return self._read_struct(_U8, address)
+
+    def read_uint(self, address):
+        return self._read_struct(_U32, address)
+
+    def read_int(self, address):
+        return self._read_struct(_I32, address)
+
+    def read_ulonglong(self, address):
+        return self._read_struct(_U64, address)
+
+    def read_float(self, address):
+        return self._read_struct(_F32, address)
+
+    def read_double(self, address):
+        return self._read_struct(_F64, address)
+
+    ########################################
+    # Pointer Graph Scripting
+    ########################################
+    def install_chain(self, chain, base=None):
+        """
+        Makes a module-relative pointer chain resolvable, allocating an object for every
+        hop that is still null. Chains sharing a prefix share the same objects.
+        Returns the chain's final address.
+        """
+        addr = self.module_base if base is None else base
+        last = len(chain) - 1
+        for i, offset in enumerate(chain):
+            addr += offset
+            if i == last:
+                break
+            ptr = self.read_ulonglong(addr)
+            if ptr == 0:
+                ptr = self.alloc(max(self.object_size, chain[i + 1] + 0x100))
+                self.write_ulonglong(addr, ptr)
+            addr = ptr
+        return addr
+
+    def relocate(self, chain, hop=-1, base=None):
+        """
+        Simulates the game re-allocating an object: copies the object reached at `hop`
+        (default: the last dereference) to a fresh block and repoints its parent at it.
+        Returns the new object address.
+        """
+        addr = self.module_base if base is None else base
+        parents = []
+        for i, offset in enumerate(chain[:-1]):
+            addr += offset
+            parents.append(addr)
+            addr = self.read_ulonglong(addr)
+        parent = parents[hop]
+        old = self.read_ulonglong(parent)
+        size = self._alloc_sizes.get(old, self.object_size)
+        new = self.alloc(size)
+        self.write_bytes(new, self.read_bytes(old, size), size)
+        self.write_ulonglong(parent, new)
+        return new
+
+    def break_chain(self, chain, hop=0, base=None):
+        """
+        Nulls the pointer at `hop` of a chain, like the game does during a load screen.
+        """
+        addr = self.module_base if base is None else base
+        for i, offset in enumerate(chain[:-1]):
+            addr += offset
+            if i == hop:
+                self.write_ulonglong(addr, 0)
+                return
+            addr = self.read_ulonglong(addr)
+
+
+# Values seeded by make_simulated_game(): chain name -> [(delta, data_type, value)].
+DEFAULT_SIM_VALUES = {
+    "player_hp": [(0x0, "int", 454), (0x18, "int", 95)],
+    "player_pos": [(-0xC, "float", -2.78), (0x0, "float", 124.45),
+                   (0x4, "float", -63.95), (0x8, "float", 555.81)],
+    "boss_hp": [(0x0, "int", 1037)],
+    "estus": [(0x0, "int", 3)],
+    "in_boss_fight": [(0x0, "byte", 1)],
+    "boss_flag": [(0x0, "byte", 0)],
+    "boss_pos": [(0x0, "float", 129.51), (0x4, "float", -66.93),
+                 (0x8, "float", 572.72), (0x10, "float", 1.93)],
+    "boss_anim": [(0x0, "int", 3000)],
+    "lock_on": [(0x0, "byte", 1)],
+}
+
+_WRITERS = {
+    "byte": "write_uchar",
+    "4byte": "write_uint",
+    "int": "write_int",
+    "float": "write_float",
+    "double": "write_double",
+}
+
+
+def make_simulated_game(chains, values=DEFAULT_SIM_VALUES, **kwargs):
+    """
+    Builds a SimulatedBackend whose pointer graph mirrors `chains` (e.g. pointer_scanner.CHAINS)
+    and seeds each chain's fields from `values`. Returns the backend.
+    """
+    sim = SimulatedBackend(**kwargs)
+    for chain_name, chain in chains.items():
+        final = sim.install_chain(chain)
+        for delta, data_type, value in values.get(chain_name, ()):
+            getattr(sim, _WRITERS[data_type])(final + delta, value)
+    return sim
@@ -0,0 +1,242 @@
+# memory_layout.py
+import struct
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from pointer_trie import PointerTrie
+
+########################################
+# Layout Spec
+########################################
+# A field lives at (resolved address of `chain`) + `offset` and is decoded as `data_type`.
+# `chain` is a key into a chain table such as pointer_scanner.CHAINS. An `optional` field
+# whose chain is missing from the table (e.g. a symbolic root that could not be resolved)
+# is never read and stays at fail_value.
+Field = namedtuple("Field", ["name", "chain", "offset", "data_type", "optional"], defaults=(False,))
+
+STRUCT_CODES = {
+    "byte": "B",
+    "4byte": "I",
+    "int": "i",
+    "float": "f",
+    "double": "d",
+}
+
+# Ordered like the state vector built in dark_souls_api.get_state()
+# (the boss animation ID is mapped to a one-hot tag there).
+STATE_LAYOUT = (
+    Field("playerHP", "player_hp", 0x0, "int"),
+    Field("playerStamina", "player_hp", 0x18, "int"),
+    Field("playerX", "player_pos", 0x0, "float"),
+    Field("playerY", "player_pos", 0x4, "float"),
+    Field("playerZ", "player_pos", 0x8, "float"),
+    Field("playerAngle", "player_pos", -0xC, "float"),
+    Field("bossHP", "boss_hp", 0x0, "int"),
+    # Boss Y/Z follow gundyr_logger.lua's naming (Y = second horizontal axis, Z = height),
+    # which is the reverse of the player's +0x4/+0x8 order above.
+    Field("bossX", "boss_pos", 0x0, "float"),
+    Field("bossY", "boss_pos", 0x8, "float"),
+    Field("bossZ", "boss_pos", 0x4, "float"),
+    Field("bossAngle", "boss_pos", 0x10, "float"),
+    Field("bossAnimId", "boss_anim", 0x0, "int"),
+    # Not part of the base observation; read here so derived features cost no extra reads.
+    Field("playerEstus", "estus", 0x0, "int"),
+    Field("bossFlag", "boss_flag", 0x0, "byte"),  # bit 7 = boss defeated
+    Field("lockOn", "lock_on", 0x0, "byte", optional=True),  # 1 = locked on to a target
+    Field("inBossFight", "in_boss_fight", 0x0, "byte"),  # 1 = inside the fog wall (reset phases)
+)
+
+########################################
+# Snapshot Engine
+########################################
+# One compiled read: a contiguous span of a single chain's memory.
+ReadGroup = namedtuple(
+    "ReadGroup",
+    ["chain_name", "chain", "chain_index", "start", "size", "decoder", "indices", "mask"])
+
+
+class SnapshotEngine:
+    """
+    Reads every field of a layout at once.
+    The layout's chains are resolved together through a PointerTrie (shared prefixes are
+    dereferenced once, and a warm tick only re-reads the distinct root pointers).
+    Fields are grouped by chain and split into contiguous spans, so each span costs
+    one read_bytes call. Values are decoded with a precompiled struct into a
+    preallocated float64 buffer.
+    With hold_stale=True a field that fails to read keeps its last good value instead of
+    blocking or dropping to fail_value; ages() tells how old each value is.
+    """
+
+    def __init__(self, reader, layout, chains, max_gap=0x100, fail_value=-1.0, hold_stale=True):
+        self.reader = reader
+        self.layout = tuple(layout)
+        self.names = tuple(f.name for f in self.layout)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.fail_value = fail_value
+        self.hold_stale = hold_stale
+        self.values = np.full(len(self.layout), fail_value, dtype=np.float64)
+        # monotonic time of each field's last good read (-inf = never read)
+        self.stamps = np.full(len(self.layout), -np.inf, dtype=np.float64)
+        # bit i set = field i was read successfully by the last snapshot()
+        self.fresh_mask = 0
+        self.trie = PointerTrie(reader)
+        self.missing = ()  # names of optional fields skipped because their chain is absent
+        self.groups = self._compile(chains, max_gap)
+        self.trie.compile()
+
+    def _compile(self, chains, max_gap):
+        """
+        Groups fields by chain, sorts them by offset and splits a chain's fields into
+        separate spans wherever the gap between two fields exceeds max_gap bytes.
+        """
+        by_chain = {}
+        missing = []
+        for i, field in enumerate(self.layout):
+            if field.data_type not in STRUCT_CODES:
+                raise ValueError(
+                    f"Unsupported data type '{field.data_type}' for field '{field.name}'.")
+            if field.chain not in chains and field.optional:
+                missing.append(field.name)
+                continue
+            if field.chain not in chains:
+                raise KeyError(
+                    f"Unknown chain '{field.chain}' for field '{field.name}'.")
+            by_chain.setdefault(field.chain, []).append((field.offset, i, field))
+        self.missing = tuple(missing)
+
+        groups = []
+        for chain_name, entries in by_chain.items():
+            chain_index = self.trie.register(chain_name, chains[chain_name])
+            entries.sort(key=lambda e: e[0])
+            span = [entries[0]]
+            for entry in entries[1:]:
+                prev_offset, _, prev = span[-1]
+                prev_end = prev_offset + struct.calcsize(STRUCT_CODES[prev.data_type])
+                if entry[0] < prev_end:
+                    raise ValueError(
+                        f"Field '{entry[2].name}' overlaps '{prev.name}' on chain '{chain_name}'.")
+                if entry[0] - prev_end > max_gap:
+                    groups.append(self._make_group(
+                        chain_name, chains[chain_name], chain_index, span))
+                    span = []
+                span.append(entry)
+            groups.append(self._make_group(chain_name, chains[chain_name], chain_index, span))
+        return tuple(groups)
+
+    @staticmethod
+    def _make_group(chain_name, chain, chain_index, span):
+        start = span[0][0]
+        fmt = "<"
+        cursor = start
+        for offset, _, field in span:
+            if offset > cursor:
+                fmt += f"{offset - cursor}x"
+            code = STRUCT_CODES[field.data_type]
+            fmt += code
+            cursor = offset + struct.calcsize(code)
+        decoder = struct.Struct(fmt)
+        indices = np.array([i for _, i, _ in span], dtype=np.intp)
+        mask = 0
+        for _, i, _ in span:
+            mask |= 1 << i
+        return ReadGroup(chain_name, tuple(chain), chain_index,
+                         start, decoder.size, decoder, indices, mask)
+
+    def snapshot(self):
+        """
+        Reads all fields and returns the internal float64 buffer (ordered like the layout).
+        Fields whose chain cannot be resolved or read keep their last good value
+        (hold_stale) or are set to fail_value if they were never read.
+        The buffer is reused by the next call; copy it if you need to keep it.
+        """
+        reader = self.reader
+        values = self.values
+        self.fresh_mask = 0
+        if not reader._is_process_valid():
+            for group in self.groups:
+                self._fail(group)
+            return values
+        addresses = self.trie.resolve()
+        region_map = getattr(reader, "region_map", None)
+        stats = getattr(reader, "instrumentation", None)
+        now = time.monotonic()
+        fresh = 0
+        for group in self.groups:
+            if stats is not None:
+                start = time.perf_counter_ns()
+            ok = self._read_group(group, addresses[group.chain_index], region_map, now)
+            if ok:
+                fresh |= group.mask
+            if stats is not None:
+                stats.record("snapshot:" + group.chain_name, time.perf_counter_ns() - start, ok)
+        self.fresh_mask = fresh
+        return values
+
+    def _read_group(self, group, addr, region_map, now):
+        """
+        Reads and decodes one span. Returns False (after _fail) if it is unreadable.
+        """
+        if addr == -1:
+            self._fail(group)
+            return False
+        if region_map is not None and not region_map.contains(addr + group.start, group.size):
+            self.trie.invalidate()
+            self._fail(group)
+            return False
+        try:
+            data = self.reader.pm.read_bytes(addr + group.start, group.size)
+        except Exception:
+            self.trie.invalidate()
+            self._fail(group)
+            return False
+        self.values[group.indices] = group.decoder.unpack_from(data)
+        self.stamps[group.indices] = now
+        return True
+
+    def _fail(self, group):
+        if self.hold_stale:
+            indices = group.indices[np.isinf(self.stamps[group.indices])]
+        else:
+            indices = group.indices
+        self.values[indices] = self.fail_value
+
+    def mask_of(self, *names):
+        """
+        Returns the fresh_mask bits of the named fields.
+        """
+        mask = 0
+        for name in names:
+            mask |= 1 << self.index[name]
+        return mask
+
+    def ages(self):
+        """
+        Returns the age in seconds of every field's value (inf if it was never read).
+        """
+        return time.monotonic() - self.stamps
+
+    def max_age(self):
+        """
+        Age of the stalest field in the last snapshot (0.0 when everything was fresh).
+        Fields never read (including skipped optional ones) are left out; inf if no
+        field has been read yet.
+        """
+        stamps = self.stamps
+        read = stamps[stamps > -np.inf]
+        if not len(read):
+            return float("inf")
+        return float(time.monotonic() - read.min())
+
+    def get(self, name):
+        """
+        Returns the last snapshotted value of a field.
+        """
+        return self.values[self.index[name]]
+
+    def as_dict(self):
+        """
+        Returns the last snapshot as {field name: value}.
+        """
+        return dict(zip(self.names, self.values.tolist()))
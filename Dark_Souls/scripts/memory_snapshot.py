@@ -0,0 +1,256 @@
+# memory_snapshot.py
+"""
+Process memory snapshots for offline replay.
+
+A snapshot is the set of relevant committed regions of the game process plus its module
+base/size. It implements the MemoryBackend read interface, so PointerReader,
+SnapshotEngine and the pointer/value scanners run against it exactly like against the
+live game (PointerReader.from_snapshot(path)).
+
+File format (.ds3snap):
+    8 bytes   magic b"DS3SNAP\\0"
+    uint32    format version
+    uint32    JSON header length
+    JSON      {"module_name", "module_base", "module_size", "created",
+               "regions": [{"start", "size", "offset", "stored_size", "codec"}]}
+    ...       region blocks, each starting on a 4 KiB file boundary
+
+codec "zlib" blocks are compressed and inflated lazily on first access; codec "raw"
+blocks are served zero-copy straight from a read-only mmap of the file.
+
+Usage:
+    python memory_snapshot.py dump fight.ds3snap            # live game (Windows)
+    python memory_snapshot.py dump fight.ds3snap --raw      # uncompressed, mmap-able
+    python memory_snapshot.py info fight.ds3snap
+"""
+import bisect
+import json
+import mmap
+import struct
+import time
+import zlib
+
+from memory_backend import MemoryAccessError, MemoryBackend
+
+SNAPSHOT_MAGIC = b"DS3SNAP\x00"
+SNAPSHOT_VERSION = 1
+FILE_ALIGN = 0x1000
+_PREAMBLE = struct.Struct("<8sII")
+
+########################################
+# Lazily Inflated Region
+########################################
+
+
+class _ZlibRegion:
+    """
+    Compressed region block; decompressed on first access and then kept.
+    Supports len() and slicing like the bytes it stands for.
+    """
+
+    def __init__(self, compressed, size):
+        self._compressed = compressed
+        self._size = size
+        self._data = None
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, key):
+        if self._data is None:
+            self._data = zlib.decompress(self._compressed)
+            self._compressed = None
+        return self._data[key]
+
+########################################
+# Memory Snapshot
+########################################
+
+
+class MemorySnapshot(MemoryBackend):
+    """
+    Frozen, read-only copy of a process's readable regions plus its module base/size.
+    """
+
+    def __init__(self, regions, module_base, module_size, name="snapshot", module_name="", created=None):
+        """
+        regions: iterable of (start address, bytes-like) pairs, non-overlapping.
+        """
+        self.name = name
+        self.module_name = module_name
+        self.module_base = module_base
+        self.module_size = module_size
+        self.created = time.time() if created is None else created
+        self._regions = sorted(regions, key=lambda r: r[0])
+        self._starts = [start for start, _ in self._regions]
+        self._mmap = None
+
+    @classmethod
+    def capture(cls, backend, max_region_size=256 << 20, writable_only=True, name=None, log=True):
+        """
+        Copies the relevant regions reported by backend.regions(): writable memory
+        (heaps, module .data, where pointers and game state live) plus the module image.
+        Regions larger than max_region_size are skipped (mapped files, GPU heaps...).
+        """
+        wanted = backend.regions(writable_only=writable_only)
+        module_lo = backend.module_base
+        module_hi = module_lo + backend.module_size
+        if writable_only:
+            seen = {start for start, _ in wanted}
+            wanted += [(start, size) for start, size in backend.regions()
+                       if module_lo <= start < module_hi and start not in seen]
+
+        regions = []
+        skipped = 0
+        for start, size in sorted(wanted):
+            if size > max_region_size:
+                skipped += 1
+                continue
+            try:
+                regions.append((start, backend.read_bytes(start, size)))
+            except Exception:
+                skipped += 1
+        snapshot = cls(regions, backend.module_base, backend.module_size,
+                       name=name or f"{backend.name} snapshot", module_name=backend.name)
+        if log:
+            print(f"📸 Captured {len(regions)} regions "
+                  f"({snapshot.total_size / (1 << 20):.1f} MiB), skipped {skipped}.")
+        return snapshot
+
+    ########################################
+    # File I/O
+    ########################################
+    def save(self, path, codec="zlib", level=1):
+        """
+        Writes the snapshot to `path`. codec: "zlib" (compressed) or "raw" (mmap-able).
+        """
+        if codec not in ("zlib", "raw"):
+            raise ValueError(f"Unsupported codec '{codec}'.")
+        blocks = []
+        for start, data in self._regions:
+            stored = zlib.compress(bytes(data[:]), level) if codec == "zlib" else data
+            blocks.append((start, len(data), stored))
+
+        entries = []
+        header = {}
+        # Two passes: block offsets depend on the header length.
+        for _ in range(2):
+            data_offset = _align(_PREAMBLE.size + len(json.dumps(header).encode("utf-8")))
+            entries = []
+            offset = data_offset
+            for start, size, stored in blocks:
+                entries.append({"start": start, "size": size, "offset": offset,
+                                "stored_size": len(stored), "codec": codec})
+                offset = _align(offset + len(stored))
+            header = {
+                "module_name": self.module_name,
+                "module_base": self.module_base,
+                "module_size": self.module_size,
+                "created": self.created,
+                "regions": entries,
+            }
+        header_bytes = json.dumps(header).encode("utf-8")
+
+        with open(path, "wb") as f:
+            f.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            for entry, (_, _, stored) in zip(entries, blocks):
+                f.write(b"\x00" * (entry["offset"] - f.tell()))
+                f.write(stored)
+        print(f"💾 Saved snapshot to {path} ({len(entries)} regions, codec={codec}).")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Opens a .ds3snap file read-only via mmap. Raw regions are zero-copy views;
+        zlib regions are inflated on first access.
+        """
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_len = _PREAMBLE.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a DS3 memory snapshot.")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        header = json.loads(bytes(mm[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+
+        view = memoryview(mm)
+        regions = []
+        for entry in header["regions"]:
+            block = view[entry["offset"]:entry["offset"] + entry["stored_size"]]
+            if entry["codec"] == "raw":
+                regions.append((entry["start"], block))
+            else:
+                regions.append((entry["start"], _ZlibRegion(block, entry["size"])))
+        snapshot = cls(regions, header["module_base"], header["module_size"], name=path,
+                       module_name=header.get("module_name", ""), created=header.get("created"))
+        snapshot._mmap = mm
+        return snapshot
+
+    def close(self):
+        self._regions = []
+        self._starts = []
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # views still alive elsewhere; the map is released with them
+            self._mmap = None
+
+    ########################################
+    # Backend Interface
+    ########################################
+    @property
+    def total_size(self):
+        return sum(len(data) for _, data in self._regions)
+
+    def region_data(self):
+        """
+        Returns the list of (start address, bytes-like) pairs, sorted by address.
+        """
+        return self._regions
+
+    def regions(self, writable_only=False):
+        return [(start, len(data)) for start, data in self._regions]
+
+    def read_bytes(self, address, length):
+        i = bisect.bisect_right(self._starts, address) - 1
+        if i >= 0:
+            start, data = self._regions[i]
+            offset = address - start
+            if offset + length <= len(data):
+                return bytes(data[offset:offset + length])
+        raise MemoryAccessError(f"Could not read memory at: {address}, length: {length}")
+
+    def write_bytes(self, address, value, length):
+        raise MemoryAccessError("Memory snapshots are read-only.")
+
+
+def _align(offset):
+    return (offset + FILE_ALIGN - 1) & ~(FILE_ALIGN - 1)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="DS3 process memory snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+    dump = sub.add_parser("dump", help="Capture the running game to a snapshot file")
+    dump.add_argument("path")
+    dump.add_argument("--process", default="DarkSoulsIII.exe")
+    dump.add_argument("--raw", action="store_true", help="Store uncompressed (mmap-able)")
+    dump.add_argument("--all-readable", action="store_true",
+                      help="Include read-only regions, not just writable memory")
+    info = sub.add_parser("info", help="Print a snapshot's header")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        from memory_backend import PymemBackend
+        backend = PymemBackend(args.process)
+        snap = MemorySnapshot.capture(backend, writable_only=not args.all_readable)
+        snap.save(args.path, codec="raw" if args.raw else "zlib")
+    else:
+        snap = MemorySnapshot.load(args.path)
+        print(f"Module: {snap.module_name} @ {hex(snap.module_base)} (size {hex(snap.module_size)})")
+        print(f"Created: {time.ctime(snap.created)}")
+        print(f"Regions: {len(snap.regions())}, {snap.total_size / (1 << 20):.1f} MiB")
@@ -0,0 +1,255 @@
+# observation.py
+import math
+
+import numpy as np
+
+########################################
+# Observation Layout
+########################################
+# [playerHP, playerStamina, playerX, playerY, playerZ, playerAngle,
+#  bossHP, bossX, bossY, bossZ, bossAngle, anim W, anim E, anim A, anim T]
+ANIM_TAGS = ("W", "E", "A", "T")
+ANIM_INDEX = {tag: i for i, tag in enumerate(ANIM_TAGS)}
+N_STATE_FIELDS = 11           # player (6) + boss (5), copied straight from the snapshot
+ANIM_COL = N_STATE_FIELDS     # first one-hot column
+OBS_SIZE = N_STATE_FIELDS + len(ANIM_TAGS)
+BOSS_HP_COL = 6
+BOSS_POSE = slice(7, 11)      # bossX, bossY, bossZ, bossAngle
+BOSS_MAX_HP = 1037
+ANIM_FIELD = 11               # bossAnimId in the snapshot row
+ESTUS_FIELD = 12              # playerEstus in the snapshot row
+BOSS_FLAG_FIELD = 13          # bossFlag in the snapshot row
+LOCK_ON_FIELD = 14            # lockOn in the snapshot row
+# Matching position axes. The player's Y (+0x4) is height while the boss's Y follows the
+# logger (second horizontal axis), so the player is taken as (X, Z, Y) against the boss's (X, Y, Z).
+PLAYER_XYZ = (2, 4, 3)
+BOSS_XYZ = (7, 8, 9)
+PLAYER_ANGLE_COL = 5
+
+########################################
+# Observation Builder
+########################################
+
+
+class ObservationBuilder:
+    """
+    Fills a preallocated float32 observation in place from a SnapshotEngine value row.
+
+    Copy contract: build() returns one of `n_buffers` internal arrays, used round-robin.
+    The array stays valid until build() has been called n_buffers more times, so with the
+    default of 2 the previous observation (e.g. the wrapper's current_state) survives the
+    next step. Callers that keep observations longer (replay buffers, logs) must copy;
+    pass copy=True to get a fresh array instead.
+
+    Boss animation IDs read from memory are mapped to one-hot columns through `anim_lut`
+    (ID -> column), built once from the learned ID -> tag table and extended by learn().
+    """
+
+    def __init__(self, anim_tags=None, n_buffers=2):
+        self.buffers = np.zeros((n_buffers, OBS_SIZE), dtype=np.float32)
+        # Row and column views made once, so build() creates no array objects.
+        self._rows = [(row, row[:N_STATE_FIELDS], row[ANIM_COL:]) for row in self.buffers]
+        self._next = 0
+        self._source = None       # last `values` array and its state-field view
+        self._source_head = None
+        self.anim_lut = {}
+        for anim_id, tag in (anim_tags or {}).items():
+            self.learn(anim_id, tag)
+        # Set by build(): which boss fields memory could not provide this step.
+        self.missing_pose = False
+        self.missing_anim = False
+        self.anim_id = -1
+        self.estus = 0.0
+        self.boss_flag = -1       # raw boss flag byte, -1 = unread
+        self.lock_on = -1         # 1 locked, 0 not, -1 = unread (no lock_on chain)
+
+    def learn(self, anim_id, tag):
+        """
+        Records that animation ID `anim_id` shows as `tag`. Tags outside ANIM_TAGS
+        (e.g. "idle") are known but leave the one-hot all zero.
+        """
+        self.anim_lut[anim_id] = ANIM_INDEX.get(tag, -1)
+
+    def build(self, values, pose_fresh=True, anim_fresh=True, copy=False):
+        """
+        values: the SnapshotEngine row (STATE_LAYOUT order, bossAnimId last). Passing the
+        same reused array each step (engine.values, a sampler row) avoids even a view.
+        Fills the next buffer and returns it (or a copy). Sets missing_pose/missing_anim
+        when the caller should fill those fields from another source (set_boss_pose,
+        set_anim_tag).
+        """
+        obs, state, anim = self._rows[self._next]
+        self._next = (self._next + 1) % len(self._rows)
+        if values is not self._source:
+            self._source, self._source_head = values, values[:N_STATE_FIELDS]
+        state[:] = self._source_head
+        hp = obs.item(BOSS_HP_COL)
+        if hp < 0 or hp > BOSS_MAX_HP:
+            obs[BOSS_HP_COL] = -1.0
+        anim.fill(0.0)
+
+        self.missing_pose = not pose_fresh
+        self.anim_id = int(values.item(ANIM_FIELD)) if anim_fresh else -1
+        if len(values) > BOSS_FLAG_FIELD:
+            self.estus = values.item(ESTUS_FIELD)
+            self.boss_flag = int(values.item(BOSS_FLAG_FIELD))
+        if len(values) > LOCK_ON_FIELD:
+            self.lock_on = int(values.item(LOCK_ON_FIELD))
+        col = self.anim_lut.get(self.anim_id) if anim_fresh else None
+        if col is None:
+            self.missing_anim = True
+        else:
+            self.missing_anim = False
+            if col >= 0:
+                obs[ANIM_COL + col] = 1.0
+        return obs.copy() if copy else obs
+
+    @staticmethod
+    def set_boss_pose(obs, x, y, z, angle):
+        obs[BOSS_POSE] = (x, y, z, angle)
+
+    @staticmethod
+    def set_anim_tag(obs, tag):
+        """
+        Sets the animation one-hot from a W/E/A/T tag (unknown tags leave it all zero).
+        """
+        obs[ANIM_COL:] = 0.0
+        col = ANIM_INDEX.get(tag, -1)
+        if col >= 0:
+            obs[ANIM_COL + col] = 1.0
+
+
+def boss_distance(state):
+    """
+    3D distance between player and boss in a base observation.
+    """
+    return math.sqrt(sum((state[b] - state[p]) ** 2 for p, b in zip(PLAYER_XYZ, BOSS_XYZ)))
+
+
+########################################
+# Feature Pipeline
+########################################
+# name -> (columns in the frame, low, high). "state" and "anim" are the base observation;
+# the rest are derived from it (plus the estus / lock-on inputs) without extra reads.
+FEATURES = {
+    "state": (N_STATE_FIELDS, -np.inf, np.inf),
+    "anim": (len(ANIM_TAGS), 0.0, 1.0),
+    "distance": (1, 0.0, np.inf),
+    "bearing": (1, -math.pi, math.pi),
+    "estus": (1, -1.0, np.inf),
+    "lock_on": (1, 0.0, 1.0),
+    "hp_delta": (2, -np.inf, np.inf),
+}
+DEFAULT_FEATURES = ("state", "anim")  # the original 15-vector
+# Column order of the derived block computed every frame.
+DERIVED = ("distance", "bearing", "estus", "lock_on", "player_hp_delta", "boss_hp_delta")
+
+
+class FeaturePipeline:
+    """
+    Turns base observations (ObservationBuilder output) into the configured feature
+    frame and stacks the last `stack` frames.
+
+    All derived features are computed together in a few vectorized numpy ops into a
+    preallocated block, then the configured columns are gathered into the frame with
+    one np.take. Frames live in a ring of 2 * stack rows where every frame is written
+    twice (at i and i + stack), so the newest `stack` frames are always one contiguous
+    slice: push() returns a precomputed flat view of it, without copying the stack.
+    That view is valid until the next push(); copy it to keep it.
+
+        pipeline = FeaturePipeline(("state", "anim", "distance", "bearing"), stack=4)
+        space_low, space_high = pipeline.bounds()
+        obs = pipeline.reset(state)
+        obs = pipeline.push(state, estus=3, lock_on=True)
+    """
+
+    def __init__(self, features=DEFAULT_FEATURES, stack=1):
+        unknown = [name for name in features if name not in FEATURES]
+        if unknown:
+            raise ValueError(f"Unknown observation features {unknown}; choose from {list(FEATURES)}.")
+        if stack < 1:
+            raise ValueError("stack must be >= 1.")
+        self.features = tuple(features)
+        self.stack = stack
+
+        # Source columns: base observation, then the derived block.
+        starts = {"state": 0, "anim": ANIM_COL, "distance": OBS_SIZE,
+                  "hp_delta": OBS_SIZE + DERIVED.index("player_hp_delta")}
+        for name in ("bearing", "estus", "lock_on"):
+            starts[name] = OBS_SIZE + DERIVED.index(name)
+        cols = []
+        for name in self.features:
+            cols.extend(range(starts[name], starts[name] + FEATURES[name][0]))
+        self._cols = np.array(cols, dtype=np.intp)
+        self.frame_size = len(cols)
+
+        self._source = np.zeros(OBS_SIZE + len(DERIVED), dtype=np.float32)
+        self._base = self._source[:OBS_SIZE]
+        self._boss = self._base[BOSS_XYZ[0]:BOSS_XYZ[-1] + 1]
+        self._derived = self._source[OBS_SIZE:]
+        self._hp_delta = self._derived[DERIVED.index("player_hp_delta"):][:2]
+        self._player_xyz = np.array(PLAYER_XYZ, dtype=np.intp)
+        self._player = np.zeros(3, dtype=np.float32)
+        self._offset = np.zeros(3, dtype=np.float32)   # boss - player
+        self._hp_cols = np.array((0, BOSS_HP_COL), dtype=np.intp)
+        self._hp = np.zeros(2, dtype=np.float32)
+        self._prev_hp = np.zeros(2, dtype=np.float32)
+
+        self._ring = np.zeros((2 * stack, self.frame_size), dtype=np.float32)
+        self._views = [self._ring[i:i + stack].reshape(-1) for i in range(1, stack + 1)]
+        self._count = 0
+
+    @property
+    def size(self):
+        return self.stack * self.frame_size
+
+    def bounds(self):
+        """
+        Returns (low, high) float32 arrays for a gym Box over the stacked observation.
+        """
+        low, high = [], []
+        for name in self.features:
+            width, lo, hi = FEATURES[name]
+            low += [lo] * width
+            high += [hi] * width
+        return (np.tile(np.array(low, dtype=np.float32), self.stack),
+                np.tile(np.array(high, dtype=np.float32), self.stack))
+
+    def _derive(self, state, estus, lock_on):
+        base, derived = self._base, self._derived
+        base[:] = state
+        np.take(base, self._player_xyz, out=self._player)
+        np.subtract(self._boss, self._player, out=self._offset)
+        offset = self._offset
+        derived[0] = math.sqrt(float(np.dot(offset, offset)))
+        # Heading of the boss (atan2 over the horizontal X/Z plane) relative to the player's
+        # facing, wrapped to [-pi, pi).
+        bearing = math.atan2(offset.item(0), offset.item(1)) - base.item(PLAYER_ANGLE_COL)
+        derived[1] = (bearing + math.pi) % (2 * math.pi) - math.pi
+        derived[2] = estus
+        derived[3] = 1.0 if lock_on else 0.0
+        np.take(base, self._hp_cols, out=self._hp)
+        np.subtract(self._hp, self._prev_hp, out=self._hp_delta)
+        self._prev_hp[:] = self._hp
+
+    def reset(self, state, estus=0.0, lock_on=False):
+        """
+        Starts a new episode: HP deltas restart at 0 and every stacked slot holds `state`.
+        """
+        np.take(state, self._hp_cols, out=self._prev_hp)
+        self._derive(state, estus, lock_on)
+        self._ring[:] = self._source[self._cols]
+        self._count = 0
+        return self._views[-1]
+
+    def push(self, state, estus=0.0, lock_on=False):
+        """
+        Adds one frame built from base observation `state` and returns the stacked view.
+        """
+        self._derive(state, estus, lock_on)
+        slot = self._count % self.stack
+        self._count += 1
+        row = self._ring[slot]
+        np.take(self._source, self._cols, out=row)
+        self._ring[slot + self.stack] = row
+        return self._views[slot]
@@ -0,0 +1,120 @@
+# offset_table.py
+"""
+Versioned pointer-chain table (data/offsets.json).
+
+Each build entry lists the module hashes (aob_scanner.module_hash) and/or module size it
+applies to, and its chains as lists of hex strings. A chain's root may instead be a
+global's name (e.g. "LockTgtMan"); it is turned into a module offset from the addresses
+the AOB signatures resolved at attach (PointerReader.symbols). A build's "symbol_offsets"
+(module offsets of those globals) are only used for the default table, e.g. to lay out
+the simulated target; a live attach never falls back to them.
+
+The file is parsed once per process and every chain is compiled to a tuple of ints,
+the form PointerReader, PointerTrie and SnapshotEngine consume directly, so switching
+game versions is a data edit and costs nothing per step.
+"""
+import json
+import os
+
+from aob_scanner import module_hash
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(os.path.dirname(script_dir), "data")
+OFFSETS_PATH = os.path.join(data_dir, "offsets.json")
+OFFSETS_FORMAT = 1
+
+_tables = {}
+
+########################################
+# Loading / Compiling
+########################################
+
+
+def load_table(path=OFFSETS_PATH):
+    """
+    Returns the parsed offset table (cached per path).
+    """
+    table = _tables.get(path)
+    if table is None:
+        with open(path, "r", encoding="utf-8") as f:
+            table = json.load(f)
+        if table.get("format") != OFFSETS_FORMAT:
+            raise ValueError(f"{path}: unsupported offset table format {table.get('format')}.")
+        _tables[path] = table
+    return table
+
+
+def compile_chain(raw, symbols=None, module_base=0):
+    """
+    Turns ["0x04543F60", "0x28", ...] into (0x04543F60, 0x28, ...). A non-numeric root is
+    looked up in `symbols` (absolute addresses) and made module-relative.
+    """
+    root = raw[0]
+    if isinstance(root, str) and not root.lower().startswith("0x"):
+        if not symbols or root not in symbols:
+            raise KeyError(f"Unknown chain root symbol '{root}'.")
+        root = symbols[root] - module_base
+    else:
+        root = _to_int(root)
+    return (root,) + tuple(_to_int(offset) for offset in raw[1:])
+
+
+def compile_chains(build, symbols=None, module_base=0, log=True):
+    """
+    Compiles every chain of a build entry. Chains whose root symbol is unknown are
+    skipped (with a warning if log) instead of failing the whole table.
+    """
+    chains = {}
+    for name, raw in build["chains"].items():
+        try:
+            chains[name] = compile_chain(raw, symbols, module_base)
+        except KeyError as e:
+            if log:
+                print(f"👉❌ Skipping chain '{name}': {e}")
+    return chains
+
+
+def _to_int(value):
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+########################################
+# Build Detection
+########################################
+
+
+def detect_build(backend, table):
+    """
+    Returns (build name, module hash) for the running module: a module hash match first,
+    then a module size match, then the table's default build.
+    """
+    key = module_hash(backend)
+    builds = table["builds"]
+    for name, build in builds.items():
+        if key in build.get("module_hashes", ()):
+            return name, key
+    for name, build in builds.items():
+        if build.get("module_size") == backend.module_size:
+            return name, key
+    return table["default_build"], key
+
+
+def chains_for(backend, symbols=None, path=OFFSETS_PATH):
+    """
+    Returns (build name, compiled chains) for the module behind `backend`.
+    """
+    table = load_table(path)
+    name, key = detect_build(backend, table)
+    if key not in table["builds"][name].get("module_hashes", ()):
+        print(f"👉 Build {key} not listed in {os.path.basename(path)}; using '{name}' offsets.")
+    return name, compile_chains(table["builds"][name], symbols, backend.module_base)
+
+
+def default_chains(path=OFFSETS_PATH):
+    """
+    Returns the default build's chains, symbolic roots placed at its symbol_offsets,
+    e.g. for the simulated target.
+    """
+    table = load_table(path)
+    build = table["builds"][table["default_build"]]
+    symbols = {name: _to_int(offset) for name, offset in build.get("symbol_offsets", {}).items()}
+    return compile_chains(build, symbols, log=False)
@@ -0,0 +1,215 @@
+# pointer_paths.py
+"""
+Multi-level pointer-path discovery (what Cheat Engine's "pointer scan" does).
+
+1. build_pointer_index(): every 8-byte-aligned qword of a MemorySnapshot whose value
+   points into a readable region becomes a (value, address) pair. Regions are scanned
+   with numpy in parallel batches on a process pool, and the pairs are sorted by value.
+2. find_paths(): walks backwards from the target address. Each level looks up, with
+   one vectorized searchsorted, every pointer whose value lies in [addr - max_offset, addr],
+   until it reaches pointers stored inside the game module (static roots).
+3. rank_paths(): re-resolves every candidate in other snapshots (taken after restarts,
+   deaths, area loads) and keeps the paths that still land on the right address.
+
+Paths use the same format as pointer_scanner.CHAINS: (module offset, offset, ..., offset).
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+PointerIndex = namedtuple("PointerIndex", ["values", "addresses"])
+
+########################################
+# Reverse Pointer Index
+########################################
+
+
+def _index_batch(batch, starts, ends):
+    """
+    Worker: returns (values, addresses) of the qwords in `batch` that point into any
+    [starts[i], ends[i]) region. `batch` is a list of (start address, bytes).
+    """
+    lo, hi = starts[0], ends[-1]
+    values_out, addrs_out = [], []
+    for start, data in batch:
+        head = (-start) % 8
+        count = (len(data) - head) // 8
+        if count <= 0:
+            continue
+        words = np.frombuffer(data, dtype="<u8", count=count, offset=head)
+        pos = np.flatnonzero((words >= lo) & (words < hi))
+        if len(pos) == 0:
+            continue
+        cand = words[pos]
+        region = np.searchsorted(starts, cand, side="right") - 1
+        keep = cand < ends[region]
+        pos = pos[keep]
+        values_out.append(cand[keep])
+        addrs_out.append(np.uint64(start + head) + pos.astype(np.uint64) * np.uint64(8))
+    if not values_out:
+        empty = np.empty(0, dtype=np.uint64)
+        return empty, empty
+    return np.concatenate(values_out), np.concatenate(addrs_out)
+
+
+def _make_batches(region_data, batch_bytes):
+    """
+    Splits regions into ~batch_bytes work items (large regions are cut on 8-byte boundaries).
+    """
+    batches, current, current_size = [], [], 0
+    for start, data in region_data:
+        for offset in range(0, len(data), batch_bytes):
+            chunk = bytes(data[offset:offset + batch_bytes])
+            current.append((start + offset, chunk))
+            current_size += len(chunk)
+            if current_size >= batch_bytes:
+                batches.append(current)
+                current, current_size = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_pointer_index(snapshot, workers=None, batch_bytes=32 << 20):
+    """
+    Builds the reverse pointer index of a MemorySnapshot.
+    workers=1 scans in-process; otherwise a process pool of `workers` (default: CPU count).
+    Returns a PointerIndex with both arrays sorted by pointer value.
+    """
+    region_data = snapshot.region_data()
+    if not region_data:
+        empty = np.empty(0, dtype=np.uint64)
+        return PointerIndex(empty, empty)
+    starts = np.array([start for start, _ in region_data], dtype=np.uint64)
+    ends = np.array([start + len(data) for start, data in region_data], dtype=np.uint64)
+    batches = _make_batches(region_data, batch_bytes)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) == 1:
+        parts = [_index_batch(batch, starts, ends) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_index_batch, batches,
+                                  [starts] * len(batches), [ends] * len(batches)))
+
+    values = np.concatenate([p[0] for p in parts])
+    addresses = np.concatenate([p[1] for p in parts])
+    order = np.argsort(values, kind="stable")
+    return PointerIndex(values[order], addresses[order])
+
+########################################
+# Backward Path Search
+########################################
+
+
+def find_paths(index, target, module_base, module_size, max_depth=5, max_offset=0x1000,
+               max_nodes=200_000, max_results=10_000):
+    """
+    Returns pointer chains (module offset, o1, ..., on) that resolve to `target`,
+    shortest first. A chain with k dereferences is found at level k.
+    Each level keeps at most max_nodes non-static candidates (smallest offsets first)
+    and drops duplicate addresses, which bounds the search on large heaps.
+    """
+    values, addresses = index.values, index.addresses
+    mod_lo = np.uint64(module_base)
+    mod_hi = np.uint64(module_base + module_size)
+    max_off = np.uint64(max_offset)
+
+    frontier = np.array([target], dtype=np.uint64)
+    levels = []   # per level: (pointer addresses, parent frontier index, offsets, frontier -> level index)
+    results = []
+    for depth in range(max_depth):
+        low = np.where(frontier >= max_off, frontier - max_off, np.uint64(0))
+        lo = np.searchsorted(values, low, side="left")
+        hi = np.searchsorted(values, frontier, side="right")
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            break
+        parent = np.repeat(np.arange(len(frontier)), counts)
+        first = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        pos = first + np.arange(total)
+        ptr_addrs = addresses[pos]
+        offsets = (frontier[parent] - values[pos]).astype(np.int64)
+
+        static = (ptr_addrs >= mod_lo) & (ptr_addrs < mod_hi)
+        nxt = np.flatnonzero(~static)
+        if len(nxt) > max_nodes:
+            nxt = nxt[np.argsort(offsets[nxt], kind="stable")[:max_nodes]]
+        _, first_seen = np.unique(ptr_addrs[nxt], return_index=True)
+        nxt = nxt[np.sort(first_seen)]
+        levels.append((ptr_addrs, parent, offsets, nxt))
+
+        for i in np.flatnonzero(static):
+            results.append(_rebuild_chain(levels, depth, int(i), module_base))
+            if len(results) >= max_results:
+                return results
+        frontier = ptr_addrs[nxt]
+        if len(frontier) == 0:
+            break
+    return results
+
+
+def _rebuild_chain(levels, depth, i, module_base):
+    ptr_addrs, parent, offsets, _ = levels[depth]
+    chain = [int(ptr_addrs[i]) - module_base, int(offsets[i])]
+    f = int(parent[i])
+    for k in range(depth - 1, -1, -1):
+        _, parent_k, offsets_k, frontier_map = levels[k]
+        j = int(frontier_map[f])
+        chain.append(int(offsets_k[j]))
+        f = int(parent_k[j])
+    return tuple(chain)
+
+########################################
+# Ranking Across Snapshots
+########################################
+
+
+def resolve_chain(backend, chain):
+    """
+    Resolves a module-relative chain against any backend. Returns the final address or -1.
+    """
+    addr = backend.module_base
+    last = len(chain) - 1
+    try:
+        for i, offset in enumerate(chain):
+            addr += offset
+            if i != last:
+                addr = backend.read_ulonglong(addr)
+                if addr == 0 or addr == 0xFFFFFFFFFFFFFFFF:
+                    return -1
+    except Exception:
+        return -1
+    return addr
+
+
+def rank_paths(paths, samples):
+    """
+    Scores each path by how many (snapshot, target address) samples it resolves correctly.
+    Returns [(path, hits)] sorted by hits (desc), then depth and largest offset (asc).
+    """
+    ranked = []
+    for path in paths:
+        hits = sum(1 for snap, target in samples if resolve_chain(snap, path) == target)
+        ranked.append((path, hits))
+    ranked.sort(key=lambda item: (-item[1], len(item[0]), max(item[0][1:], default=0)))
+    return ranked
+
+
+def scan(samples, max_depth=5, max_offset=0x1000, workers=None, min_hits=None):
+    """
+    Full pipeline: index the first (snapshot, target) sample, search paths to its target,
+    and rank them against every sample. Returns [(path, hits)] with hits >= min_hits
+    (default: all samples).
+    """
+    snapshot, target = samples[0]
+    index = build_pointer_index(snapshot, workers=workers)
+    print(f"🔎 Indexed {len(index.values):,} pointers.")
+    paths = find_paths(index, target, snapshot.module_base, snapshot.module_size,
+                       max_depth=max_depth, max_offset=max_offset)
+    print(f"🔎 Found {len(paths):,} candidate paths.")
+    min_hits = len(samples) if min_hits is None else min_hits
+    return [(path, hits) for path, hits in rank_paths(paths, samples) if hits >= min_hits]
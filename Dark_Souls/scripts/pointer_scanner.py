@@ -2,50 +2,235 @@
 import time
 import struct
 import threading
-from pymem import Pymem
-from pymem.process import module_from_name
+from aob_scanner import SIGNATURES, resolve_signatures
+from freezer import Freezer
+from instrumentation import Instrumentation, from_environment
+from liveness import LivenessMonitor
+from memory_backend import PymemBackend
+from offset_table import chains_for, default_chains
+from pointer_trie import INVALID_POINTERS
+from region_map import RegionMap
+from resolve_policy import ResolvePolicy
+from write_batch import WriteBatch
 
 ########################################
 # Symbol Map
 ########################################
+# Absolute addresses from one session of one build, for resolve_from_named_pointer()
+# experiments only. Chains never use them: their symbolic roots come from
+# PointerReader.symbols, the addresses resolved from aob_scanner.SIGNATURES at attach.
 symbol_map = {
     "LockTgtMan": 0x7FF785A0DBE0,
     "WorldChrMan": 0x7FF785A0FDB8,
     "target_ptr": 0x7FF781281000
 }
 
+########################################
+# Pointer Chains (module-relative)
+########################################
+# Loaded from data/offsets.json (offset_table.py). Fields read off each chain:
+#   player_hp:  HP @ +0x0, stamina @ +0x18
+#   player_pos: angle @ -0xC, X/Y/Z @ +0x0/+0x4/+0x8
+#   boss_flag:  bit 7 = boss defeated
+#   boss_pos:   X @ +0x0, height @ +0x4, Y @ +0x8, angle @ +0x10
+#   boss_anim:  animation/behavior ID (int)
+#   lock_on:    [LockTgtMan] + 0x2821, 1 = locked on
+# lock_on is rooted on LockTgtMan: a live attach compiles it from the AOB-scanned address
+# (and skips it if the signature is not found), the default table from symbol_offsets.
+# CHAINS is the default build's table; an attached reader uses reader.chains, the table
+# for the detected build.
+CHAINS = default_chains()
+
 ########################################
 # PointerReader Class with Safety Nets
 ########################################
+# Bytes read per data_type, checked against the region map before a read.
+_VALUE_SIZES = {"byte": 1, "4byte": 4, "int": 4, "float": 4, "double": 8, "string": 32}
 
 
 class PointerReader:
-    def __init__(self, process_name: str):
+    def __init__(self, process_name: str = "DarkSoulsIII.exe", backend=None, signatures=None):
         """
-        Initializes a pymem handle to the target process (e.g. DarkSoulsIII.exe)
-        and stores its base address.
+        Attaches to the target process (e.g. DarkSoulsIII.exe) through a memory backend
+        and stores its module base address.
+        `backend` defaults to a live PymemBackend; pass a SimulatedBackend (memory_backend.py)
+        to run against an in-process target instead.
+        `signatures` are AOB-scanned at attach to locate globals (self.symbols); defaults to
+        aob_scanner.SIGNATURES for a live attach and to none for an explicit backend.
         If attaching fails, sets pm = None and base_addr = 0 to avoid crashes later.
         """
+        # `pm` is the memory backend; it keeps pymem's read_*/write_* method names.
         self.pm = None
         self.base_addr = 0
+        # Resolved-address cache: chain tuple -> (root pointer, final address, resolve time).
+        # Entries are revalidated by re-reading only the chain's root pointer.
+        self._addr_cache = {}
+        self.cache_ttl = 1.0  # seconds before a cached chain is fully re-walked
+        self.generation = 0   # bumped every time the cache is invalidated wholesale
+        # Bounds retry sleeps in resolve_address() (time budget, backoff, circuit breaker).
+        self.policy = ResolvePolicy()
+        # Named globals (LockTgtMan, WorldChrMan, ...) resolved by AOB signatures at attach.
+        self.symbols = {}
+        # Compiled chains of the detected game build (offset_table.py).
+        self.build = None
+        self.chains = CHAINS
+        self._freezer = None
+        # Held while our own writers (WriteBatch, Freezer) touch game memory.
+        self.write_lock = threading.RLock()
+        # Per-field latency/failure counters (instrumentation.py); None = disabled.
+        self.instrumentation = from_environment()
         try:
-            self.pm = Pymem(process_name)
-            self.base_addr = module_from_name(
-                self.pm.process_handle, process_name).lpBaseOfDll
+            if backend is None:
+                backend = PymemBackend(process_name)
+                if signatures is None:
+                    signatures = SIGNATURES
+            self.pm = backend
+            self.base_addr = backend.module_base
             print(
-                f"👉✅ Attached to {process_name} | Base Address: {hex(self.base_addr)}")
+                f"👉✅ Attached to {backend.name} | Base Address: {hex(self.base_addr)}")
         except Exception as e:
             print(f"👉❌ Could not attach to process '{process_name}': {e}")
             # pm stays None; base_addr stays 0. We'll do safe checks before usage.
+        # Readable-memory index checked before every dereference (fail fast, no exceptions).
+        self.region_map = RegionMap(self.pm) if self.pm is not None else None
+        # Watches the attached process (pinned PID/handle); start() it to check in the background.
+        self.liveness = LivenessMonitor(self.pm) if self.pm is not None else None
+        if self.pm is not None and signatures:
+            # Raises SignatureNotFound rather than reading through stale absolute addresses.
+            self.symbols.update(resolve_signatures(self.pm, signatures))
+        if self.pm is not None:
+            try:
+                self.build, self.chains = chains_for(self.pm, self.symbols)
+            except Exception as e:
+                print(f"👉❌ Could not load the offset table, using default chains: {e}")
+
+    @classmethod
+    def from_snapshot(cls, path, signatures=None):
+        """
+        Returns a reader over a saved memory snapshot (memory_snapshot.py) for offline
+        replay: getters and snapshots work as live, writes fail like on a dead process.
+        Snapshots include the module image, so pass aob_scanner.SIGNATURES to resolve the
+        chains rooted on game globals in a snapshot of the real game.
+        """
+        from memory_snapshot import MemorySnapshot
+        return cls(path, backend=MemorySnapshot.load(path), signatures=signatures)
+
+    @property
+    def freezer(self):
+        """
+        The reader's Freezer (freezer.py), created on first use.
+        """
+        if self._freezer is None:
+            self._freezer = Freezer(self)
+        return self._freezer
+
+    def enable_instrumentation(self):
+        """
+        Turns on per-field counters and returns the Instrumentation.
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+        return self.instrumentation
+
+    def batch(self):
+        """
+        Returns a WriteBatch (write_batch.py) bound to this reader.
+        """
+        return WriteBatch(self)
 
     def _is_process_valid(self) -> bool:
         """
-        Checks if the pymem handle is valid and the base address is nonzero.
-        Returns True if OK, False otherwise.
+        Checks if the pymem handle is valid, the base address is nonzero and the liveness
+        monitor has not seen the process exit. Returns True if OK, False otherwise.
         """
         if self.pm is None or self.base_addr == 0:
             return False
-        return True
+        return self.liveness is None or self.liveness.alive
+
+    ########################################
+    # Resolved-Address Cache
+    ########################################
+    def invalidate_cache(self, offsets=None):
+        """
+        Drops the cached address of one pointer chain, or of every chain if offsets is None.
+        Call with no arguments after a reattach or a load screen.
+        """
+        if offsets is None:
+            self._addr_cache.clear()
+            self.generation += 1
+            self.policy.reset()
+        else:
+            self._addr_cache.pop(tuple(offsets), None)
+
+    def cached_address(self, offsets, name="unknown", max_retries=5, delay=0.5, debug=False,
+                       quiet=False):
+        """
+        Returns the final address of a pointer chain, reusing the previous resolution
+        as long as the chain's root pointer still holds the same value.
+        Falls back to update_address() on a miss, or with quiet=True to a single silent walk
+        that leaves the ResolvePolicy budget and breakers alone (for background threads).
+        Returns -1 if it fails.
+        """
+        if not self._is_process_valid():
+            return -1
+
+        key = tuple(offsets)
+        stats = self.instrumentation
+        entry = self._addr_cache.get(key)
+        if entry is not None:
+            root, addr, stamp = entry
+            if time.monotonic() - stamp < self.cache_ttl:
+                if root is None:
+                    if stats is not None:
+                        stats.cache(name, True)
+                    return addr
+                try:
+                    if self.pm.read_ulonglong(self.base_addr + key[0]) == root:
+                        if stats is not None:
+                            stats.cache(name, True)
+                        return addr
+                except Exception:
+                    pass
+            self._addr_cache.pop(key, None)
+        if stats is not None:
+            stats.cache(name, False)
+
+        if quiet:
+            addr = self._walk(key)
+        else:
+            addr = self.update_address(
+                offsets, name=name, max_retries=max_retries, delay=delay, debug=debug)
+        if addr == -1:
+            return -1
+
+        root = None
+        if len(key) > 1:
+            try:
+                root = self.pm.read_ulonglong(self.base_addr + key[0])
+            except Exception:
+                return addr
+        self._addr_cache[key] = (root, addr, time.monotonic())
+        return addr
+
+    def read_cached(self, offsets, data_type="int", delta=0, name="unknown", debug=False):
+        """
+        Reads a value at (cached chain address + delta).
+        A failed read invalidates the chain so the next call re-walks it.
+        Returns the value or -1 on failure.
+        """
+        stats = self.instrumentation
+        if stats is not None:
+            start = time.perf_counter_ns()
+        addr = self.cached_address(offsets, name=name, debug=debug)
+        if addr == -1:
+            value = -1
+        else:
+            value = self._read_value(addr + delta, data_type, debug)
+            if value == -1:
+                self.invalidate_cache(offsets)
+        if stats is not None:
+            stats.record(name, time.perf_counter_ns() - start, value != -1)
+        return value
 
     ########################################
     # Main Resolve Functions
@@ -88,35 +273,29 @@ class PointerReader:
         if debug:
             print(f"\n🔍 Starting resolution from {hex(addr)}")
 
-        try:
-            for i, offset in enumerate(offsets):
-                addr += offset
-                if debug:
-                    print(f"  Step {i+1}: +{hex(offset)} → {hex(addr)}")
+        for i, offset in enumerate(offsets):
+            addr += offset
+            if debug:
+                print(f"  Step {i+1}: +{hex(offset)} → {hex(addr)}")
 
-                # Dereference if not on the last offset
-                if i != len(offsets) - 1:
-                    addr = self.pm.read_ulonglong(addr)
+            # Dereference if not on the last offset
+            if i != len(offsets) - 1:
+                addr = self._deref(addr)
+                if addr == -1:
                     if debug:
-                        print(f"     👉✅ Dereferenced → {hex(addr)}")
-
-                    # If it returns 0 or all F's, it's probably invalid, but we won't crash:
-                    if addr == 0 or addr == 0xFFFFFFFFFFFFFFFF:
-                        if debug:
-                            print("     👉❌ Got invalid pointer (0 or -1).")
-                        return -1
-
-            # Finally, read the value at 'addr'
-            return self._read_value(addr, data_type, debug)
+                        print("     👉❌ Unreadable or invalid pointer (0 or -1).")
+                    return -1
+                if debug:
+                    print(f"     👉✅ Dereferenced → {hex(addr)}")
 
-        except Exception as e:
-            if debug:
-                print(f"  👉❌ Exception during pointer resolution: {e}")
-            return -1
+        # Finally, read the value at 'addr'
+        return self._read_value(addr, data_type, debug)
 
     def resolve_address(self, offsets, debug=False, max_retries=5, delay=1, name="unknown"):
         """
         Resolves an address from base + pointer chain, with retry logic.
+        Retry sleeps back off exponentially (capped at `delay`) and stop when the policy's
+        time budget runs out; a chain that keeps failing is short-circuited by its breaker.
         Returns the final address or -1 if it fails after retries.
         """
         if not self._is_process_valid():
@@ -124,52 +303,93 @@ class PointerReader:
                 f"👉❌ resolve_address(): Invalid process handle. Cannot resolve {name}.")
             return -1
 
+        key = tuple(offsets)
+        policy = self.policy
+        if not policy.allow(key):
+            if debug:
+                print(f"resolve_address(): ⏸️ Circuit open for {name}, skipping.")
+            return -1
+        deadline = policy.deadline()
+
         for attempt in range(max_retries):
             addr = self.base_addr
             if debug:
                 print(
                     f"\n📍 Resolving address for {name} (Attempt {attempt + 1}/{max_retries}):")
 
-            try:
-                for i, offset in enumerate(offsets):
-                    addr += offset
-                    if debug:
-                        print(f"  Step {i+1}: +{hex(offset)} → {hex(addr)}")
+            for i, offset in enumerate(offsets):
+                addr += offset
+                if debug:
+                    print(f"  Step {i+1}: +{hex(offset)} → {hex(addr)}")
 
-                    if i != len(offsets) - 1:
-                        addr = self.pm.read_ulonglong(addr)
+                if i != len(offsets) - 1:
+                    ptr = self._deref(addr)
+                    if ptr == -1:
                         if debug:
-                            print(f"     👉✅ Dereferenced → {hex(addr)}")
-
-                        # Check for obviously invalid pointer
-                        if addr == 0 or addr == 0xFFFFFFFFFFFFFFFF:
-                            if debug:
-                                print("     👉❌ Invalid pointer found. Retrying...")
-                            raise ValueError("Invalid pointer chain")
+                            print(f"     👉❌ Unreadable or invalid pointer at {hex(addr)}. Retrying...")
+                        addr = -1
+                        break
+                    addr = ptr
+                    if debug:
+                        print(f"     👉✅ Dereferenced → {hex(addr)}")
 
-                # If we reach here, the address is presumably valid
+            if addr != -1:
                 if debug:
                     print(f"👉✅ Resolved address for {name}: {hex(addr)}")
+                policy.record_success(key)
                 return addr
 
-            except Exception as e:
-                if debug:
-                    print(
-                        f"resolve_address(): 👉❌ {name} failed at {hex(addr)}: {e}")
-                time.sleep(delay)  # wait before retrying
+            # wait before retrying, unless this was the last attempt or the budget is spent
+            if attempt == max_retries - 1 or not policy.backoff(name, attempt, delay, deadline):
+                break
+            if self.instrumentation is not None:
+                self.instrumentation.retry(name)
 
+        policy.record_failure(key)
         print(
-            f"resolve_address(): 👉❌ Gave up resolving address for {name} after {max_retries} retries.")
+            f"resolve_address(): 👉❌ Gave up resolving address for {name} after {attempt + 1} attempts.")
         return -1
 
     ########################################
     # Reading / Writing
     ########################################
+    def _walk(self, offsets):
+        """
+        Walks a pointer chain from the module base once: no retries, breaker or logging.
+        Returns the final address or -1.
+        """
+        addr = self.base_addr
+        last = len(offsets) - 1
+        for i, offset in enumerate(offsets):
+            addr += offset
+            if i != last:
+                addr = self._deref(addr)
+                if addr == -1:
+                    return -1
+        return addr
+
+    def _deref(self, addr):
+        """
+        Returns the pointer stored at addr, or -1 if addr is outside readable memory,
+        the read fails, or the pointer is null/invalid.
+        """
+        if self.region_map is not None and not self.region_map.contains(addr, 8):
+            return -1
+        try:
+            ptr = self.pm.read_ulonglong(addr)
+        except Exception:
+            return -1
+        return -1 if ptr in INVALID_POINTERS else ptr
+
     def _read_value(self, addr, data_type, debug=False):
         """
         Safely reads a value of the requested data_type from addr.
         Returns the read value or -1 if an error happens.
         """
+        if self.region_map is not None and not self.region_map.contains(addr, _VALUE_SIZES.get(data_type, 1)):
+            if debug:
+                print(f"👉❌ _read_value(): {hex(addr)} is not readable.")
+            return -1
         try:
             if data_type == "byte":
                 value = self.pm.read_uchar(addr)
@@ -213,7 +433,7 @@ class PointerReader:
             offsets, debug=debug, max_retries=max_retries, delay=delay, name=name)
         if addr == -1:
             print(
-                f"update_address(): 👉❌ Failed to resolve address for {name} after {max_retries} retries.")
+                f"update_address(): 👉❌ Failed to resolve address for {name}.")
         else:
             if len(str(addr)) < 14 and debug:
                 print(
@@ -238,7 +458,7 @@ def write_value(reader, pointer, value, data_type="int",
         print(f"👉❌ write_value(): Reader invalid. Cannot write '{name}'.")
         return False
 
-    resolved_addr = reader.update_address(
+    resolved_addr = reader.cached_address(
         pointer, name=name, max_retries=max_retries, delay=delay, debug=debug)
     if resolved_addr == -1:
         print(f"👉❌ write_value(): Failed to resolve pointer for '{name}'.")
@@ -259,6 +479,7 @@ def write_value(reader, pointer, value, data_type="int",
         return True
 
     except Exception as e:
+        reader.invalidate_cache(pointer)
         print(f"👉❌ write_value(): Failed to write {value} for '{name}': {e}")
         return False
 
@@ -299,6 +520,13 @@ def reinitialize_reader(process_name: str = "DarkSoulsIII.exe", wait_time=2.0):
     """
     global reader
     try:
+        if reader:
+            reader.invalidate_cache()
+            if reader._freezer is not None:
+                reader._freezer.stop()
+            for monitor in (reader.region_map, reader.liveness):
+                if monitor is not None:
+                    monitor.stop()
         if reader and reader.pm:
             reader.pm.close()
     except:
@@ -337,35 +565,10 @@ def dump_floats_near(pm, address, size=0x200):
 
 def freeze_value(reader, pointer, value, data_type="int", interval_ms=100):
     """
-    Continuously writes a value (like CE's freeze).
-    Returns a thread handle so you can .running = False to stop it.
+    Continuously writes a value (like CE's freeze) through the reader's shared Freezer.
+    Returns a handle so you can .running = False to stop it.
     """
-    def freezer():
-        print(
-            f"🧊 Freezing pointer {pointer} to value {value} every {interval_ms}ms...")
-        try:
-            while freezer_thread.running:
-                if reader and reader._is_process_valid():
-                    addr = reader.resolve_address(pointer)
-                    if addr != -1:
-                        try:
-                            if data_type == "int":
-                                reader.pm.write_int(addr, value)
-                            elif data_type == "float":
-                                reader.pm.write_float(addr, value)
-                            elif data_type == "byte":
-                                reader.pm.write_uchar(addr, value)
-                        except Exception as inner_e:
-                            print(f"👉❌ Freezer error while writing: {inner_e}")
-                time.sleep(interval_ms / 1000.0)
-        except Exception as e:
-            print(f"👉❌ Freezer thread error: {e}")
-
-    freezer_thread = threading.Thread(target=freezer)
-    freezer_thread.daemon = True
-    freezer_thread.running = True
-    freezer_thread.start()
-    return freezer_thread
+    return reader.freezer.freeze(pointer, value, data_type=data_type, interval_ms=interval_ms)
 
 ########################################
 # Example: Boss Flag Helpers
@@ -376,130 +579,74 @@ def get_boss_HP(reader):
     """
     Returns the boss HP, or -1 if it fails.
     """
-    if reader.update_address([0x049648F8, 0x98, 0x200, 0x28, 0x168, 0x10, 0xF0, 0xF28],
-                             name="boss HP") == -1:
-        return -1
-    return reader.resolve([0x049648F8, 0x98, 0x200, 0x28, 0x168, 0x10, 0xF0, 0xF28], data_type="int")
+    return reader.read_cached(reader.chains["boss_hp"], data_type="int", name="boss HP")
 
 
 def get_player_HP(reader):
     """
     Returns the player's HP, or -1 on failure.
     """
-    if reader.update_address([0x04543F60, 0x28, 0x3A0, 0x70, 0x90],
-                             name="player HP") == -1:
-        return -1
-    return reader.resolve([0x04543F60, 0x28, 0x3A0, 0x70, 0x90], data_type="int")
+    return reader.read_cached(reader.chains["player_hp"], data_type="int", name="player HP")
 
 
 def get_player_stamina(reader):
     """
     Returns the player's stamina (int), or -1 on failure.
     """
-    # first we must update & resolve the final pointer
-    if reader.update_address([0x04543F60, 0x28, 0x3A0, 0x70, 0x90],
-                             name="player stamina") == -1:
-        return -1
-
-    final_addr = reader.resolve_address([0x04543F60, 0x28, 0x3A0, 0x70, 0x90])
-    if final_addr == -1:
-        return -1
-    try:
-        return reader.pm.read_int(final_addr + 0x18)
-    except:
-        return -1
+    # stamina lives 0x18 past the HP address
+    return reader.read_cached(reader.chains["player_hp"], data_type="int", delta=0x18,
+                              name="player stamina")
 
 
 def get_player_estus(reader):
     """
     Returns the player's Estus as an int, or -1 on failure.
     """
-    if reader.update_address([0x04795348, 0x8, 0xE0, 0x48, 0x115, 0x5, 0x145, 0xA35],
-                             name="Estus") == -1:
-        return -1
-    return reader.resolve([0x04795348, 0x8, 0xE0, 0x48, 0x115, 0x5, 0x145, 0xA35], data_type="int")
+    return reader.read_cached(reader.chains["estus"], data_type="int", name="Estus")
 
 
 def get_playerX(reader):
     """
     Returns player's X as float, or -1 if fail.
     """
-    if reader.update_address([0x04543F60, 0x28, 0x80],
-                             name="player X") == -1:
-        return -1
-    return reader.resolve([0x04543F60, 0x28, 0x80], data_type="float")
+    return reader.read_cached(reader.chains["player_pos"], data_type="float", name="player X")
 
 
 def get_playerY(reader):
     """
     Returns player's Y as float, or -1 if fail.
     """
-    if reader.update_address([0x04543F60, 0x28, 0x80],
-                             name="player Y") == -1:
-        return -1
-    final_addr = reader.resolve_address([0x04543F60, 0x28, 0x80])
-    if final_addr == -1:
-        return -1
-    try:
-        return reader.pm.read_float(final_addr + 4)
-    except:
-        return -1
+    return reader.read_cached(reader.chains["player_pos"], data_type="float", delta=4, name="player Y")
 
 
 def get_playerZ(reader):
     """
     Returns player's Z as float, or -1 if fail.
     """
-    if reader.update_address([0x04543F60, 0x28, 0x80],
-                             name="player Z") == -1:
-        return -1
-    final_addr = reader.resolve_address([0x04543F60, 0x28, 0x80])
-    if final_addr == -1:
-        return -1
-    try:
-        return reader.pm.read_float(final_addr + 8)
-    except:
-        return -1
+    return reader.read_cached(reader.chains["player_pos"], data_type="float", delta=8, name="player Z")
 
 
 def get_playerAngle(reader):
     """
     Returns the player's angle as float, or -1 if fail.
     """
-    if reader.update_address([0x04543F60, 0x28, 0x80],
-                             name="player angle") == -1:
-        return -1
-    final_addr = reader.resolve_address([0x04543F60, 0x28, 0x80])
-    if final_addr == -1:
-        return -1
-    try:
-        return reader.pm.read_float(final_addr - 0xC)
-    except:
-        return -1
+    return reader.read_cached(reader.chains["player_pos"], data_type="float", delta=-0xC,
+                              name="player angle")
 
 
 def get_player_in_boss_fight(reader):
     """
     Returns 1 if in boss fight, 0 if not, or -1 if we can't read it.
     """
-    if reader.update_address([0x047572B8, 0xC0],
-                             name="in boss fight") == -1:
-        return -1
-    val = reader.resolve([0x047572B8, 0xC0], data_type="byte")
-    if val == -1:
-        return -1
-    return val
+    return reader.read_cached(reader.chains["in_boss_fight"], data_type="byte", name="in boss fight")
 
 
 def get_boss_flag(reader):
     """
-    Reads the current boss flag byte from [0x004752F68, 0x40, 0x9C0, 0xAE7].
+    Reads the current boss flag byte from the boss_flag chain.
     Returns True if bit #7 is set, False if not, or -1 if fail.
     """
-    ptr = [0x004752F68, 0x40, 0x9C0, 0xAE7]
-    if reader.update_address(ptr, name="boss flag") == -1:
-        return -1
-    raw_val = reader.resolve(ptr, data_type="byte")
+    raw_val = reader.read_cached(reader.chains["boss_flag"], data_type="byte", name="boss flag")
     if raw_val == -1:
         return -1
     return bool(raw_val & 0x80)
@@ -510,72 +657,50 @@ def get_any_value(reader, pointer, data_type="int", name="unknown"):
     Returns the value at the pointer's resolved address.
     Returns -1 if it fails.
     """
-    if reader.update_address(pointer, name) == -1:
-        return -1
-    return reader.resolve(pointer, data_type=data_type)
+    return reader.read_cached(pointer, data_type=data_type, name=name)
 ########################################
 # Helper: Teleport / Reset Boss Flag
 ########################################
 
 
+# In front of Iudex Gundyr's fog wall: player_pos +0x0, +0x4, +0x8 and angle (-0xC).
+BOSS_TELEPORT = (124.4503403, -63.95353699, 555.809021, -2.778103352)
+
+
 def teleport_to_boss(reader):
     """
-    Teleports the player to the Ludex Gundyr arena.
+    Teleports the player to the Ludex Gundyr arena (one write for the position, one for
+    the angle; the bytes between them belong to the game and are left alone).
+    Returns True if every field was written.
     """
-    PlayerX_PTR = [0x04543F60, 0x28, 0x80]
-    x_address = reader.update_address(PlayerX_PTR, name="PlayerX")
-    if x_address == -1:
-        print("👉❌ Could not teleport: invalid player X address.")
-        return
+    pos = reader.chains["player_pos"]
+    x, z, y, angle = BOSS_TELEPORT
+    results = (reader.batch()
+               .write(pos, x, "float", name="Teleport X")
+               .write(pos, z, "float", delta=4, name="Teleport Z")
+               .write(pos, y, "float", delta=8, name="Teleport Y")
+               .write(pos, angle, "float", delta=-0xC, name="Teleport Angle")
+               .commit())
+    failed = [name for name, ok in results.items() if not ok]
+    if failed:
+        print(f"👉❌ Could not teleport: failed to write {', '.join(failed)}.")
+    return not failed
 
-    # Write X
-    write_float_using_address(
-        reader, x_address, 124.4503403, name="Teleport X")
-    # Write Z
-    write_float_using_address(
-        reader, x_address + 4, -63.95353699, name="Teleport Z")
-    # Write Y
-    write_float_using_address(reader, x_address + 8,
-                              555.809021, name="Teleport Y")
-    # Write Angle
-    write_float_using_address(
-        reader, x_address - 0xC, -2.778103352, name="Teleport Angle")
 
-
-def reset_boss_flag(reader, boss_flag_ptr=[0x004752F68, 0x40, 0x9C0, 0xAE7], debug=False):
+def reset_boss_flag(reader, boss_flag_ptr=None, debug=False):
     """
     Clears the top (7th) bit of the boss-defeated flag, forcing it to zero.
     If reading/writing fails, returns False (does not crash).
     """
-    # 1) Update pointer
-    if reader.update_address(boss_flag_ptr, name="boss_defeated_bit") == -1:
-        print("👉❌ Failed to update boss-defeated pointer.")
-        return False
-
-    # 2) Read current byte
-    current_val = reader.resolve(boss_flag_ptr, data_type="byte", debug=debug)
-    if current_val == -1:
-        print("👉❌ Failed to read boss-defeated value.")
-        return False
-
-    # 3) Clear bit 7
-    new_val = current_val & 0x7F
-
-    # 4) Write it back
-    final_addr = reader.resolve_address(
-        boss_flag_ptr, debug=debug, name="boss_defeated_bit")
-    if final_addr == -1:
-        print("👉❌ Failed to resolve final boss-defeated address.")
-        return False
-
-    try:
-        reader.pm.write_uchar(final_addr, new_val)
-        print(
-            f"👉✅ Boss 'defeated' bit changed from 0x{current_val:02X} to 0x{new_val:02X} @ {hex(final_addr)}")
-        return True
-    except Exception as e:
-        print(f"👉❌ Failed to write new boss-defeated value: {e}")
+    if boss_flag_ptr is None:
+        boss_flag_ptr = reader.chains["boss_flag"]
+    batch = reader.batch().write_bits(boss_flag_ptr, mask=0x80, bits=0x00, name="boss_defeated_bit")
+    if not batch.commit()["boss_defeated_bit"]:
+        print("👉❌ Failed to reset the boss-defeated bit.")
         return False
+    old = batch.old_values["boss_defeated_bit"]
+    print(f"👉✅ Boss 'defeated' bit changed from 0x{old:02X} to 0x{old & 0x7F:02X}")
+    return True
 
 
 # -------------------------------
@@ -0,0 +1,131 @@
+# pointer_trie.py
+import time
+
+INVALID_POINTERS = (0, 0xFFFFFFFFFFFFFFFF)
+
+########################################
+# Shared-Prefix Pointer Trie
+########################################
+
+
+class PointerTrie:
+    """
+    Resolves many module-relative pointer chains at once.
+    Registered chains are compiled into a prefix trie, flattened into a list of
+    dereference steps, so a pointer shared by several chains (e.g. 0x04543F60 -> +0x28
+    for player HP/stamina/position) is read once per tick and fanned out to its leaves.
+    """
+
+    def __init__(self, reader, chains=None):
+        self.reader = reader
+        self.names = []
+        self.chains = []
+        self._steps = ()      # (node, parent node, offset) dereferences in walk order
+        self._leaves = ()     # (parent node, offset) per registered chain
+        self._roots = ()      # (node, module offset) of the first-level dereferences
+        self._n_nodes = 1
+        self._compiled = False
+        # Last full walk, reused while every root pointer is unchanged.
+        self.addresses = []
+        self._root_values = ()
+        self._stamp = 0.0
+        self._generation = None
+        for name, chain in (chains or {}).items():
+            self.register(name, chain)
+
+    def register(self, name, chain):
+        """
+        Adds a chain; returns its index in `addresses`.
+        """
+        self.names.append(name)
+        self.chains.append(tuple(chain))
+        self._compiled = False
+        return len(self.names) - 1
+
+    def compile(self):
+        """
+        Builds the trie. Node 0 is the module base; every other node is the value of a
+        dereferenced pointer, identified by the offset path that led to it.
+        """
+        node_ids = {(): 0}
+        steps = []
+        leaves = []
+        for chain in self.chains:
+            parent = 0
+            for depth in range(len(chain) - 1):
+                path = chain[:depth + 1]
+                node = node_ids.get(path)
+                if node is None:
+                    node = node_ids[path] = len(node_ids)
+                    steps.append((node, parent, chain[depth]))
+                parent = node
+            leaves.append((parent, chain[-1]))
+        self._steps = tuple(steps)
+        self._leaves = tuple(leaves)
+        self._roots = tuple((node, offset) for node, parent, offset in steps if parent == 0)
+        self._n_nodes = len(node_ids)
+        self._compiled = True
+        self.invalidate()
+
+    @property
+    def read_count(self):
+        """
+        Number of pointer reads a full walk costs (one per distinct intermediate node).
+        """
+        if not self._compiled:
+            self.compile()
+        return len(self._steps)
+
+    def invalidate(self):
+        self._generation = None
+
+    def resolve_all(self):
+        """
+        Walks every chain, dereferencing each shared node once.
+        Returns a list of final addresses aligned with `names` (-1 where a chain breaks).
+        """
+        if not self._compiled:
+            self.compile()
+        pm = self.reader.pm
+        region_map = getattr(self.reader, "region_map", None)
+        nodes = [-1] * self._n_nodes
+        nodes[0] = self.reader.base_addr
+        for node, parent, offset in self._steps:
+            base = nodes[parent]
+            if base == -1:
+                continue
+            if region_map is not None and not region_map.contains(base + offset, 8):
+                continue
+            try:
+                ptr = pm.read_ulonglong(base + offset)
+            except Exception:
+                continue
+            if ptr not in INVALID_POINTERS:
+                nodes[node] = ptr
+
+        addresses = [nodes[parent] + offset if nodes[parent] != -1 else -1
+                     for parent, offset in self._leaves]
+        self.addresses = addresses
+        self._root_values = tuple(nodes[node] for node, _ in self._roots)
+        self._stamp = time.monotonic()
+        self._generation = self.reader.generation
+        return addresses
+
+    def resolve(self):
+        """
+        Returns the last walk's addresses if the reader's cache generation, the TTL
+        (reader.cache_ttl) and every distinct root pointer are unchanged; otherwise walks again.
+        Revalidation costs one read per distinct root, not per chain.
+        """
+        if not self._compiled or self._generation != self.reader.generation \
+                or time.monotonic() - self._stamp >= self.reader.cache_ttl:
+            return self.resolve_all()
+        pm = self.reader.pm
+        base = self.reader.base_addr
+        try:
+            for (_, offset), value in zip(self._roots, self._root_values):
+                if pm.read_ulonglong(base + offset) != value:
+                    return self.resolve_all()
+        except Exception:
+            return self.resolve_all()
+        return self.addresses
@@ -0,0 +1,107 @@
+# region_map.py
+import bisect
+import threading
+import time
+
+########################################
+# Readable-Region Map
+########################################
+
+
+class RegionMap:
+    """
+    Sorted interval index of the target's readable memory (backend.regions()), so a
+    pointer can be checked with one bisect before it is dereferenced. On load screens
+    broken chains then fail without a failed ReadProcessMemory and a raised exception.
+
+    Hits are trusted (a region freed since the last rebuild still falls back to the
+    read's own error handling). A miss is rejected at once: lookups never walk the address
+    space themselves (the map is only built synchronously on first use). start() rebuilds
+    it every refresh_interval seconds on a background thread, and a miss on a map older
+    than min_refresh wakes that thread early, so freshly allocated heap memory is not
+    rejected for long. Without the thread, call refresh() explicitly.
+    Backends that cannot enumerate regions get a map that accepts every address.
+    """
+
+    def __init__(self, backend, refresh_interval=2.0, min_refresh=0.25):
+        self.backend = backend
+        self.refresh_interval = refresh_interval
+        self.min_refresh = min_refresh
+        self.enabled = True
+        self.refreshes = 0
+        self.rejections = 0
+        self._index = ((), ())    # (starts, ends), swapped atomically on refresh
+        self._stamp = float("-inf")
+        self._stop = threading.Event()
+        self._wake = threading.Event()   # set on a stale miss: refresh before the interval ends
+        self._thread = None
+
+    def refresh(self):
+        """
+        Rebuilds the map from backend.regions(), merging adjacent regions.
+        """
+        try:
+            regions = sorted(self.backend.regions())
+        except Exception as e:
+            print(f"👉❌ RegionMap: could not enumerate regions: {e}")
+            regions = []
+        starts, ends = [], []
+        for start, size in regions:
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], start + size)
+            else:
+                starts.append(start)
+                ends.append(start + size)
+        self.enabled = bool(starts)
+        self._index = (starts, ends)
+        self._stamp = time.monotonic()
+        self.refreshes += 1
+
+    def contains(self, address, size=8):
+        """
+        True if [address, address + size) lies inside one readable region.
+        A miss is a bisect and never blocks on a rebuild.
+        """
+        if self._stamp == float("-inf"):
+            self.refresh()
+        if not self.enabled or self._lookup(address, size):
+            return True
+        if time.monotonic() - self._stamp >= self.min_refresh:
+            self._wake.set()
+        self.rejections += 1
+        return False
+
+    def _lookup(self, address, size):
+        starts, ends = self._index
+        i = bisect.bisect_right(starts, address) - 1
+        return i >= 0 and address + size <= ends[i]
+
+    ########################################
+    # Background Refresh
+    ########################################
+    def start(self):
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+        self._wake.clear()
+        self._thread = threading.Thread(target=self._run, name="RegionMap", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.refresh_interval)
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            self.refresh()
+            # Rate-limit rebuilds triggered by misses to one per min_refresh.
+            if self._stop.wait(self.min_refresh):
+                return
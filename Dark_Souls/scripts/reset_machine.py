@@ -0,0 +1,126 @@
+# reset_machine.py
+import time
+from collections import namedtuple
+
+########################################
+# Reset Phases
+########################################
+# One step of an episode reset.
+#   done(since) -> bool: the observable condition that ends the phase, polled every `poll`
+#             seconds. `since` is the monotonic time the attempt's action finished; reads
+#             taken before it must not count.
+#   enter()   runs once when the phase starts; fallback() (default: enter again) runs each
+#             time the deadline passes and attempts remain.
+#   timeout   seconds per attempt; `retries` extra attempts after the first.
+#   settle    seconds done() must keep holding before the phase ends (debounces reads
+#             taken mid-load).
+#   required  a required phase that runs out of attempts fails the reset; an optional one
+#             is skipped with a warning.
+Phase = namedtuple(
+    "Phase",
+    ["name", "done", "enter", "fallback", "timeout", "retries", "settle", "required"],
+    defaults=(None, None, 5.0, 0, 0.0, True))
+
+
+class ResetMachine:
+    """
+    Runs reset phases in order, moving on as soon as each phase's condition holds
+    instead of sleeping for a fixed time.
+
+    Every phase's duration is kept in `last` (this reset) and accumulated in `stats`
+    (count / total / max / timeouts per phase), and recorded as "reset:<phase>" when the
+    reader's instrumentation is enabled, so reset latency can be tracked over a run.
+
+        machine = ResetMachine([
+            Phase("respawn", lambda since: hp(since) > 0, fallback=kill_player, timeout=20.0),
+            Phase("teleport", at_fog_wall, enter=teleport, timeout=1.0, retries=2),
+        ])
+        ok = machine.run()
+    """
+
+    def __init__(self, phases, poll=0.01, instrumentation=None):
+        self.phases = tuple(phases)
+        self.poll = poll
+        self.instrumentation = instrumentation
+        self.last = {}
+        self.last_total = 0.0
+        self.failed_phase = None
+        self.stats = {phase.name: {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0}
+                      for phase in self.phases}
+        self.runs = 0
+
+    def run(self):
+        """
+        Runs every phase once. Returns True if all required phases completed; on failure
+        the failing phase's name is left in `failed_phase`.
+        """
+        self.last = {}
+        self.failed_phase = None
+        self.runs += 1
+        start = time.monotonic()
+        ok = True
+        for phase in self.phases:
+            if not self._run_phase(phase) and phase.required:
+                self.failed_phase = phase.name
+                ok = False
+                break
+        self.last_total = time.monotonic() - start
+        return ok
+
+    def _run_phase(self, phase):
+        start = time.monotonic()
+        ok = False
+        for attempt in range(phase.retries + 1):
+            action = phase.enter if attempt == 0 else (phase.fallback or phase.enter)
+            if action is not None:
+                action()
+            if self._wait(phase):
+                ok = True
+                break
+            self.stats[phase.name]["timeouts"] += 1
+            print(f"⏰   Reset phase '{phase.name}' timed out after {phase.timeout:.1f}s "
+                  f"(attempt {attempt + 1}/{phase.retries + 1}).")
+        elapsed = time.monotonic() - start
+        if not ok:
+            print(f"{'❌' if phase.required else '⚠'}   Reset phase '{phase.name}' gave up "
+                  f"after {elapsed:.2f}s{'' if phase.required else '; continuing'}.")
+        self.last[phase.name] = elapsed
+        stats = self.stats[phase.name]
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        if self.instrumentation is not None:
+            self.instrumentation.record("reset:" + phase.name, int(elapsed * 1e9), ok)
+        return ok
+
+    def _wait(self, phase):
+        """
+        Polls done() until it has held for `settle` seconds or the attempt's deadline passes.
+        """
+        since = time.monotonic()
+        deadline = since + phase.timeout
+        held_since = None
+        while True:
+            now = time.monotonic()
+            if phase.done(since):
+                if held_since is None:
+                    held_since = now
+                if now - held_since >= phase.settle:
+                    return True
+            else:
+                held_since = None
+            if now >= deadline:
+                return False
+            time.sleep(self.poll)
+
+    def summary(self):
+        """
+        One line with this reset's phase timings, e.g. "respawn 1.20s, teleport 0.03s".
+        """
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.last.items())
+
+    def mean_times(self):
+        """
+        Mean duration per phase over every run so far.
+        """
+        return {name: s["total"] / s["count"] for name, s in self.stats.items() if s["count"]}
@@ -0,0 +1,114 @@
+# resolve_policy.py
+import time
+
+########################################
+# Deadline-Aware Retry Policy
+########################################
+
+
+class ResolvePolicy:
+    """
+    Decides how long PointerReader.resolve_address() may block on retries.
+
+    - Time budget: begin_step() opens a per-step deadline shared by every resolution in
+      that step. Outside a step each call gets its own `call_budget`.
+    - Exponential backoff: retry sleeps grow from `base_delay` and are clipped to both
+      the caller's delay cap and the time left in the budget.
+    - Circuit breaker: after `failure_threshold` consecutive failed resolutions a chain is
+      short-circuited (returns -1 without reading) for `cooldown` seconds, then gets one
+      trial attempt.
+    Blocked time is accumulated so the cost of pointer retries is visible.
+    """
+
+    def __init__(self, step_budget=0.05, call_budget=2.0, base_delay=0.005, max_delay=0.5,
+                 failure_threshold=3, cooldown=1.0):
+        self.step_budget = step_budget
+        self.call_budget = call_budget
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._step_deadline = None
+        self._breakers = {}  # chain key -> [consecutive failures, open until (monotonic)]
+        # Counters
+        self.blocked_time = 0.0
+        self.blocked_by_chain = {}
+        self.retries = 0
+        self.short_circuits = 0
+        self.give_ups = 0
+
+    ########################################
+    # Budget
+    ########################################
+    def begin_step(self, budget=None):
+        """
+        Starts a new per-step budget (call once per env step).
+        """
+        self._step_deadline = time.monotonic() + (self.step_budget if budget is None else budget)
+
+    def end_step(self):
+        self._step_deadline = None
+
+    def deadline(self):
+        """
+        Returns the deadline a resolution starting now must respect.
+        """
+        if self._step_deadline is not None:
+            return self._step_deadline
+        return time.monotonic() + self.call_budget
+
+    def backoff(self, name, attempt, delay_cap, deadline):
+        """
+        Sleeps before retry number `attempt + 1`.
+        Returns False (without sleeping) if the budget is already spent.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        sleep = min(self.base_delay * (2 ** attempt), delay_cap, self.max_delay, remaining)
+        time.sleep(sleep)
+        self.retries += 1
+        self.blocked_time += sleep
+        self.blocked_by_chain[name] = self.blocked_by_chain.get(name, 0.0) + sleep
+        return True
+
+    ########################################
+    # Circuit Breaker
+    ########################################
+    def allow(self, key):
+        """
+        Returns False while the chain's breaker is open.
+        """
+        breaker = self._breakers.get(key)
+        if breaker is None or breaker[1] <= time.monotonic():
+            return True
+        self.short_circuits += 1
+        return False
+
+    def record_success(self, key):
+        if key in self._breakers:
+            del self._breakers[key]
+
+    def record_failure(self, key):
+        self.give_ups += 1
+        breaker = self._breakers.setdefault(key, [0, 0.0])
+        breaker[0] += 1
+        if breaker[0] >= self.failure_threshold:
+            breaker[1] = time.monotonic() + self.cooldown
+
+    def reset(self):
+        """
+        Closes every breaker (e.g. after a reattach).
+        """
+        self._breakers.clear()
+
+    def stats(self):
+        return {
+            "blocked_time_s": round(self.blocked_time, 4),
+            "blocked_by_chain_s": {k: round(v, 4) for k, v in self.blocked_by_chain.items()},
+            "retries": self.retries,
+            "give_ups": self.give_ups,
+            "short_circuits": self.short_circuits,
+            "open_breakers": sum(1 for _, until in self._breakers.values()
+                                 if until > time.monotonic()),
+        }
@@ -0,0 +1,216 @@
+# reward.py
+"""
+Declarative, vectorized rewards.
+
+A reward is a list of Terms. Each term maps step inputs to an unweighted value with
+numpy ops over whole columns, so the same definition scores one live step (a 1-row
+batch) or millions of recorded steps at once.
+
+Step inputs are rows of INPUTS; a recorded trajectory is a float array of shape
+(steps, len(INPUTS)) whose "first" column marks the first step after a reset (its
+deltas are taken against itself, i.e. zero).
+
+Usage:
+    python reward.py score data/reward_history.npy             # default terms
+    python reward.py score data/reward_history.npy --variant no_penalties
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(os.path.dirname(script_dir), "data")
+REWARD_HISTORY_PATH = os.path.join(data_dir, "reward_history.npy")
+
+INPUTS = ("first", "player_hp", "boss_hp", "boss_dead", "player_dead", "whiff", "useless_dodge")
+COL = {name: i for i, name in enumerate(INPUTS)}
+
+########################################
+# Terms
+########################################
+
+
+class Term:
+    """
+    weight * fn(cur, prev), where cur/prev are (steps, len(INPUTS)) arrays (prev = the
+    previous step's inputs) and fn returns one unweighted value per step.
+    """
+
+    def __init__(self, name, weight, fn):
+        self.name = name
+        self.weight = weight
+        self.fn = fn
+
+    def __repr__(self):
+        return f"Term({self.name!r}, {self.weight})"
+
+
+def drop(column, weight, name=None):
+    """
+    Rewards decreases of `column` since the previous step (e.g. HP lost). Steps where
+    either value is negative (the -1 of an unreadable HP) count as no change.
+    """
+    i = COL[column]
+
+    def fn(cur, prev):
+        before, after = prev[:, i], cur[:, i]
+        return np.where((before >= 0) & (after >= 0), np.maximum(before - after, 0.0), 0.0)
+    return Term(name or f"{column}_drop", weight, fn)
+
+
+def flag(column, weight, name=None):
+    """
+    Adds `weight` on every step where `column` is set (penalties, terminal bonuses).
+    """
+    i = COL[column]
+    return Term(name or column, weight, lambda cur, prev: cur[:, i] != 0)
+
+
+DEFAULT_TERMS = (
+    drop("boss_hp", 1.0, name="damage_dealt"),
+    drop("player_hp", -0.1, name="damage_taken"),
+    flag("whiff", -0.05),
+    flag("useless_dodge", -0.05),
+    flag("boss_dead", 500.0),
+    flag("player_dead", -75.0),
+)
+
+# Shaping variants to compare offline with `reward.py score --variant`.
+VARIANTS = {
+    "default": DEFAULT_TERMS,
+    "no_penalties": DEFAULT_TERMS[:2] + DEFAULT_TERMS[4:],
+    "damage_only": DEFAULT_TERMS[:2],
+}
+
+########################################
+# Batch Evaluation
+########################################
+
+
+def previous_rows(steps):
+    """
+    Returns the `prev` array for a trajectory: each row's predecessor, or the row itself
+    on the first step of an episode.
+    """
+    prev = np.empty_like(steps)
+    prev[1:] = steps[:-1]
+    prev[0] = steps[0]
+    first = steps[:, COL["first"]] != 0
+    prev[first] = steps[first]
+    return prev
+
+
+def evaluate(steps, terms=DEFAULT_TERMS, prev=None):
+    """
+    Scores every step of a trajectory. Returns (rewards, {term name: weighted values}).
+    """
+    steps = np.asarray(steps, dtype=np.float64)
+    if prev is None:
+        prev = previous_rows(steps)
+    parts = {term.name: term.weight * term.fn(steps, prev) for term in terms}
+    total = np.zeros(len(steps))
+    for values in parts.values():
+        total += values
+    return total, parts
+
+
+########################################
+# Online Engine
+########################################
+
+
+class RewardEngine:
+    """
+    Scores live steps with the same terms as evaluate(). Holds the previous step's
+    inputs (in place of compute_reward's function attributes and globals), counts
+    consecutive identical rewards for stale-episode detection, and optionally records
+    every input row for offline scoring.
+    """
+
+    def __init__(self, terms=DEFAULT_TERMS, record=False):
+        self.terms = tuple(terms)
+        self._rows = np.zeros((2, len(INPUTS)))   # [previous step, current step]
+        self._prev, self._cur = self._rows[0:1], self._rows[1:2]
+        self._first = True
+        self.last_reward = None
+        self.last_terms = {}
+        self.stale_steps = 0
+        self.history = [] if record else None
+
+    def reset(self):
+        """
+        Starts a new episode: the next step's deltas are taken against itself.
+        """
+        self._first = True
+        self.last_reward = None
+        self.stale_steps = 0
+
+    def step(self, player_hp, boss_hp, boss_dead=False, player_dead=False, whiff=False,
+             useless_dodge=False):
+        """
+        Scores one step. Returns the reward; per-term values are left in last_terms.
+        """
+        cur = self._cur[0]
+        cur[:] = (self._first, player_hp, boss_hp, boss_dead, player_dead, whiff, useless_dodge)
+        if self._first:
+            self._prev[0] = cur
+            self._first = False
+        reward = 0.0
+        for term in self.terms:
+            value = term.weight * float(term.fn(self._cur, self._prev)[0])
+            self.last_terms[term.name] = value
+            reward += value
+        if self.history is not None:
+            self.history.append(cur.copy())
+        self.stale_steps = self.stale_steps + 1 if reward == self.last_reward else 0
+        self.last_reward = reward
+        self._prev[0] = cur
+        return reward
+
+    def save_history(self, path=REWARD_HISTORY_PATH):
+        """
+        Appends the recorded steps to the .npy trajectory at `path` and clears them.
+        """
+        if not self.history:
+            return path
+        steps = np.array(self.history)
+        if os.path.exists(path):
+            steps = np.concatenate((np.load(path), steps))
+        np.save(path, steps)
+        self.history.clear()
+        return path
+
+
+########################################
+# CLI
+########################################
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score recorded trajectories with reward variants")
+    sub = parser.add_subparsers(dest="command", required=True)
+    score = sub.add_parser("score", help="Evaluate reward variants over a recorded trajectory")
+    score.add_argument("path", nargs="?", default=REWARD_HISTORY_PATH)
+    score.add_argument("--variant", nargs="*", default=list(VARIANTS), choices=list(VARIANTS))
+
+    args = parser.parse_args(argv)
+    steps = np.load(args.path)
+    episodes = int(steps[:, COL["first"]].sum())
+    print(f"{len(steps):,} steps, {episodes} episodes from {args.path}")
+    prev = previous_rows(steps)
+    for name in args.variant:
+        start = time.perf_counter()
+        total, parts = evaluate(steps, VARIANTS[name], prev)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>14}: total {total.sum():12.2f}, {total.sum() / max(episodes, 1):9.2f}/episode "
+              f"({elapsed * 1000:.1f} ms)")
+        for term, values in parts.items():
+            print(f"{'':>16}{term:>14}: {values.sum():12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
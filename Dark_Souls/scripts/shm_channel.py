@@ -0,0 +1,196 @@
+# shm_channel.py
+"""
+Fixed-layout binary channel for the Cheat Engine logger -> Python handoff.
+
+Replaces the gundyr_info.txt / lock_on.txt text files with one 64-byte record in shared
+memory, guarded by a seqlock: the writer makes `seq` odd, writes the payload, then makes
+it even again. Readers copy the payload straight out of the mapping with
+struct.unpack_from and retry if `seq` was odd or changed meanwhile, so reads never lock
+and never see a torn record.
+
+Record layout (little endian):
+    0x00  uint32  magic  (b"DS3G")
+    0x04  uint32  layout version
+    0x08  uint64  seq    (odd while a write is in progress)
+    0x10  double  writer timestamp (seconds, writer's clock)
+    0x18  int32   boss HP
+    0x1C  float   boss X, Y, Z, angle
+    0x2C  uint8   lock-on (1 = locked)
+    0x2D  char[11] boss animation tag (NUL padded)
+
+On Windows the record lives in the named mapping CHANNEL_TAGNAME (written by
+lua_scripts/gundyr_logger_shm.lua). Elsewhere a file-backed mapping at CHANNEL_PATH is
+used, which the Python stand-in producer (`python shm_channel.py produce`) writes.
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+data_dir = os.path.join(os.path.dirname(script_dir), "data")
+
+CHANNEL_TAGNAME = "DS3GundyrChannel"
+CHANNEL_PATH = os.path.join(data_dir, "gundyr_channel.bin")
+CHANNEL_SIZE = 64
+MAGIC = 0x47335344  # b"DS3G" read as little-endian uint32
+VERSION = 1
+
+_HEADER = struct.Struct("<II")
+_SEQ = struct.Struct("<Q")
+_PAYLOAD = struct.Struct("<diffffB11s")
+SEQ_OFFSET = 0x08
+PAYLOAD_OFFSET = 0x10
+
+
+def _open_mapping(path, tagname, create):
+    """
+    Returns an mmap over the channel: a named mapping on Windows, a file elsewhere.
+    Returns None if the file does not exist and create is False.
+    """
+    if sys.platform == "win32" and path is None:
+        return mmap.mmap(-1, CHANNEL_SIZE, tagname=tagname or CHANNEL_TAGNAME)
+
+    path = path or CHANNEL_PATH
+    if not os.path.exists(path):
+        if not create:
+            return None
+        with open(path, "wb") as f:
+            f.write(b"\x00" * CHANNEL_SIZE)
+    with open(path, "r+b") as f:
+        return mmap.mmap(f.fileno(), CHANNEL_SIZE)
+
+########################################
+# Reader
+########################################
+
+
+class ChannelReader:
+    """
+    Lock-free seqlock reader. Tracks when the record last changed so callers can
+    tell a live producer from a stale mapping.
+    """
+
+    def __init__(self, buf):
+        self.buf = buf
+        self._last_seq = None
+        self._last_change = 0.0
+        self.torn_retries = 0
+
+    @classmethod
+    def open(cls, path=None, tagname=None):
+        """
+        Opens the channel, or returns None if it does not exist yet.
+        """
+        try:
+            buf = _open_mapping(path, tagname, create=False)
+        except (OSError, ValueError) as e:
+            print(f"👉❌ Could not open shared-memory channel: {e}")
+            return None
+        return cls(buf) if buf is not None else None
+
+    def read(self, max_attempts=100):
+        """
+        Returns (timestamp, boss_hp, x, y, z, angle, locked, anim), or None if the record
+        has never been written or no consistent copy was obtained within max_attempts.
+        """
+        buf = self.buf
+        magic, version = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            return None
+        for _ in range(max_attempts):
+            seq1 = _SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if seq1 & 1:
+                self.torn_retries += 1
+                continue
+            payload = _PAYLOAD.unpack_from(buf, PAYLOAD_OFFSET)
+            if _SEQ.unpack_from(buf, SEQ_OFFSET)[0] != seq1:
+                self.torn_retries += 1
+                continue
+            if seq1 != self._last_seq:
+                self._last_seq = seq1
+                self._last_change = time.monotonic()
+            timestamp, boss_hp, x, y, z, angle, locked, anim = payload
+            anim = anim.split(b"\x00", 1)[0].decode("ascii", errors="replace")
+            return (timestamp, boss_hp, x, y, z, angle, bool(locked), anim)
+        return None
+
+    def age(self):
+        """
+        Seconds since the record was last seen changing (inf if never read).
+        """
+        if self._last_seq is None:
+            return float("inf")
+        return time.monotonic() - self._last_change
+
+    def close(self):
+        self.buf.close()
+
+########################################
+# Writer (Python stand-in for the Lua logger)
+########################################
+
+
+class ChannelWriter:
+    """
+    Seqlock writer with the same protocol as lua_scripts/gundyr_logger_shm.lua.
+    Only one writer may exist per channel.
+    """
+
+    def __init__(self, path=None, tagname=None):
+        self.buf = _open_mapping(path, tagname, create=True)
+        self.seq = _SEQ.unpack_from(self.buf, SEQ_OFFSET)[0] & ~1
+        _SEQ.pack_into(self.buf, SEQ_OFFSET, self.seq)
+        _HEADER.pack_into(self.buf, 0, MAGIC, VERSION)
+
+    def publish(self, boss_hp, x, y, z, angle, anim="", locked=False):
+        self.seq += 1
+        _SEQ.pack_into(self.buf, SEQ_OFFSET, self.seq)           # odd: write in progress
+        _PAYLOAD.pack_into(self.buf, PAYLOAD_OFFSET, time.time(), int(boss_hp),
+                           x, y, z, angle, 1 if locked else 0, anim.encode("ascii")[:11])
+        self.seq += 1
+        _SEQ.pack_into(self.buf, SEQ_OFFSET, self.seq)           # even: record consistent
+
+    def close(self):
+        self.buf.close()
+
+
+def produce(rate_hz=20.0, duration=None, path=None):
+    """
+    Stand-in producer: publishes a boss circling the arena so the Python side can be
+    exercised on Linux without the game or Cheat Engine.
+    """
+    import math
+    writer = ChannelWriter(path=path)
+    anims = "WEAT"
+    start = time.time()
+    print(f"📡 Producing synthetic Gundyr records at {rate_hz:.0f} Hz (Ctrl+C to stop)...")
+    try:
+        while duration is None or time.time() - start < duration:
+            t = time.time() - start
+            writer.publish(1037, 124.0 + 5 * math.cos(t), 560.0 + 5 * math.sin(t), -64.0,
+                           t % (2 * math.pi), anims[int(t) % 4], locked=int(t) % 5 != 0)
+            time.sleep(1.0 / rate_hz)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Gundyr shared-memory channel tools")
+    parser.add_argument("command", choices=["produce", "read"])
+    parser.add_argument("--rate", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=None)
+    parser.add_argument("--path", default=None)
+    args = parser.parse_args()
+    if args.command == "produce":
+        produce(args.rate, args.duration, args.path)
+    else:
+        reader = ChannelReader.open(args.path)
+        if reader is None:
+            print("👉❌ Channel not found.")
+        else:
+            print(reader.read())
@@ -0,0 +1,131 @@
+# state_sampler.py
+import threading
+import time
+
+import numpy as np
+
+########################################
+# Background State Sampler
+########################################
+# Ring buffer columns:
+# [timestamp (monotonic s), stalest field age (s), fresh-field bitmask, field values...]
+TIME_COL = 0
+AGE_COL = 1
+FRESH_COL = 2
+FIRST_FIELD_COL = 3
+
+
+class StateSampler:
+    """
+    Polls a SnapshotEngine at a fixed rate on its own thread and stores timestamped
+    snapshots in a preallocated numpy ring buffer.
+    latest() never waits for memory reads, and last(n) returns sub-step history.
+    """
+
+    def __init__(self, engine, rate_hz=120.0, capacity=1024):
+        self.engine = engine
+        self.names = engine.names
+        self.index = {name: FIRST_FIELD_COL + i for i, name in enumerate(self.names)}
+        self.period = 1.0 / rate_hz
+        self.capacity = capacity
+        self.buffer = np.full((capacity, FIRST_FIELD_COL + len(self.names)), np.nan,
+                              dtype=np.float64)
+        self.count = 0          # total samples written since start
+        self.overruns = 0       # samples that started late by more than one period
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    ########################################
+    # Thread Control
+    ########################################
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.sample()  # prime the buffer so latest() has data as soon as start() returns
+        self._thread = threading.Thread(target=self._run, name="StateSampler", daemon=True)
+        self._thread.start()
+        print(f"🧵 State sampler started at {1.0 / self.period:.0f} Hz.")
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"👉❌ State sampler error: {e}")
+            next_tick += self.period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            elif delay < -self.period:
+                # Fell behind (slow reads / load screen): skip missed ticks instead of bursting.
+                self.overruns += 1
+                next_tick = time.monotonic()
+
+    def sample(self):
+        """
+        Takes one snapshot and appends it to the ring buffer (also usable without the thread).
+        """
+        # Stamped before the reads start, so a row never claims to be newer than the
+        # memory it holds (reset_value() relies on this to skip pre-write samples).
+        now = time.monotonic()
+        values = self.engine.snapshot()
+        stalest = self.engine.max_age()
+        with self._lock:
+            row = self.buffer[self.count % self.capacity]
+            row[TIME_COL] = now
+            row[AGE_COL] = stalest
+            row[FRESH_COL] = self.engine.fresh_mask
+            row[FIRST_FIELD_COL:] = values
+            self.count += 1
+
+    ########################################
+    # Readers
+    ########################################
+    def latest(self, out=None):
+        """
+        Returns a copy of the newest row ([timestamp, age, fresh mask, fields...]), or None if empty.
+        Pass `out` (a float64 array of the row's length) to avoid allocating.
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            row = self.buffer[(self.count - 1) % self.capacity]
+            if out is None:
+                return row.copy()
+            out[:] = row
+            return out
+
+    def last(self, n):
+        """
+        Returns up to the n newest rows, oldest first, as a new array.
+        """
+        with self._lock:
+            n = min(n, self.count, self.capacity)
+            end = self.count % self.capacity
+            start = end - n
+            if start >= 0:
+                return self.buffer[start:end].copy()
+            return np.concatenate((self.buffer[start:], self.buffer[:end]))
+
+    def sample_age(self):
+        """
+        Seconds since the newest sample was taken (inf if none yet).
+        A growing value means the sampler thread is stalled.
+        """
+        with self._lock:
+            if self.count == 0:
+                return float("inf")
+            return time.monotonic() - self.buffer[(self.count - 1) % self.capacity, TIME_COL]
@@ -0,0 +1,288 @@
+# value_scanner.py
+"""
+First-scan / next-scan value search (Cheat Engine's main scanner) over any MemoryBackend:
+the live game (PymemBackend), a MemorySnapshot, or the simulated target.
+
+Memory is compared with numpy in chunks (np.frombuffer-style strided views, no per-value
+Python work). Candidates are kept as two compact arrays, sorted addresses (uint64) and
+the values seen at the last scan, so narrowing tens of millions of candidates is a few
+vectorized comparisons. An "unknown initial value" first scan keeps only a copy of the
+scanned memory and defers building candidate arrays to the first next_scan().
+
+Typical workflow for a new chain (e.g. estus):
+    scanner = ValueScanner(reader.pm, "int", aligned=False)   # estus sits at an odd offset
+    scanner.first_scan("exact", 3)      # 3 flasks
+    ... drink one ...
+    scanner.next_scan("exact", 2)
+    scanner.next_scan("unchanged")
+    scanner.results()                   # -> [(address, value)], feed to pointer_paths.scan()
+
+Usage (across snapshots taken with memory_snapshot.py):
+    python value_scanner.py a.ds3snap=3 b.ds3snap=2 --type int
+"""
+import numpy as np
+
+# data_type names follow PointerReader._read_value()
+SCAN_DTYPES = {
+    "byte": "u1",
+    "4byte": "<u4",
+    "int": "<i4",
+    "float": "<f4",
+    "double": "<f8",
+}
+FIRST_SCAN_MODES = ("exact", "range", "unknown")
+NEXT_SCAN_MODES = ("exact", "range", "changed", "unchanged", "increased", "decreased")
+
+########################################
+# Value Scanner
+########################################
+
+
+class ValueScanner:
+    """
+    Narrows a candidate set of addresses holding a value of one data type.
+    aligned=True only considers addresses aligned to the value size (CE's "fast scan").
+    """
+
+    def __init__(self, backend, data_type="int", aligned=True, writable_only=True,
+                 chunk_bytes=16 << 20, max_region_size=256 << 20, tolerance=None):
+        if data_type not in SCAN_DTYPES:
+            raise ValueError(f"Unsupported scan type '{data_type}'.")
+        self.backend = backend
+        self.data_type = data_type
+        self.dtype = np.dtype(SCAN_DTYPES[data_type])
+        self.size = self.dtype.itemsize
+        self.step = self.size if aligned else 1
+        self.writable_only = writable_only
+        self.chunk_bytes = max(self.size, chunk_bytes - chunk_bytes % 8)
+        self.max_region_size = max_region_size
+        # Float "exact" scans match within this tolerance (displayed values are rounded).
+        if tolerance is None:
+            tolerance = 1e-3 if self.dtype.kind == "f" else 0
+        self.tolerance = tolerance
+        self.addresses = np.empty(0, dtype=np.uint64)
+        self.values = np.empty(0, dtype=self.dtype)
+        self._groups = []       # [(chunk start, first candidate, end candidate)]
+        self._baseline = None   # unknown first scan: [(chunk start, values)] per chunk
+        self.scans = 0
+
+    def __len__(self):
+        if self._baseline is not None:
+            return sum(len(values) for _, values in self._baseline)
+        return len(self.addresses)
+
+    @property
+    def count(self):
+        return len(self)
+
+    ########################################
+    # Memory Access
+    ########################################
+    def _chunks(self):
+        """
+        Yields (chunk start, buffer, positions) for every chunk of the scanned regions.
+        Buffers overlap the next chunk by size - 1 bytes so values straddling a chunk
+        boundary are still seen; `positions` is the number of scan positions owned by the chunk.
+        """
+        source = self.backend.region_data() if hasattr(self.backend, "region_data") else None
+        if source is None:
+            spans = self.backend.regions(writable_only=self.writable_only)
+        else:
+            spans = [(start, len(data)) for start, data in source]
+        for i, (start, size) in enumerate(spans):
+            if size > self.max_region_size:
+                continue
+            data = _as_buffer(source[i][1]) if source is not None else None
+            for offset in range(0, size, self.chunk_bytes):
+                owned = min(self.chunk_bytes, size - offset)
+                end = min(size, offset + owned + self.size - 1)
+                if data is not None:
+                    buf = data[offset:end]
+                else:
+                    try:
+                        buf = self.backend.read_bytes(start + offset, end - offset)
+                    except Exception:
+                        continue
+                positions = min((owned - 1) // self.step + 1, _count(len(buf), self.size, self.step))
+                if positions > 0:
+                    yield start + offset, buf, positions
+
+    def _read(self, address, length):
+        """
+        Reads a span from the backend, or returns None if it is no longer readable.
+        """
+        try:
+            return self.backend.read_bytes(address, length)
+        except Exception:
+            return None
+
+    def _view(self, buf, positions, step=None):
+        step = step or self.step
+        return np.ndarray((positions,), dtype=self.dtype, buffer=buf, strides=(step,))
+
+    ########################################
+    # Comparisons
+    ########################################
+    def _match(self, current, previous, mode, value, high):
+        if mode == "exact":
+            if self.tolerance:
+                return np.abs(current - value) <= self.tolerance
+            return current == value
+        if mode == "range":
+            return (current >= value) & (current <= high)
+        if mode == "changed":
+            return current != previous
+        if mode == "unchanged":
+            return current == previous
+        if mode == "increased":
+            return current > previous
+        if mode == "decreased":
+            return current < previous
+        raise ValueError(f"Unknown scan mode '{mode}'.")
+
+    def _check(self, mode, value, high, modes):
+        if mode not in modes:
+            raise ValueError(f"Scan mode must be one of {modes}, got '{mode}'.")
+        if mode in ("exact", "range") and value is None:
+            raise ValueError(f"'{mode}' scans need a value.")
+        if mode == "range" and high is None:
+            raise ValueError("'range' scans need a high bound.")
+        if mode in ("changed", "unchanged", "increased", "decreased") and self.scans == 0:
+            raise ValueError(f"'{mode}' needs a previous scan.")
+
+    def _store(self, addresses, values, groups):
+        self.addresses = np.concatenate(addresses) if addresses else np.empty(0, dtype=np.uint64)
+        self.values = np.concatenate(values) if values else np.empty(0, dtype=self.dtype)
+        self._groups = groups
+        self.scans += 1
+        return len(self.addresses)
+
+    ########################################
+    # Scans
+    ########################################
+    def first_scan(self, mode="exact", value=None, high=None):
+        """
+        Scans every region. mode: "exact", "range" (value <= x <= high) or "unknown".
+        Returns the number of candidates.
+        """
+        self.scans = 0
+        self._check(mode, value, high, FIRST_SCAN_MODES)
+        if mode == "unknown":
+            self._baseline = [(start, self._view(buf, positions).copy())
+                              for start, buf, positions in self._chunks()]
+            self.addresses = np.empty(0, dtype=np.uint64)
+            self.values = np.empty(0, dtype=self.dtype)
+            self._groups = []
+            self.scans = 1
+            return len(self)
+
+        self._baseline = None
+        addresses, values, groups = [], [], []
+        total = 0
+        for start, buf, positions in self._chunks():
+            view = self._view(buf, positions)
+            pos = np.flatnonzero(self._match(view, None, mode, value, high))
+            if len(pos) == 0:
+                continue
+            addresses.append(np.uint64(start) + pos.astype(np.uint64) * np.uint64(self.step))
+            values.append(view[pos])
+            groups.append((start, total, total + len(pos)))
+            total += len(pos)
+        return self._store(addresses, values, groups)
+
+    def next_scan(self, mode="unchanged", value=None, high=None):
+        """
+        Re-reads the current candidates and keeps those matching `mode` ("exact", "range",
+        "changed", "unchanged", "increased", "decreased"). Returns the number left.
+        """
+        self._check(mode, value, high, NEXT_SCAN_MODES)
+        if self._baseline is not None:
+            return self._next_from_baseline(mode, value, high)
+
+        addresses, values, groups = [], [], []
+        total = 0
+        for chunk_start, i0, i1 in self._groups:
+            addrs = self.addresses[i0:i1]
+            lo = int(addrs[0])
+            buf = self._read(lo, int(addrs[-1]) - lo + self.size)
+            if buf is None:
+                continue
+            # Byte-strided view: every offset in the span is a valid element start.
+            current = self._view(buf, len(buf) - self.size + 1, step=1)[(addrs - np.uint64(lo)).astype(np.intp)]
+            keep = np.flatnonzero(self._match(current, self.values[i0:i1], mode, value, high))
+            if len(keep) == 0:
+                continue
+            addresses.append(addrs[keep])
+            values.append(current[keep])
+            groups.append((chunk_start, total, total + len(keep)))
+            total += len(keep)
+        return self._store(addresses, values, groups)
+
+    def _next_from_baseline(self, mode, value, high):
+        addresses, values, groups = [], [], []
+        total = 0
+        for start, previous in self._baseline:
+            positions = len(previous)
+            buf = self._read(start, (positions - 1) * self.step + self.size)
+            if buf is None:
+                continue
+            current = self._view(buf, positions)
+            pos = np.flatnonzero(self._match(current, previous, mode, value, high))
+            if len(pos) == 0:
+                continue
+            addresses.append(np.uint64(start) + pos.astype(np.uint64) * np.uint64(self.step))
+            values.append(current[pos])
+            groups.append((start, total, total + len(pos)))
+            total += len(pos)
+        self._baseline = None
+        return self._store(addresses, values, groups)
+
+    def rebind(self, backend):
+        """
+        Points the scanner at another backend (e.g. the next snapshot) keeping the candidates.
+        """
+        self.backend = backend
+
+    def results(self, limit=100):
+        """
+        Returns up to `limit` (address, value) pairs from the last scan.
+        """
+        if self._baseline is not None:
+            return []
+        return [(int(a), v.item()) for a, v in zip(self.addresses[:limit], self.values[:limit])]
+
+
+def _as_buffer(data):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data)
+    return memoryview(data[:])
+
+
+def _count(length, size, step):
+    return 0 if length < size else (length - size) // step + 1
+
+
+if __name__ == "__main__":
+    import argparse
+    from memory_snapshot import MemorySnapshot
+    parser = argparse.ArgumentParser(description="Exact-value scan across memory snapshots")
+    parser.add_argument("samples", nargs="+", metavar="SNAPSHOT=VALUE")
+    parser.add_argument("--type", default="int", choices=sorted(SCAN_DTYPES))
+    parser.add_argument("--unaligned", action="store_true")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    scanner = None
+    cast = float if np.dtype(SCAN_DTYPES[args.type]).kind == "f" else int
+    for sample in args.samples:
+        path, _, value = sample.rpartition("=")
+        snapshot = MemorySnapshot.load(path)
+        if scanner is None:
+            scanner = ValueScanner(snapshot, args.type, aligned=not args.unaligned)
+            count = scanner.first_scan("exact", cast(value))
+        else:
+            scanner.rebind(snapshot)
+            count = scanner.next_scan("exact", cast(value))
+        print(f"🔎 {path}: {count:,} candidates")
+    for address, value in scanner.results(args.limit):
+        print(f"{hex(address)}  {value}")
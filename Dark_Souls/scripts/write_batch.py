@@ -0,0 +1,109 @@
+# write_batch.py
+import struct
+
+from memory_layout import STRUCT_CODES
+
+########################################
+# Batched Writes
+########################################
+
+
+class WriteBatch:
+    """
+    Collects field writes and applies them with as few memory syscalls as possible:
+    each pointer chain is resolved once and fields that touch or overlap are packed into
+    one write_bytes. A span never covers a byte the caller did not set, so game-owned
+    bytes between fields are never written back; only bit-masked fields are read first
+    (read-modify-write). Spans are written under reader.write_lock, so our own writers
+    (e.g. the Freezer) never interleave with a read-modify-write.
+
+        batch = reader.batch()
+        batch.write(chain, 124.45, "float", name="X")
+        batch.write_bits(flag_chain, mask=0x80, bits=0x00, name="flag")
+        ok = batch.commit()      # {name: True/False}
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self._items = []        # (chain, delta, payload, mask, name)
+        self.old_values = {}    # name -> previous value of bit-masked fields
+
+    def __len__(self):
+        return len(self._items)
+
+    def write(self, chain, value, data_type="int", delta=0, name=None):
+        """
+        Queues value (encoded as data_type) at (chain address + delta).
+        """
+        if data_type not in STRUCT_CODES:
+            raise ValueError(f"Unsupported write type '{data_type}'.")
+        payload = struct.pack("<" + STRUCT_CODES[data_type], value)
+        self._items.append((tuple(chain), delta, payload, None, name or f"field {len(self._items)}"))
+        return self
+
+    def write_bits(self, chain, mask, bits, delta=0, name=None):
+        """
+        Queues a masked byte update: new = (old & ~mask) | (bits & mask).
+        """
+        self._items.append((tuple(chain), delta, bytes([bits & mask]), bytes([mask & 0xFF]),
+                            name or f"field {len(self._items)}"))
+        return self
+
+    def commit(self):
+        """
+        Applies every queued write. Returns {name: success}. The batch is emptied.
+        """
+        reader = self.reader
+        items, self._items = self._items, []
+        results = {name: False for *_, name in items}
+        if not items or reader is None or not reader._is_process_valid():
+            return results
+
+        # 1) Resolve each chain once.
+        bases = {}
+        for chain, *_, name in items:
+            if chain not in bases:
+                bases[chain] = reader.cached_address(chain, name=name)
+        placed = sorted(((bases[chain] + delta, i) for i, (chain, delta, *_) in enumerate(items)
+                         if bases[chain] != -1))
+
+        # 2) Coalesce touching fields into spans (item order kept so later writes win).
+        spans = []
+        for addr, i in placed:
+            end = addr + len(items[i][2])
+            if spans and addr <= spans[-1][1]:
+                span = spans[-1]
+                span[1] = max(span[1], end)
+                span[2].append((addr, i))
+            else:
+                spans.append([addr, end, [(addr, i)]])
+
+        # 3) One write (plus one read if needed) per span.
+        with reader.write_lock:
+            for start, end, members in spans:
+                self._write_span(start, end, sorted(members, key=lambda m: m[1]), items, results)
+        return results
+
+    def _write_span(self, start, end, members, items, results):
+        reader = self.reader
+        needs_read = any(items[i][3] is not None for _, i in members)
+        try:
+            buf = bytearray(reader.pm.read_bytes(start, end - start)) if needs_read \
+                else bytearray(end - start)
+            for addr, i in members:
+                _, _, payload, mask, name = items[i]
+                offset = addr - start
+                if mask is None:
+                    buf[offset:offset + len(payload)] = payload
+                else:
+                    old = buf[offset]
+                    self.old_values[name] = old
+                    buf[offset] = (old & ~mask[0]) | payload[0]
+            reader.pm.write_bytes(start, bytes(buf), len(buf))
+        except Exception as e:
+            print(f"👉❌ WriteBatch: failed to write {end - start} bytes @ {hex(start)}: {e}")
+            for _, i in members:
+                reader.invalidate_cache(items[i][0])
+            return
+        for _, i in members:
+            results[items[i][4]] = True
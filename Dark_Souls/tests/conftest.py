@@ -0,0 +1,35 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+
+# The scripts import each other as top-level modules (they are run from scripts/).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from memory_backend import make_simulated_game  # noqa: E402
+from pointer_scanner import PointerReader  # noqa: E402
+
+# Small chain table for the simulated target (module-relative roots).
+TEST_CHAINS = {
+    "player_hp": (0x100, 0x28, 0x90),
+    "player_pos": (0x100, 0x28, 0x80),
+    "boss_hp": (0x200, 0x10),
+}
+TEST_VALUES = {
+    "player_hp": [(0x0, "int", 454), (0x18, "int", 95)],
+    "player_pos": [(-0xC, "float", -2.5), (0x0, "float", 124.5),
+                   (0x4, "float", -64.0), (0x8, "float", 555.75)],
+    "boss_hp": [(0x0, "int", 1037)],
+}
+
+
+@pytest.fixture
+def sim_reader():
+    """
+    A PointerReader attached to a simulated game with TEST_CHAINS installed.
+    """
+    backend = make_simulated_game(TEST_CHAINS, TEST_VALUES)
+    reader = PointerReader("simulated", backend=backend)
+    reader.chains = dict(TEST_CHAINS)
+    return reader
@@ -0,0 +1,88 @@
+# test_aob_scanner.py
+import functools
+
+import pytest
+
+import pointer_scanner
+from aob_scanner import (SIGNATURES, Signature, SignatureNotFound, find_pattern, plant_signature,
+                         resolve_signatures)
+from memory_backend import SimulatedBackend
+from offset_table import compile_chain, compile_chains
+
+SIG = {sig.name: sig for sig in SIGNATURES}
+
+
+def _game(planted):
+    """
+    A small simulated module with the named signatures planted; returns (backend, {name: global}).
+    """
+    # Globals sit ~0x4800000 past the code, like the game's .data (WorldChrMan's pattern
+    # pins the displacement's top byte to 0x04).
+    backend = SimulatedBackend(module_size=0x4900000)
+    globals_ = {}
+    for i, name in enumerate(planted):
+        code = backend.module_base + 0x1000 + i * 0x100
+        globals_[name] = backend.module_base + 0x4800000 + i * 0x10
+        plant_signature(backend, SIG[name], code, globals_[name])
+    return backend, globals_
+
+
+def test_find_pattern_with_wildcards():
+    image = b"\x00\x48\x8B\x05\x11\x22\x33\x44\x48\x85\xC0"
+    assert find_pattern(image, "48 8B 05 ?? ?? ?? ?? 48 85 C0") == [1]
+    assert find_pattern(image, "48 8B 05 ?? ?? ?? ?? 48 85 C1") == []
+
+
+def test_signatures_resolve_to_their_globals():
+    backend, globals_ = _game(["WorldChrMan", "LockTgtMan"])
+    resolved = resolve_signatures(backend, cache_path=None, log=False)
+    assert resolved == globals_
+
+
+def test_missing_lock_on_signature_is_optional():
+    backend, globals_ = _game(["WorldChrMan", "GameDataMan"])
+    resolved = resolve_signatures(backend, cache_path=None, log=False)
+    assert resolved == globals_ and "LockTgtMan" not in resolved
+
+
+def test_missing_required_signature_raises():
+    backend, _ = _game(["WorldChrMan"])
+    required = (SIG["WorldChrMan"], SIG["LockTgtMan"]._replace(required=True))
+    with pytest.raises(SignatureNotFound, match="LockTgtMan"):
+        resolve_signatures(backend, required, cache_path=None, log=False)
+
+
+def test_ambiguous_signature_is_rejected():
+    backend, globals_ = _game(["WorldChrMan", "LockTgtMan"])
+    # A second copy of the LockTgtMan idiom pointing at some other global.
+    plant_signature(backend, SIG["LockTgtMan"], backend.module_base + 0x2000,
+                    backend.module_base + 0x4800100)
+    resolved = resolve_signatures(backend, cache_path=None, log=False)
+    assert resolved == {"WorldChrMan": globals_["WorldChrMan"]}
+    with pytest.raises(SignatureNotFound, match="LockTgtMan"):
+        resolve_signatures(backend, (SIG["LockTgtMan"]._replace(required=True),),
+                           cache_path=None, log=False)
+
+
+def test_missing_optional_signature_is_left_out():
+    backend, globals_ = _game(["WorldChrMan"])
+    optional = (SIG["WorldChrMan"], Signature("Other", "DE AD BE EF ?? 01", 0, 4, False))
+    assert resolve_signatures(backend, optional, cache_path=None, log=False) == globals_
+
+
+def test_reader_attaches_without_lock_on_signature(monkeypatch):
+    backend, _ = _game(["WorldChrMan"])
+    monkeypatch.setattr(pointer_scanner, "resolve_signatures",
+                        functools.partial(resolve_signatures, cache_path=None, log=False))
+    reader = pointer_scanner.PointerReader("simulated", backend=backend, signatures=SIGNATURES)
+    assert "LockTgtMan" not in reader.symbols
+    assert "lock_on" not in reader.chains and "player_hp" in reader.chains
+
+
+def test_symbolic_roots_compile_from_resolved_symbols():
+    module_base = 0x140000000
+    symbols = {"LockTgtMan": module_base + 0x478DBE0}
+    assert compile_chain(["LockTgtMan", "0x2821"], symbols, module_base) == (0x478DBE0, 0x2821)
+    # Without a resolved symbol the chain is skipped, never rooted on a guessed address.
+    build = {"chains": {"lock_on": ["LockTgtMan", "0x2821"], "boss_hp": ["0x049648F8", "0x98"]}}
+    assert compile_chains(build, {}, module_base, log=False) == {"boss_hp": (0x049648F8, 0x98)}
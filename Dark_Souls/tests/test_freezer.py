@@ -0,0 +1,37 @@
+# test_freezer.py
+import time
+
+from conftest import TEST_CHAINS
+from freezer import Freezer
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_frozen_value_is_rewritten(sim_reader):
+    chain = TEST_CHAINS["boss_hp"]
+    freezer = Freezer(sim_reader)
+    try:
+        freezer.freeze(chain, 999, "int", interval_ms=5, name="boss hp")
+        assert _wait_for(lambda: sim_reader.resolve(chain, data_type="int") == 999)
+        sim_reader.pm.write_int(sim_reader.resolve_address(chain), 1)
+        assert _wait_for(lambda: sim_reader.resolve(chain, data_type="int") == 999)
+    finally:
+        freezer.stop()
+
+
+def test_unresolvable_chain_fails_quietly(sim_reader, capsys):
+    freezer = Freezer(sim_reader)
+    try:
+        freezer.freeze((0x4000, 0x8, 0x10), 1, "int", interval_ms=1, name="broken")
+        capsys.readouterr()
+        assert _wait_for(lambda: freezer.stats()["broken"]["failures"] >= 20)
+    finally:
+        freezer.stop()
+    assert capsys.readouterr().out == ""
+    policy = sim_reader.policy
+    assert (policy.retries, policy.give_ups, policy.blocked_time) == (0, 0, 0.0)
@@ -0,0 +1,50 @@
+# test_input_backend.py
+import threading
+import time
+
+from input_backend import InputDispatcher, RecordingBackend
+
+
+class _SlowBackend(RecordingBackend):
+    """
+    A RecordingBackend whose keyDown blocks until released, to catch the dispatcher mid-send.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sending = threading.Event()
+        self.proceed = threading.Event()
+
+    def key_down(self, key):
+        self.sending.set()
+        self.proceed.wait(2.0)
+        super().key_down(key)
+
+
+def test_press_sends_down_then_up():
+    inputs = InputDispatcher(RecordingBackend(), press_duration=0.01)
+    try:
+        inputs.press("u")
+        assert inputs.flush()
+        assert [(kind, key) for _, kind, key in inputs.backend.events] == [("down", "u"), ("up", "u")]
+        assert not inputs.is_held("u")
+    finally:
+        inputs.stop()
+
+
+def test_release_all_waits_for_an_in_flight_press():
+    backend = _SlowBackend()
+    inputs = InputDispatcher(backend)
+    try:
+        inputs.hold("w", 10.0)
+        assert backend.sending.wait(2.0)   # dispatcher is inside key_down("w")
+        releaser = threading.Thread(target=inputs.release_all)
+        releaser.start()
+        time.sleep(0.05)
+        backend.proceed.set()
+        releaser.join(2.0)
+        assert not inputs.is_held("w")
+        assert [(kind, key) for _, kind, key in backend.events] == [("down", "w"), ("up", "w")]
+        assert inputs.pending() == 0
+    finally:
+        inputs.stop()
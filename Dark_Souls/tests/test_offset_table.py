@@ -0,0 +1,62 @@
+# test_offset_table.py
+import json
+
+import pytest
+
+from aob_scanner import module_hash
+from memory_backend import SimulatedBackend
+from offset_table import OFFSETS_FORMAT, chains_for, detect_build, load_table
+
+
+def _table(tmp_path, builds, default="default", fmt=OFFSETS_FORMAT):
+    path = tmp_path / "offsets.json"
+    path.write_text(json.dumps({"format": fmt, "default_build": default, "builds": builds}))
+    return str(path)
+
+
+def _build(chains=None, hashes=(), size=None):
+    return {"module_hashes": list(hashes), "module_size": size,
+            "chains": chains or {"boss_hp": ["0x200", "0x10"]}}
+
+
+def test_hash_match_wins_over_size(tmp_path):
+    backend = SimulatedBackend(module_size=0x20000)
+    path = _table(tmp_path, {
+        "default": _build(),
+        "by_size": _build(size=0x20000),
+        "by_hash": _build(hashes=[module_hash(backend)]),
+    })
+    assert detect_build(backend, load_table(path)) == ("by_hash", module_hash(backend))
+
+
+def test_size_match_then_default(tmp_path):
+    backend = SimulatedBackend(module_size=0x20000)
+    table = load_table(_table(tmp_path, {"default": _build(), "by_size": _build(size=0x20000)}))
+    assert detect_build(backend, table)[0] == "by_size"
+    assert detect_build(SimulatedBackend(module_size=0x30000), table)[0] == "default"
+
+
+def test_unsupported_format_is_rejected(tmp_path):
+    path = _table(tmp_path, {"default": _build()}, fmt=OFFSETS_FORMAT + 1)
+    with pytest.raises(ValueError, match="unsupported offset table format"):
+        load_table(path)
+
+
+def test_table_is_parsed_once(tmp_path):
+    path = _table(tmp_path, {"default": _build()})
+    table = load_table(path)
+    (tmp_path / "offsets.json").write_text("not json")
+    assert load_table(path) is table
+
+
+def test_chains_for_compiles_symbolic_roots(tmp_path):
+    backend = SimulatedBackend()
+    path = _table(tmp_path, {"default": _build(chains={
+        "boss_hp": ["0x200", "0x10"],
+        "lock_on": ["LockTgtMan", "0x2821"],
+        "missing": ["Unknown", "0x8"],
+    })})
+    symbols = {"LockTgtMan": backend.module_base + 0x4000}
+    name, chains = chains_for(backend, symbols, path=path)
+    assert name == "default"
+    assert chains == {"boss_hp": (0x200, 0x10), "lock_on": (0x4000, 0x2821)}
@@ -0,0 +1,92 @@
+# test_region_map.py
+import time
+
+from memory_backend import SimulatedBackend
+from region_map import RegionMap
+
+
+def _map(regions):
+    class Backend:
+        def regions(self):
+            return list(regions)
+    region_map = RegionMap(Backend())
+    region_map.refresh()
+    return region_map
+
+
+def test_lookup_inside_and_outside_regions():
+    region_map = _map([(0x1000, 0x1000), (0x5000, 0x100)])
+    assert region_map.contains(0x1000)
+    assert region_map.contains(0x1FF8, 8)
+    assert region_map.contains(0x5010, 4)
+    assert not region_map.contains(0x0FF8)
+    assert not region_map.contains(0x3000)
+    assert not region_map.contains(0x60000)
+
+
+def test_read_crossing_a_region_end_is_rejected():
+    region_map = _map([(0x1000, 0x1000)])
+    assert not region_map.contains(0x1FFC, 8)
+
+
+def test_adjacent_regions_are_merged():
+    region_map = _map([(0x2000, 0x1000), (0x1000, 0x1000)])
+    assert region_map.contains(0x1FFC, 8)
+    assert len(region_map._index[0]) == 1
+
+
+def test_backend_without_regions_accepts_everything():
+    region_map = _map([])
+    assert not region_map.enabled
+    assert region_map.contains(0xDEAD0000)
+
+
+def test_simulated_backend_regions():
+    backend = SimulatedBackend()
+    block = backend.alloc(0x1000)
+    region_map = RegionMap(backend)
+    region_map.refresh()
+    assert region_map.contains(backend.module_base + 0x10)
+    assert region_map.contains(block)
+    assert not region_map.contains(0x10)
+
+
+def _counting_backend(backend):
+    calls = []
+    original = backend.regions
+
+    def regions(writable_only=False):
+        calls.append(1)
+        return original()
+    backend.regions = regions
+    return calls
+
+
+def test_miss_is_rejected_without_a_rebuild():
+    backend = SimulatedBackend()
+    calls = _counting_backend(backend)
+    region_map = RegionMap(backend, min_refresh=0.0)
+    assert region_map.contains(backend.module_base)   # first use builds the map
+    assert len(calls) == 1
+    block = backend.alloc(0x1000)
+    for _ in range(100):
+        assert not region_map.contains(block)
+    assert len(calls) == 1
+    assert region_map.rejections == 100
+    region_map.refresh()
+    assert region_map.contains(block)
+
+
+def test_stale_miss_wakes_the_background_refresh():
+    backend = SimulatedBackend()
+    region_map = RegionMap(backend, refresh_interval=60.0, min_refresh=0.0)
+    region_map.start()
+    try:
+        block = backend.alloc(0x1000)
+        assert not region_map.contains(block)
+        deadline = time.monotonic() + 2.0
+        while not region_map.contains(block) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert region_map.contains(block)
+    finally:
+        region_map.stop()
@@ -0,0 +1,97 @@
+# test_reset_machine.py
+import time
+
+from reset_machine import Phase, ResetMachine
+
+
+def test_phases_run_in_order_and_end_on_condition():
+    calls = []
+    machine = ResetMachine([
+        Phase("a", lambda since: True, enter=lambda: calls.append("a")),
+        Phase("b", lambda since: True, enter=lambda: calls.append("b")),
+    ], poll=0.001)
+    assert machine.run()
+    assert calls == ["a", "b"]
+    assert list(machine.last) == ["a", "b"]
+    assert machine.failed_phase is None
+    assert machine.stats["a"]["count"] == 1 and machine.stats["a"]["timeouts"] == 0
+
+
+def test_timeout_runs_fallback_then_succeeds():
+    state = {"ready": False}
+    calls = []
+
+    def fallback():
+        calls.append("fallback")
+        state["ready"] = True
+
+    machine = ResetMachine([
+        Phase("p", lambda since: state["ready"], enter=lambda: calls.append("enter"),
+              fallback=fallback, timeout=0.02, retries=1),
+    ], poll=0.001)
+    assert machine.run()
+    assert calls == ["enter", "fallback"]
+    assert machine.stats["p"]["timeouts"] == 1
+
+
+def test_retries_repeat_enter_without_fallback():
+    calls = []
+    machine = ResetMachine([
+        Phase("p", lambda since: len(calls) == 3, enter=lambda: calls.append(1),
+              timeout=0.01, retries=2),
+    ], poll=0.001)
+    assert machine.run()
+    assert len(calls) == 3
+
+
+def test_required_failure_stops_the_reset():
+    ran = []
+    machine = ResetMachine([
+        Phase("never", lambda since: False, timeout=0.01, retries=1),
+        Phase("after", lambda since: True, enter=lambda: ran.append(1)),
+    ], poll=0.001)
+    assert not machine.run()
+    assert machine.failed_phase == "never"
+    assert ran == []
+    assert machine.stats["never"]["timeouts"] == 2
+    assert machine.stats["after"]["count"] == 0
+
+
+def test_optional_failure_continues():
+    machine = ResetMachine([
+        Phase("optional", lambda since: False, timeout=0.01, required=False),
+        Phase("after", lambda since: True),
+    ], poll=0.001)
+    assert machine.run()
+    assert list(machine.last) == ["optional", "after"]
+
+
+def test_condition_must_hold_for_settle():
+    polls = iter([True, False, True, True, True, True] + [True] * 1000)
+    machine = ResetMachine([
+        Phase("p", lambda since: next(polls), timeout=1.0, settle=0.005),
+    ], poll=0.002)
+    assert machine.run()
+    assert machine.last["p"] >= 0.005
+
+
+def test_since_is_when_the_attempt_started():
+    seen = []
+    machine = ResetMachine([
+        Phase("p", lambda since: seen.append(since) or len(seen) > 1, timeout=1.0),
+    ], poll=0.001)
+    before = time.monotonic()
+    assert machine.run()
+    assert seen[0] == seen[1] >= before
+
+
+def test_instrumentation_records_each_phase():
+    recorded = []
+
+    class Stats:
+        def record(self, name, ns, ok):
+            recorded.append((name, ok))
+
+    machine = ResetMachine([Phase("p", lambda since: True)], instrumentation=Stats())
+    machine.run()
+    assert recorded == [("reset:p", True)]
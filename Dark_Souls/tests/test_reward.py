@@ -0,0 +1,61 @@
+# test_reward.py
+import numpy as np
+
+from reward import COL, INPUTS, RewardEngine, drop, evaluate, flag
+
+
+def _row(**values):
+    row = np.zeros(len(INPUTS))
+    for name, value in values.items():
+        row[COL[name]] = value
+    return row
+
+
+def test_drop_rewards_decreases_only():
+    term = drop("boss_hp", 2.0)
+    prev = np.array([_row(boss_hp=100), _row(boss_hp=50)])
+    cur = np.array([_row(boss_hp=90), _row(boss_hp=60)])
+    assert term.fn(cur, prev).tolist() == [10.0, 0.0]
+
+
+def test_drop_ignores_unreadable_values():
+    term = drop("player_hp", 1.0)
+    prev = np.array([_row(player_hp=-1), _row(player_hp=100)])
+    cur = np.array([_row(player_hp=50), _row(player_hp=-1)])
+    assert term.fn(cur, prev).tolist() == [0.0, 0.0]
+
+
+def test_flag_is_weighted_per_set_step():
+    engine = RewardEngine(terms=(flag("whiff", -0.5),))
+    assert engine.step(100, 100, whiff=True) == -0.5
+    assert engine.step(100, 100, whiff=False) == 0.0
+
+
+def test_first_step_has_no_deltas():
+    engine = RewardEngine()
+    assert engine.step(454, 1037) == 0.0
+    assert engine.step(454, 1000) == 37.0
+    engine.reset()
+    # After a reset the HP jump back to full is not scored.
+    assert engine.step(454, 1037) == 0.0
+
+
+def test_online_matches_batch_evaluation():
+    engine = RewardEngine(record=True)
+    steps = [(454, 1037, False, False), (400, 1037, False, False), (400, 990, False, False),
+             (0, 990, False, True)]
+    online = [engine.step(hp, boss, boss_dead, dead) for hp, boss, boss_dead, dead in steps]
+    engine.reset()
+    online.append(engine.step(454, 1037))
+    batch, parts = evaluate(np.array(engine.history))
+    np.testing.assert_allclose(batch, online)
+    assert set(parts) == {term.name for term in engine.terms}
+
+
+def test_stale_steps_count_repeated_rewards():
+    engine = RewardEngine()
+    for _ in range(4):
+        engine.step(454, 1037)
+    assert engine.stale_steps == 3
+    engine.step(454, 1000)
+    assert engine.stale_steps == 0
@@ -0,0 +1,72 @@
+# test_snapshot_engine.py
+import numpy as np
+import pytest
+
+from conftest import TEST_CHAINS
+from memory_layout import Field, SnapshotEngine
+
+LAYOUT = (
+    Field("playerHP", "player_hp", 0x0, "int"),
+    Field("playerStamina", "player_hp", 0x18, "int"),
+    Field("playerX", "player_pos", 0x0, "float"),
+    Field("playerAngle", "player_pos", -0xC, "float"),
+    Field("bossHP", "boss_hp", 0x0, "int"),
+)
+
+
+def test_snapshot_reads_every_field(sim_reader):
+    engine = SnapshotEngine(sim_reader, LAYOUT, TEST_CHAINS)
+    values = engine.snapshot()
+    assert values.tolist() == [454, 95, 124.5, -2.5, 1037]
+    assert engine.fresh_mask == (1 << len(LAYOUT)) - 1
+    assert engine.as_dict()["bossHP"] == 1037
+
+
+def test_unknown_chain_is_an_error(sim_reader):
+    with pytest.raises(KeyError):
+        SnapshotEngine(sim_reader, LAYOUT + (Field("lockOn", "lock_on", 0x0, "byte"),), TEST_CHAINS)
+
+
+def test_failed_chain_holds_its_last_value(sim_reader):
+    engine = SnapshotEngine(sim_reader, LAYOUT, TEST_CHAINS)
+    engine.snapshot()
+    # Break the boss chain: its root pointer now leads nowhere.
+    sim_reader.pm.write_ulonglong(sim_reader.base_addr + TEST_CHAINS["boss_hp"][0], 0)
+    sim_reader.invalidate_cache()
+    values = engine.snapshot()
+    assert values[engine.index["bossHP"]] == 1037
+    assert not engine.fresh_mask & engine.mask_of("bossHP")
+    assert engine.fresh_mask & engine.mask_of("playerHP")
+
+
+def test_never_read_field_gets_fail_value(sim_reader):
+    chains = dict(TEST_CHAINS, boss_hp=(0x4000, 0x10))
+    engine = SnapshotEngine(sim_reader, LAYOUT, chains)
+    values = engine.snapshot()
+    assert values[engine.index["bossHP"]] == -1.0
+    assert np.isinf(engine.ages()[engine.index["bossHP"]])
+
+
+def test_missing_optional_field_is_skipped(sim_reader):
+    layout = LAYOUT + (Field("lockOn", "lock_on", 0x0, "byte", optional=True),)
+    engine = SnapshotEngine(sim_reader, layout, TEST_CHAINS)
+    assert engine.missing == ("lockOn",)
+    values = engine.snapshot()
+    assert values[engine.index["lockOn"]] == -1.0
+    assert values[engine.index["bossHP"]] == 1037
+    # The skipped field does not make the snapshot look infinitely stale.
+    assert 0.0 <= engine.max_age() < 1.0
+
+
+def test_present_optional_field_is_read(sim_reader):
+    chains = dict(TEST_CHAINS, lock_on=TEST_CHAINS["boss_hp"])
+    layout = LAYOUT + (Field("lockOn", "lock_on", 0x4, "byte", optional=True),)
+    engine = SnapshotEngine(sim_reader, layout, chains)
+    assert engine.missing == ()
+    engine.snapshot()
+    assert engine.fresh_mask & engine.mask_of("lockOn")
+
+
+def test_max_age_is_inf_before_any_read(sim_reader):
+    engine = SnapshotEngine(sim_reader, LAYOUT, TEST_CHAINS)
+    assert engine.max_age() == float("inf")
@@ -0,0 +1,43 @@
+# test_state_sampler.py
+import time
+
+import numpy as np
+
+from state_sampler import FIRST_FIELD_COL, FRESH_COL, TIME_COL, StateSampler
+
+
+class _SlowEngine:
+    """
+    A SnapshotEngine stand-in whose reads take a while and record when they started.
+    """
+    names = ("hp",)
+    fresh_mask = 1
+
+    def __init__(self):
+        self.values = np.zeros(1)
+        self.read_at = None
+
+    def snapshot(self):
+        self.read_at = time.monotonic()
+        time.sleep(0.02)
+        self.values[0] += 1
+        return self.values
+
+    def max_age(self):
+        return 0.0
+
+
+def test_row_is_stamped_before_the_read():
+    engine = _SlowEngine()
+    sampler = StateSampler(engine)
+    sampler.sample()
+    row = sampler.latest()
+    assert row[TIME_COL] <= engine.read_at
+    assert row[FRESH_COL] == 1 and row[FIRST_FIELD_COL] == 1
+
+
+def test_last_returns_history_oldest_first():
+    sampler = StateSampler(_SlowEngine(), capacity=2)
+    for _ in range(3):
+        sampler.sample()
+    assert list(sampler.last(5)[:, FIRST_FIELD_COL]) == [2, 3]
@@ -0,0 +1,67 @@
+# test_write_batch.py
+from conftest import TEST_CHAINS
+
+
+def _count_writes(reader):
+    writes = []
+    original = reader.pm.write_bytes
+
+    def write_bytes(address, data, length):
+        writes.append((address, length))
+        return original(address, data, length)
+    reader.pm.write_bytes = write_bytes
+    return writes
+
+
+def test_adjacent_fields_are_one_write(sim_reader):
+    writes = _count_writes(sim_reader)
+    pos = TEST_CHAINS["player_pos"]
+    results = (sim_reader.batch()
+               .write(pos, 1.5, "float", name="x")
+               .write(pos, 2.5, "float", delta=4, name="y")
+               .write(pos, 3.5, "float", delta=8, name="z")
+               .commit())
+    assert results == {"x": True, "y": True, "z": True}
+    assert len(writes) == 1 and writes[0][1] == 12
+    addr = sim_reader.resolve_address(pos)
+    assert [sim_reader.pm.read_float(addr + d) for d in (0, 4, 8)] == [1.5, 2.5, 3.5]
+
+
+def test_write_bits_keeps_other_bits(sim_reader):
+    chain = TEST_CHAINS["boss_hp"]
+    addr = sim_reader.resolve_address(chain)
+    sim_reader.pm.write_uchar(addr, 0xC3)
+    batch = sim_reader.batch().write_bits(chain, mask=0x80, bits=0x00, name="flag")
+    assert batch.commit() == {"flag": True}
+    assert sim_reader.pm.read_uchar(addr) == 0x43
+    assert batch.old_values["flag"] == 0xC3
+
+
+def test_later_writes_win(sim_reader):
+    chain = TEST_CHAINS["boss_hp"]
+    sim_reader.batch().write(chain, 1, "int", name="a").write(chain, 2, "int", name="b").commit()
+    assert sim_reader.read_cached(chain, data_type="int") == 2
+
+
+def test_unresolvable_chain_fails_only_its_fields(sim_reader):
+    results = (sim_reader.batch()
+               .write((0x4000, 0x8, 0x10), 1, "int", name="broken")
+               .write(TEST_CHAINS["boss_hp"], 5, "int", name="ok")
+               .commit())
+    assert results == {"broken": False, "ok": True}
+
+
+def test_gap_between_fields_is_not_written(sim_reader):
+    pos = TEST_CHAINS["player_pos"]
+    addr = sim_reader.resolve_address(pos)
+    sim_reader.pm.write_bytes(addr - 8, b"\xAA" * 8, 8)   # game-owned bytes
+    batch = (sim_reader.batch()
+             .write(pos, 1.5, "float", name="x")
+             .write(pos, -2.0, "float", delta=-0xC, name="angle"))
+    sim_reader.pm.write_bytes(addr - 8, b"\x55" * 8, 8)   # game updates them meanwhile
+    writes = _count_writes(sim_reader)
+    assert batch.commit() == {"x": True, "angle": True}
+    assert sorted(writes) == [(addr - 0xC, 4), (addr, 4)]
+    assert sim_reader.pm.read_bytes(addr - 8, 8) == b"\x55" * 8
+    assert sim_reader.pm.read_float(addr - 0xC) == -2.0
+    assert sim_reader.pm.read_float(addr) == 1.5